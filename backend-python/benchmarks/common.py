@@ -0,0 +1,62 @@
+"""
+Benchmark script'leri için ortak yardımcılar
+"""
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+# Benchmark'larda kullanılan örnek SSS verisi (test_api.py ile aynı)
+SAMPLE_FAQS = [
+    {
+        "question": "Siparişimi nasıl iptal edebilirim?",
+        "answer": "Siparişinizi iptal etmek için hesabınıza giriş yapın ve 'Siparişlerim' bölümünden iptal butonuna tıklayın."
+    },
+    {
+        "question": "Kargo ücreti ne kadar?",
+        "answer": "150 TL üzeri siparişlerde kargo ücretsizdir. Altında ise 15 TL kargo ücreti alınır."
+    },
+    {
+        "question": "İade koşulları nelerdir?",
+        "answer": "Ürünleri teslim aldığınız tarihten itibaren 14 gün içinde iade edebilirsiniz."
+    }
+]
+
+# Farklı dillerde örnek sorular
+SAMPLE_QUESTIONS = [
+    "Siparişimi nasıl iptal ederim?",
+    "How can I cancel my order?",
+    "¿Cuánto cuesta el envío?",
+    "Wie kann ich einen Artikel zurückgeben?",
+    "Quels sont les frais de livraison ?",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Sıralı olmayan değerler için en yakın sıra yöntemiyle yüzdelik hesaplar"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    """Gecikme listesinden ortalama ve p50/p95/p99 özetini çıkarır"""
+    if not latencies_ms:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 2),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2),
+    }
+
+
+def write_json(results: Any, path: Optional[str]):
+    """Sonuçları makine tarafından okunabilir JSON olarak yazar"""
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {path}")
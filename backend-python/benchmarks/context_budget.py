@@ -0,0 +1,145 @@
+"""
+Bağlam bütçesi benchmark'ı: sabit top-k birleştirme vs token bütçeli bağlam
+
+Aynı SSS kataloğu ve sorularla iki bağlam stratejisini karşılaştırır:
+- naive: en yakın 3 SSS'nin tamamı (eski davranış)
+- budgeted: ContextBuilder (uyarlanan k, kopya eleme, kırpma, CONTEXT_MAX_TOKENS)
+
+Katalog kısa ve çok uzun cevaplı SSS'ler ile aynı cevabı farklı
+sözcüklerle soran neredeyse kopya SSS'ler içerir (birebir kopyalar ingest
+sırasında zaten elendiği için bağlamda kopya eleme ancak böyle ölçülür). Sahte bileşenlerle çalışır, API anahtarı gerektirmez;
+prompt token'ları sahte modelin kelime sayımıyla, bağlam token'ları
+ContextBuilder'ın sayacıyla ölçülür.
+
+Kullanım:
+    python -m benchmarks.context_budget --max-tokens 1200 --output context_budget.json
+"""
+import argparse
+import asyncio
+import itertools
+from typing import Any, Dict, List
+
+from benchmarks.common import SAMPLE_FAQS, SAMPLE_QUESTIONS, write_json
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings, FakeVectorBackend
+from models import FAQ
+from services.ai_service import AIService
+from services.context_builder import ContextBuilder
+from services.metrics import TokenUsageHandler
+from services.translation_cache import TranslationCache
+
+BENCHMARK_USER_ID = "benchmark-context-budget"
+
+# Uzun cevaplı SSS'lerde cevabın tekrar sayısı (gerçek kataloglardaki uzun politika metinlerini taklit eder)
+LONG_ANSWER_REPEAT = 40
+
+# Neredeyse kopya SSS'lerde soruya eklenen ifadeler; her (ön ek, son ek) çifti farklı bir id verir
+REWORD_PREFIXES = ["Merhaba,", "Acaba", "Sorum şu:"]
+REWORD_SUFFIXES = ["", " Teşekkürler.", " Acil."]
+REWORDINGS = [
+    f"{prefix} {{question}}{suffix}" for prefix, suffix in itertools.product(REWORD_PREFIXES, REWORD_SUFFIXES)
+]
+
+
+def build_catalog(duplicates: int) -> List[FAQ]:
+    """Kısa, uzun ve neredeyse kopya SSS'lerden oluşan katalog"""
+    faqs = [FAQ(**faq) for faq in SAMPLE_FAQS]
+    faqs += [
+        FAQ(question=f"{faq['question']} (detaylı)", answer=" ".join([faq["answer"]] * LONG_ANSWER_REPEAT))
+        for faq in SAMPLE_FAQS
+    ]
+    # Aynı cevabı farklı sözcüklerle soran SSS'ler (farklı soru, farklı id; ingest elemez)
+    for i in range(min(duplicates, len(SAMPLE_FAQS) * len(REWORDINGS))):
+        faq = SAMPLE_FAQS[i % len(SAMPLE_FAQS)]
+        template = REWORDINGS[i // len(SAMPLE_FAQS)]
+        faqs.append(FAQ(question=template.format(question=faq["question"]), answer=faq["answer"]))
+    return faqs
+
+
+async def run_strategy(service: AIService, name: str, builder: ContextBuilder, runs: int) -> Dict[str, Any]:
+    """Tek bir bağlam stratejisini ölçer"""
+    service.context_builder = builder
+    handler = TokenUsageHandler()
+    service.llm.callbacks = [handler]
+
+    context_tokens = []
+    context_docs = []
+    duplicates_dropped = []
+    original_build = builder.build
+
+    def measured_build(docs, scores=None):
+        context = original_build(docs, scores)
+        context_tokens.append(context.tokens)
+        context_docs.append(len(context.docs))
+        duplicates_dropped.append(context.dropped.get("duplicate", 0))
+        return context
+
+    builder.build = measured_build
+    for _ in range(runs):
+        for question in SAMPLE_QUESTIONS:
+            await service.query(question, BENCHMARK_USER_ID)
+
+    queries = len(context_tokens)
+    return {
+        "strategy": name,
+        "queries": queries,
+        "context_tokens_per_query": round(sum(context_tokens) / queries, 1),
+        "max_context_tokens": max(context_tokens),
+        "docs_per_query": round(sum(context_docs) / queries, 2),
+        "duplicates_dropped_per_query": round(sum(duplicates_dropped) / queries, 2),
+        "prompt_tokens_per_query": round(handler.prompt_tokens / max(1, handler.calls), 1),
+    }
+
+
+async def main(args: argparse.Namespace):
+    service = AIService()
+    await service.initialize()
+    embeddings = FakeEmbeddings()
+    service.use_components(
+        embeddings=embeddings,
+        llm=FakeChatModel(),
+        vector_store_factory=FakeVectorBackend(embeddings)
+    )
+    # Her sorgu üretime gitsin: önbellekler, çeviri ve doğrudan cevap kapalı
+    service.semantic_cache = None
+    service.singleflight = None
+    service.translation_cache = TranslationCache(max_entries=0)
+    service.direct_answer_threshold = 0
+    service.pipeline_mode = "multilingual"
+
+    await service.ingest_faqs(build_catalog(args.duplicates), BENCHMARK_USER_ID)
+
+    naive = ContextBuilder(
+        max_tokens=10 ** 9, max_doc_tokens=10 ** 9, max_docs=3, score_gap=float("inf"), duplicate_threshold=1.01
+    )
+    budgeted = ContextBuilder(
+        max_tokens=args.max_tokens,
+        max_doc_tokens=args.max_doc_tokens,
+        max_docs=service.retrieval_k,
+        score_gap=args.score_gap,
+    )
+    results = [
+        await run_strategy(service, "naive", naive, args.runs),
+        await run_strategy(service, "budgeted", budgeted, args.runs),
+    ]
+
+    print(f"\n{'strategy':<12}{'ctx tokens':>12}{'max':>8}{'docs':>8}{'dups':>8}{'prompt tokens':>16}")
+    for r in results:
+        print(
+            f"{r['strategy']:<12}{r['context_tokens_per_query']:>12}{r['max_context_tokens']:>8}"
+            f"{r['docs_per_query']:>8}{r['duplicates_dropped_per_query']:>8}{r['prompt_tokens_per_query']:>16}"
+        )
+    saved = 1 - results[1]["prompt_tokens_per_query"] / results[0]["prompt_tokens_per_query"]
+    print(f"\nPrompt tokens saved: {saved:.0%}")
+
+    write_json({"benchmark": "context_budget", "results": results, "prompt_tokens_saved": round(saved, 3)}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare fixed top-k context with token-budgeted context")
+    parser.add_argument("--runs", type=int, default=3, help="Number of passes over the sample questions")
+    parser.add_argument("--duplicates", type=int, default=6, help="Reworded near-duplicate FAQs in the catalog (at most 27)")
+    parser.add_argument("--max-tokens", type=int, default=1200, help="Context token budget")
+    parser.add_argument("--max-doc-tokens", type=int, default=400, help="Per-FAQ token cap")
+    parser.add_argument("--score-gap", type=float, default=0.1, help="Max similarity drop from the best match")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    asyncio.run(main(parser.parse_args()))
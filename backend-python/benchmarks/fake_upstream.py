@@ -0,0 +1,139 @@
+"""
+Gecikme ve hata enjekte eden sahte OpenAI uyumlu HTTP sunucusu
+
+`/v1/embeddings` ve `/v1/chat/completions` (akışsız) uç noktalarını sunar.
+Gerçek SDK'ların ve transport katmanının (bağlantı havuzu, süre sınırı,
+yeniden deneme, hedge) ağ üzerinden test edilmesi için kullanılır.
+
+Kullanım:
+    python -m benchmarks.fake_upstream --port 8900 --tail-rate 0.05 --tail-ms 2000 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.fakes import FakeEmbeddings
+
+
+@dataclass
+class UpstreamBehavior:
+    """Sahte sunucunun gecikme ve hata profili"""
+    base_ms: float = 20.0  # Her isteğin taban gecikmesi
+    jitter_ms: float = 10.0  # Tabana eklenen rastgele gecikme (0..jitter)
+    tail_rate: float = 0.0  # Bu oranda istek `tail_ms` kadar ek gecikme alır (yavaş kuyruk)
+    tail_ms: float = 1000.0
+    error_rate: float = 0.0  # Bu oranda istek 503 döner
+    retry_after: float = 0.0  # 503 cevaplarındaki Retry-After (0: başlık yok)
+    seed: int = 0
+    stats: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "errors": 0, "slow": 0})
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    async def apply(self):
+        """İsteği profile göre geciktirir; hata verilecekse 503 cevabı döndürür"""
+        self.stats["requests"] += 1
+        delay = self.base_ms + self._random.uniform(0, self.jitter_ms)
+        if self._random.random() < self.tail_rate:
+            delay += self.tail_ms
+            self.stats["slow"] += 1
+        failed = self._random.random() < self.error_rate
+        await asyncio.sleep(delay / 1000)
+        if failed:
+            self.stats["errors"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after else {}
+            return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}}, 503, headers)
+        return None
+
+
+def create_app(behavior: UpstreamBehavior, dimensions: int = 256) -> FastAPI:
+    """Profili uygulayan sahte OpenAI uygulaması"""
+    app = FastAPI()
+    embedder = FakeEmbeddings(size=dimensions)
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        error = await behavior.apply()
+        if error is not None:
+            return error
+        inputs: List[Any] = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        vectors = embedder.embed_documents([str(text) for text in inputs])
+        data = [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)]
+        return {
+            "object": "list", "data": data, "model": body.get("model", "fake"),
+            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)}
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        error = await behavior.apply()
+        if error is not None:
+            return error
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        return {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "This is a simulated answer."}
+            }],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 5, "total_tokens": len(prompt.split()) + 5}
+        }
+
+    return app
+
+
+class FakeUpstreamServer:
+    """Sahte sunucuyu arka plandaki bir thread'de (ayrı event loop) çalıştırır"""
+
+    def __init__(self, behavior: UpstreamBehavior, port: int = 0):
+        self.behavior = behavior
+        self.port = port or _free_port()
+        config = uvicorn.Config(create_app(behavior), host="127.0.0.1", port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> "FakeUpstreamServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible server with injected latency and errors")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--base-ms", type=float, default=20.0, help="Base latency per request")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of requests that are slow")
+    parser.add_argument("--tail-ms", type=float, default=1000.0, help="Extra latency of slow requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+    behavior = UpstreamBehavior(
+        base_ms=args.base_ms, tail_rate=args.tail_rate, tail_ms=args.tail_ms, error_rate=args.error_rate
+    )
+    uvicorn.run(create_app(behavior), host="127.0.0.1", port=args.port)
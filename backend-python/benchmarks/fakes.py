@@ -0,0 +1,309 @@
+"""
+Benchmark'lar için süreç içi sahte OpenAI / vektör store bileşenleri
+
+Her bileşen ayarlanabilir gecikme ve jitter ile gerçek servislerin
+gidiş-dönüş süresini taklit eder; API anahtarı ya da ağ gerektirmez.
+AIService'e `use_components` ile enjekte edilir.
+"""
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.vectorstores import VectorStore
+from pydantic import ConfigDict, Field
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# AIService'in çeviri prompt'u (TRANSLATION_PROMPT_TEMPLATE)
+TRANSLATION_PATTERN = re.compile(r"Translate the following text to (.+?)\. Only return the translation, nothing else:\n\n(.*)", re.DOTALL)
+
+
+class Latency:
+    """Sabit gecikme + [-jitter, +jitter] aralığında düzgün dağılımlı sapma (ms)"""
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0, seed: Optional[int] = None):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Bir çağrı için bekleme süresini saniye cinsinden döndürür"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.mean_ms + jitter) / 1000
+
+    def sleep(self):
+        delay = self.sample()
+        if delay:
+            time.sleep(delay)
+
+    async def asleep(self):
+        delay = self.sample()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class FakeEmbeddings(Embeddings):
+    """
+    Kelime hash'lerinden deterministik embedding üretir.
+
+    Ortak kelime içeren metinler benzer vektörler alır; böylece retrieval
+    sonuçları anlamlı kalır. Gecikme çağrı başına uygulanır (OpenAI'da
+    olduğu gibi batch boyutundan büyük ölçüde bağımsız).
+    """
+
+    def __init__(self, size: int = 256, latency: Optional[Latency] = None):
+        self.size = size
+        self.latency = latency or Latency()
+        self.calls = 0
+        self.texts = 0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for token in TOKEN_PATTERN.findall(text.casefold()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            vector[int.from_bytes(digest, "little") % self.size] += 1.0
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def _record(self, count: int):
+        self.calls += 1
+        self.texts += count
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.latency.sleep()
+        self._record(len(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await self.latency.asleep()
+        self._record(len(texts))
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Sabit cevap dönen sohbet modeli.
+
+    Token kullanımı kelime sayısından yaklaşık hesaplanır ve
+    `llm_output["token_usage"]` içinde raporlanır (TokenUsageHandler ile uyumlu).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    response: str = "This is a simulated answer based on the provided FAQ context."
+    latency: Latency = Field(default_factory=Latency)
+    calls: int = 0
+    # translate=True: çeviri prompt'ları `translations[(dil, metin)]` ya da "[dil] metin" ile cevaplanır
+    translate: bool = False
+    translations: Dict[Tuple[str, str], str] = Field(default_factory=dict)
+    translation_calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        match = TRANSLATION_PATTERN.match(str(messages[-1].content)) if self.translate else None
+        if match is None:
+            return self.response
+        self.translation_calls += 1
+        language, text = match.groups()
+        return self.translations.get((language, text), f"[{language}] {text}")
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        response = self._reply(messages)
+        prompt_tokens = sum(len(TOKEN_PATTERN.findall(str(m.content))) for m in messages)
+        completion_tokens = len(TOKEN_PATTERN.findall(response))
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=response))],
+            llm_output={"token_usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any) -> ChatResult:
+        self.latency.sleep()
+        return self._result(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        await self.latency.asleep()
+        return self._result(messages)
+
+
+class FakeVectorStore(VectorStore):
+    """
+    Bellek içi, namespace'li vektör store.
+
+    Pinecone'un ağ gecikmesini `latency` ile taklit eder; arama tam
+    (brute-force) kosinüs benzerliğiyle yapılır. Aynı `shared` sözlüğünü
+    kullanan store'lar aynı veriyi görür.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        namespace: str,
+        latency: Optional[Latency] = None,
+        shared: Optional[Dict[str, Dict[str, Tuple[np.ndarray, Document]]]] = None,
+    ):
+        self._embedding = embedding
+        self._namespace = namespace
+        self.latency = latency or Latency()
+        self._data = shared if shared is not None else {}
+        self._lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _rows(self) -> Dict[str, Tuple[np.ndarray, Document]]:
+        return self._data.setdefault(self._namespace, {})
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        self.latency.sleep()
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        with self._lock:
+            rows = self._rows
+            for doc_id, text, vector, metadata in zip(ids, texts, embeddings, metadatas):
+                document = Document(page_content=text, metadata=dict(metadata), id=doc_id)
+                rows[doc_id] = (np.asarray(vector, dtype=np.float32), document)
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self._embedding.embed_documents(texts), metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        with self._lock:
+            for doc_id in ids:
+                self._rows.pop(doc_id, None)
+        return True
+
+    def get_metadata(self, ids: Optional[List[str]] = None) -> Dict[str, dict]:
+        with self._lock:
+            rows = self._rows
+            ids = list(rows) if ids is None else [i for i in ids if i in rows]
+            return {doc_id: dict(rows[doc_id][1].metadata) for doc_id in ids}
+
+    def get_documents(self) -> Dict[str, Document]:
+        with self._lock:
+            return {doc_id: row[1] for doc_id, row in self._rows.items()}
+
+    def _search(
+        self, embedding: List[float], k: int, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        with self._lock:
+            rows = list(self._rows.values())
+        if filter:
+            # Yalnızca eşitlik filtresi (ör. {"language": "de"})
+            rows = [row for row in rows if all(row[1].metadata.get(key) == value for key, value in filter.items())]
+        if not rows:
+            return []
+        matrix = np.stack([vector for vector, _ in rows])
+        scores = matrix @ np.asarray(embedding, dtype=np.float32)
+        top = np.argsort(-scores)[:k]
+        return [(rows[i][1], float(scores[i])) for i in top]
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        self.latency.sleep()
+        return self._search(embedding, k, filter)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    async def asimilarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        await self.latency.asleep()
+        return [doc for doc, _ in self._search(embedding, k)]
+
+    async def asimilarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        await self.latency.asleep()
+        return self._search(embedding, k, filter)
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return await self.asimilarity_search_by_vector_with_score(await self._embedding.aembed_query(query), k, **kwargs)
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return await self.asimilarity_search_by_vector(await self._embedding.aembed_query(query), k)
+
+    def _select_relevance_score_fn(self):
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        namespace: str = "default",
+        **kwargs: Any,
+    ) -> "FakeVectorStore":
+        store = cls(embedding=embedding, namespace=namespace)
+        store.add_texts(texts, metadatas)
+        return store
+
+
+class FakeVectorBackend:
+    """Namespace başına FakeVectorStore üreten fabrika (AIService.vector_store_factory)"""
+
+    def __init__(self, embedding: Embeddings, latency: Optional[Latency] = None):
+        self.embedding = embedding
+        self.latency = latency or Latency()
+        self._data: Dict[str, Dict[str, Tuple[np.ndarray, Document]]] = {}
+
+    def __call__(self, namespace: str) -> FakeVectorStore:
+        return FakeVectorStore(self.embedding, namespace, latency=self.latency, shared=self._data)
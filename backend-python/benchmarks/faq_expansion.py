@@ -0,0 +1,135 @@
+"""
+SSS çeviri genişletme benchmark'ı: sorgu anında çeviri vs ingest anında çeviri
+
+Aynı SSS kataloğu ve çok dilli sorularla üç senaryoyu karşılaştırır:
+- translate: soru İngilizce'ye, cevap kullanıcının diline çevrilir (3 LLM çağrısı)
+- multilingual: tek çağrı, SSS'ler kaynak dilinde
+- expanded: SSS'ler ingest'te FAQ_TRANSLATION_LANGUAGES dillerine çevrilip
+  ayrıca saklanır; sorgu kullanıcının dilindeki kayıtlarda aranır
+
+Sahte model çeviri prompt'larını sabit bir sözlükle cevaplar (gerçek bir
+çevirmenin aynı soruya vereceği tutarlı çeviri gibi); sorgu başına LLM ve
+çeviri çağrısı, gecikme ve ingest'in çeviri maliyeti ölçülür. Önbellekler
+kapalıdır, API anahtarı gerektirmez.
+
+Kullanım:
+    python -m benchmarks.faq_expansion --languages en,es,de,fr --llm-ms 300 --output faq_expansion.json
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import SAMPLE_FAQS, SAMPLE_QUESTIONS, summarize_latencies, write_json
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings, Latency
+from models import FAQ
+from services.ai_service import LANGUAGE_NAMES, AIService
+from services.translation_cache import TranslationCache
+from services.vector_index import LocalVectorIndex
+
+BENCHMARK_USER_ID = "benchmark-faq-expansion"
+
+# SAMPLE_FAQS sorularının çevirileri (SAMPLE_QUESTIONS'taki sorular bunların arasında)
+QUESTION_TRANSLATIONS = [
+    {
+        "en": "How can I cancel my order?",
+        "es": "¿Cómo puedo cancelar mi pedido?",
+        "de": "Wie kann ich meine Bestellung stornieren?",
+        "fr": "Comment puis-je annuler ma commande ?",
+    },
+    {
+        "en": "How much is the shipping fee?",
+        "es": "¿Cuánto cuesta el envío?",
+        "de": "Wie hoch sind die Versandkosten?",
+        "fr": "Quels sont les frais de livraison ?",
+    },
+    {
+        "en": "What are the return conditions?",
+        "es": "¿Cuáles son las condiciones de devolución?",
+        "de": "Wie kann ich einen Artikel zurückgeben?",
+        "fr": "Quelles sont les conditions de retour ?",
+    },
+]
+
+
+def build_phrasebook() -> Dict[Tuple[str, str], str]:
+    """(hedef dil adı, metin) -> çeviri; soruların her dildeki hali birbirine çevrilir"""
+    phrasebook = {}
+    for faq, translations in zip(SAMPLE_FAQS, QUESTION_TRANSLATIONS):
+        variants = {"tr": faq["question"], **translations}
+        for target, translated in variants.items():
+            for source in variants.values():
+                if source != translated:
+                    phrasebook[(LANGUAGE_NAMES[target], source)] = translated
+    return phrasebook
+
+
+async def run_scenario(name: str, mode: str, languages: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as index_dir:
+        service = AIService()
+        service.vector_backend = "local"
+        service.local_index = LocalVectorIndex(index_dir)
+        service.pipeline_mode = mode
+        llm = FakeChatModel(
+            translate=True, translations=build_phrasebook(), latency=Latency(args.llm_ms, args.llm_ms * 0.2, seed=0)
+        )
+        service.use_components(embeddings=FakeEmbeddings(latency=Latency(args.embed_ms)), llm=llm)
+        # Önbellekler ölçümü bozmasın diye kapatılır
+        service.semantic_cache = None
+        service.translation_cache = TranslationCache(max_entries=0)
+
+        started = time.perf_counter()
+        await service.ingest_faqs([FAQ(**faq) for faq in SAMPLE_FAQS], BENCHMARK_USER_ID, languages=languages)
+        ingest_ms = (time.perf_counter() - started) * 1000
+        ingest_calls = llm.calls
+
+        latencies_ms = []
+        llm.calls = llm.translation_calls = 0
+        for _ in range(args.runs):
+            for question in SAMPLE_QUESTIONS:
+                started = time.perf_counter()
+                await service.query(question, BENCHMARK_USER_ID)
+                latencies_ms.append((time.perf_counter() - started) * 1000)
+
+        queries = len(latencies_ms)
+        return {
+            "scenario": name,
+            "mode": mode,
+            "languages": languages,
+            "ingest_ms": round(ingest_ms, 1),
+            "ingest_llm_calls": ingest_calls,
+            **summarize_latencies(latencies_ms),
+            "llm_calls_per_query": round(llm.calls / queries, 2),
+            "translation_calls_per_query": round(llm.translation_calls / queries, 2),
+        }
+
+
+async def main(args: argparse.Namespace):
+    os.environ["EMBEDDING_CACHE_DIR"] = ""
+    os.environ.pop("SHARED_CACHE_PATH", None)
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+
+    results = []
+    for name, mode, expand in (("translate", "translate", []), ("multilingual", "multilingual", []), ("expanded", "translate", languages)):
+        print(f"⏱️ Benchmarking scenario: {name}")
+        results.append(await run_scenario(name, mode, expand, args))
+
+    print(f"\n{'scenario':<14}{'ingest calls':>14}{'p50 ms':>10}{'p95 ms':>10}{'llm/q':>8}{'transl/q':>10}")
+    for r in results:
+        print(
+            f"{r['scenario']:<14}{r['ingest_llm_calls']:>14}{r['p50_ms']:>10.0f}{r['p95_ms']:>10.0f}"
+            f"{r['llm_calls_per_query']:>8}{r['translation_calls_per_query']:>10}"
+        )
+    write_json({"benchmark": "faq_expansion", "config": vars(args), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare query-time translation with ingest-time FAQ expansion")
+    parser.add_argument("--languages", default="en,es,de,fr", help="Languages FAQs are expanded into")
+    parser.add_argument("--runs", type=int, default=5, help="How many times to run the question set per scenario")
+    parser.add_argument("--llm-ms", type=float, default=300.0, help="Simulated LLM call latency")
+    parser.add_argument("--embed-ms", type=float, default=20.0, help="Simulated embedding call latency")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""
+Dil tespiti mikro-benchmark'ı: langdetect.detect vs LanguageDetector
+
+Kısa sohbet mesajlarında hız, doğruluk ve tekrarlı çalıştırmalarda
+kararlılığı (aynı girdiye farklı sonuç dönme sayısı) ölçer. API anahtarı
+gerektirmez.
+
+Kullanım:
+    python -m benchmarks.language_detection --repeat 200 --output language_detection.json
+"""
+import argparse
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import write_json
+from services.ai_service import LANGUAGE_NAMES
+from services.language_detector import LanguageDetector
+
+# (mesaj, beklenen dil) - gerçek trafiğe benzeyen kısa mesajlar
+LABELED_MESSAGES: List[Tuple[str, str]] = [
+    ("Merhaba", "tr"),
+    ("kargo ücreti ne kadar?", "tr"),
+    ("Siparişimi nasıl iptal ederim?", "tr"),
+    ("iade", "tr"),
+    ("teşekkürler", "tr"),
+    ("hello", "en"),
+    ("How can I cancel my order?", "en"),
+    ("where is my package", "en"),
+    ("¿Cuánto cuesta el envío?", "es"),
+    ("gracias", "es"),
+    ("Quels sont les frais de livraison ?", "fr"),
+    ("Wie kann ich einen Artikel zurückgeben?", "de"),
+    ("Quanto costa la spedizione?", "it"),
+    ("Como posso cancelar meu pedido?", "pt"),
+    ("Сколько стоит доставка?", "ru"),
+    ("كم تكلفة الشحن؟", "ar"),
+    ("运费是多少？", "zh"),
+    ("送料はいくらですか？", "ja"),
+    ("배송비는 얼마인가요?", "ko"),
+]
+
+
+def measure(name: str, detect: Callable[[str], str], repeat: int) -> Dict[str, float]:
+    """Bir tespit fonksiyonunu tüm mesajlar üzerinde `repeat` kez çalıştırır"""
+    results = defaultdict(set)
+    correct = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for message, expected in LABELED_MESSAGES:
+            try:
+                language = detect(message)
+            except Exception:
+                language = "error"
+            results[message].add(language)
+            correct += language == expected
+    elapsed = time.perf_counter() - started
+    calls = repeat * len(LABELED_MESSAGES)
+    return {
+        "detector": name,
+        "calls": calls,
+        "us_per_call": round(elapsed / calls * 1e6, 2),
+        "accuracy": round(correct / calls, 3),
+        "unstable_messages": sum(1 for langs in results.values() if len(langs) > 1),
+    }
+
+
+def main(repeat: int, output: str):
+    from langdetect import detect
+
+    # Profil yükleme maliyeti ayrı ölçülür
+    started = time.perf_counter()
+    detect("warm up")
+    langdetect_load_ms = (time.perf_counter() - started) * 1000
+
+    detector = LanguageDetector(supported_languages=LANGUAGE_NAMES.keys())
+    uncached = LanguageDetector(supported_languages=LANGUAGE_NAMES.keys(), cache_size=0)
+    for warm in (detector, uncached):
+        warm._get_factory()
+
+    results = [
+        measure("langdetect.detect", detect, repeat),
+        measure("LanguageDetector (no cache)", uncached.detect, repeat),
+        measure("LanguageDetector", detector.detect, repeat),
+    ]
+
+    print(f"langdetect profile load: {langdetect_load_ms:.0f} ms\n")
+    print(f"{'detector':<30}{'us/call':>10}{'accuracy':>10}{'unstable':>10}")
+    for result in results:
+        print(
+            f"{result['detector']:<30}{result['us_per_call']:>10}"
+            f"{result['accuracy']:>10}{result['unstable_messages']:>10}"
+        )
+    write_json(
+        {"benchmark": "language_detection", "repeat": repeat, "langdetect_load_ms": round(langdetect_load_ms, 1), "results": results},
+        output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark language detection against langdetect.detect")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the labeled message set")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    main(args.repeat, args.output)
@@ -0,0 +1,227 @@
+"""
+/v1/query ve /v1/ingest için yük testi
+
+Varsayılan olarak main.py uygulamasını süreç içinde (httpx ASGI transport)
+sahte embedding, sohbet modeli ve vektör store ile çalıştırır; OpenAI veya
+Pinecone'a istek gitmez, maliyet yoktur. Sahte bileşenlerin gecikmesi ve
+jitter'ı ayarlanabilir. --url verilirse çalışan bir sunucuya (API_KEY ile)
+gerçek HTTP istekleri gönderilir.
+
+Her uç nokta ve eşzamanlılık seviyesi için p50/p95/p99 gecikme ve
+saniye başına istek (RPS) raporlanır.
+
+Kullanım:
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 200 --output load.json
+    python -m benchmarks.load_test --llm-ms 800 --llm-jitter-ms 300 --endpoints query
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import platform
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import SAMPLE_FAQS, SAMPLE_QUESTIONS, summarize_latencies, write_json
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings, FakeVectorBackend, Latency
+from services.translation_cache import TranslationCache
+
+ENDPOINTS = ("query", "ingest")
+BENCHMARK_API_KEY = "benchmark-api-key"
+
+# Bir istek gövdesi üreten fonksiyon: (istek sırası) -> (yol, JSON gövde)
+RequestFactory = Callable[[int], Tuple[str, Dict[str, Any]]]
+
+
+def query_request(tenants: int) -> RequestFactory:
+    def build(i: int):
+        return "/v1/query", {
+            "message": SAMPLE_QUESTIONS[i % len(SAMPLE_QUESTIONS)],
+            "user_id": f"load-tenant-{i % tenants}",
+        }
+    return build
+
+
+def ingest_request(tenants: int, faqs_per_request: int) -> RequestFactory:
+    def build(i: int):
+        faqs = [
+            {
+                "question": f"{SAMPLE_FAQS[j % len(SAMPLE_FAQS)]['question']} #{i}-{j}",
+                "answer": SAMPLE_FAQS[j % len(SAMPLE_FAQS)]["answer"],
+            }
+            for j in range(faqs_per_request)
+        ]
+        return "/v1/ingest", {"faqs": faqs, "user_id": f"load-tenant-{i % tenants}"}
+    return build
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    build: RequestFactory,
+    concurrency: int,
+    total_requests: int,
+) -> Dict[str, Any]:
+    """Sabit sayıda isteği `concurrency` eşzamanlı istemciyle gönderir"""
+    latencies_ms: List[float] = []
+    status_codes: Dict[str, int] = {}
+    answer_paths: Dict[str, int] = {}
+    next_request = 0
+
+    async def worker():
+        nonlocal next_request
+        while next_request < total_requests:
+            i = next_request
+            next_request += 1
+            path, body = build(i)
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                status = str(response.status_code)
+                if response.status_code == 200 and endpoint == "query":
+                    # Cevabın yolu (cache/direct/rag) eşik ayarı için raporlanır
+                    answer_path = response.json().get("path") or "unknown"
+                    answer_paths[answer_path] = answer_paths.get(answer_path, 0) + 1
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            status_codes[status] = status_codes.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(count for status, count in status_codes.items() if status != "200")
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "status_codes": status_codes,
+        "answer_paths": answer_paths,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        **summarize_latencies(latencies_ms),
+    }
+
+
+def build_in_process_client(args: argparse.Namespace) -> httpx.AsyncClient:
+    """main.app'i sahte bileşenlerle kurup ASGI üzerinden konuşan bir istemci döndürür"""
+    os.environ["API_KEY"] = BENCHMARK_API_KEY
+    import main
+
+    service = main.ai_service
+    embeddings = FakeEmbeddings(latency=Latency(args.embed_ms, args.embed_jitter_ms, seed=args.seed))
+    llm = FakeChatModel(latency=Latency(args.llm_ms, args.llm_jitter_ms, seed=args.seed))
+    backend = FakeVectorBackend(embeddings, latency=Latency(args.vector_ms, args.vector_jitter_ms, seed=args.seed))
+    service.use_components(embeddings=embeddings, llm=llm, vector_store_factory=backend)
+
+    if not args.with_caches:
+        # Her istek tam pipeline'ı çalıştırsın
+        service.semantic_cache = None
+        service.translation_cache = TranslationCache(max_entries=0)
+        service.singleflight = None
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=main.app),
+        base_url="http://load-test",
+        headers={"X-API-KEY": BENCHMARK_API_KEY},
+        timeout=args.timeout,
+    )
+
+
+async def main(args: argparse.Namespace):
+    in_process = args.url is None
+    if in_process:
+        client = build_in_process_client(args)
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            headers={"X-API-KEY": os.getenv("API_KEY", "")},
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=max(args.concurrency)),
+        )
+
+    factories = {
+        "query": query_request(args.tenants),
+        "ingest": ingest_request(args.tenants, args.faqs_per_request),
+    }
+
+    results = []
+    async with client:
+        if "query" in args.endpoints:
+            # Sorgular boş namespace'e gitmesin
+            for tenant in range(args.tenants):
+                response = await client.post("/v1/ingest", json={
+                    "faqs": SAMPLE_FAQS, "user_id": f"load-tenant-{tenant}"
+                })
+                response.raise_for_status()
+
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                print(f"⏱️ {endpoint}: concurrency={concurrency}, requests={args.requests}")
+                results.append(await run_level(
+                    client, endpoint, factories[endpoint], concurrency, args.requests
+                ))
+
+    print(f"\n{'endpoint':<10}{'conc':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for result in results:
+        print(
+            f"{result['endpoint']:<10}{result['concurrency']:>6}{result['rps']:>10.1f}"
+            f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>8}"
+        )
+
+    config = {
+        "target": "in-process" if in_process else args.url,
+        "pipeline_mode": os.getenv("PIPELINE_MODE", "translate"),
+        "tenants": args.tenants,
+        "faqs_per_request": args.faqs_per_request,
+        "with_caches": args.with_caches,
+        "python": platform.python_version(),
+    }
+    if in_process:
+        config["fake_latency_ms"] = {
+            "embed": [args.embed_ms, args.embed_jitter_ms],
+            "llm": [args.llm_ms, args.llm_jitter_ms],
+            "vector": [args.vector_ms, args.vector_jitter_ms],
+        }
+    write_json({"benchmark": "load_test", "config": config, "results": results}, args.output)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _endpoint_list(value: str) -> List[str]:
+    endpoints = [v.strip() for v in value.split(",") if v.strip()]
+    for endpoint in endpoints:
+        if endpoint not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{endpoint}', expected one of {ENDPOINTS}")
+    return endpoints
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test /v1/query and /v1/ingest with fake or real backends")
+    parser.add_argument("--endpoints", type=_endpoint_list, default=list(ENDPOINTS), help="Comma-separated: query,ingest")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32], help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--tenants", type=int, default=4, help="Number of user_id namespaces to spread load over")
+    parser.add_argument("--faqs-per-request", type=int, default=20, help="FAQs per /v1/ingest request")
+    parser.add_argument("--with-caches", action="store_true", help="Keep semantic/translation caches and coalescing on")
+    parser.add_argument("--url", default=None, help="Target a running server instead of the in-process fake setup")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--embed-ms", type=float, default=50.0, help="Fake embedding call latency")
+    parser.add_argument("--embed-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--llm-ms", type=float, default=400.0, help="Fake chat completion latency")
+    parser.add_argument("--llm-jitter-ms", type=float, default=150.0)
+    parser.add_argument("--vector-ms", type=float, default=30.0, help="Fake vector store round-trip latency")
+    parser.add_argument("--vector-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
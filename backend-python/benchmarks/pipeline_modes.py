@@ -0,0 +1,90 @@
+"""
+Pipeline mode benchmark: translate (3 LLM çağrısı) vs multilingual (tek çağrı)
+
+Her iki modda aynı çok dilli soruları çalıştırır; gecikme ve token
+kullanımını karşılaştırır. OPENAI_API_KEY gerektirir; vektör store için
+VECTOR_BACKEND=local ile Pinecone olmadan da çalışır.
+
+Kullanım:
+    python -m benchmarks.pipeline_modes --runs 3 --output pipeline_modes.json
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+from benchmarks.common import SAMPLE_FAQS, SAMPLE_QUESTIONS, summarize_latencies, write_json
+from models import FAQ
+from services.ai_service import PIPELINE_MODES, AIService
+from services.metrics import TokenUsageHandler
+from services.translation_cache import TranslationCache
+
+BENCHMARK_USER_ID = "benchmark-pipeline-modes"
+
+
+async def run_mode(service: AIService, mode: str, questions: List[str], runs: int) -> Dict[str, Any]:
+    """Tek bir pipeline modunu ölçer"""
+    service.pipeline_mode = mode
+    handler = TokenUsageHandler()
+    service.llm.callbacks = [handler]
+
+    latencies_ms = []
+    for _ in range(runs):
+        for question in questions:
+            started = time.perf_counter()
+            await service.query(question, BENCHMARK_USER_ID)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    queries = len(latencies_ms)
+    return {
+        "mode": mode,
+        **summarize_latencies(latencies_ms),
+        "llm_calls": handler.calls,
+        "prompt_tokens": handler.prompt_tokens,
+        "completion_tokens": handler.completion_tokens,
+        "llm_calls_per_query": round(handler.calls / queries, 2),
+        "tokens_per_query": round(handler.total_tokens / queries, 1),
+    }
+
+
+async def main(runs: int, output: str):
+    load_dotenv()
+    service = AIService()
+    # Önbellekler ölçümü bozmasın diye kapatılır
+    service.semantic_cache = None
+    service.translation_cache = TranslationCache(max_entries=0)
+    # Her soru seçilen modun pipeline'ından geçsin: doğrudan cevap, sözcüksel
+    # kısa yol ve kullanıcının dilindeki kayıtlarda çevirisiz arama kapatılır
+    service.direct_answer_threshold = 0
+    service.lexical_enabled = False
+    service.native_retrieval_enabled = False
+    await service.initialize()
+
+    if not service.llm or not service.embeddings or not service._vector_store_ready():
+        print("❌ This benchmark needs OPENAI_API_KEY and a configured vector backend (e.g. VECTOR_BACKEND=local)")
+        return
+
+    await service.ingest_faqs([FAQ(**faq) for faq in SAMPLE_FAQS], BENCHMARK_USER_ID)
+
+    results = []
+    for mode in PIPELINE_MODES:
+        print(f"⏱️ Benchmarking pipeline mode: {mode}")
+        results.append(await run_mode(service, mode, SAMPLE_QUESTIONS, runs))
+
+    print(f"\n{'mode':<14}{'p50 ms':>10}{'p95 ms':>10}{'calls/q':>10}{'tokens/q':>10}")
+    for result in results:
+        print(
+            f"{result['mode']:<14}{result['p50_ms']:>10.0f}{result['p95_ms']:>10.0f}"
+            f"{result['llm_calls_per_query']:>10}{result['tokens_per_query']:>10}"
+        )
+    write_json({"benchmark": "pipeline_modes", "runs": runs, "results": results}, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare translate vs multilingual pipeline modes")
+    parser.add_argument("--runs", type=int, default=3, help="How many times to run the question set per mode")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.output))
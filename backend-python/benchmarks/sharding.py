@@ -0,0 +1,169 @@
+"""
+Sharding benchmark: rastgele worker seçimi vs tenant'a göre tutarlı hash
+
+N worker sürecini aynı süreçte N ayrı AIService örneğiyle canlandırır (her
+birinin kendi pipeline kaydı, semantik önbelleği, çeviri önbelleği, BM25
+indeksleri ve yerel vektör indeksi görünümü vardır; vektörler ortak diskte).
+Zipf dağılımlı tenant trafiği iki şekilde dağıtılır:
+- random: uvicorn/pod yük dengeleyicisi gibi her istek rastgele bir worker'a
+- ring: router.py gibi user_id'nin tutarlı hash'iyle sahibi olan worker'a
+
+Önbellek isabet oranı, sorgu başına LLM çağrısı ve worker başına tutulan
+tenant durumu karşılaştırılır. Ardından halkadan bir worker çıkarılır ve yer
+değiştiren tenant oranı ile sonraki isabet oranı ölçülür. API anahtarı gerektirmez.
+
+Kullanım:
+    python -m benchmarks.sharding --workers 4 --tenants 200 --queries 4000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import SAMPLE_FAQS, SAMPLE_QUESTIONS, write_json
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from models import FAQ
+from services.ai_service import AIService
+from services.sharding import HashRing
+from services.vector_index import LocalVectorIndex
+
+
+def build_worker(index_dir: str) -> AIService:
+    """Kendi bellek içi durumu olan, vektörleri ortak dizinden okuyan bir worker"""
+    service = AIService()
+    service.vector_backend = "local"
+    service.local_index = LocalVectorIndex(index_dir)
+    service.use_components(embeddings=FakeEmbeddings(), llm=FakeChatModel())
+    return service
+
+
+def worker_state(service: AIService) -> Dict[str, Any]:
+    pipelines = service.pipelines.stats()
+    cache = service.semantic_cache.stats()
+    return {
+        "pipelines": pipelines["tenants"],
+        "loaded_namespaces": len(service.local_index._namespaces),
+        "lexical_indexes": len(service.lexical_indexes),
+        "semantic_cache_entries": cache["entries"],
+        "semantic_cache_kb": round(cache["bytes"] / 1024, 1),
+    }
+
+
+def counters(workers: List[AIService]) -> Dict[str, int]:
+    totals = {"cache_hits": 0, "cache_misses": 0, "pipeline_hits": 0, "pipeline_misses": 0, "llm_calls": 0}
+    for service in workers:
+        cache = service.semantic_cache.stats()
+        pipelines = service.pipelines.stats()
+        totals["cache_hits"] += cache["hits"]
+        totals["cache_misses"] += cache["misses"]
+        totals["pipeline_hits"] += pipelines["hits"]
+        totals["pipeline_misses"] += pipelines["misses"]
+        totals["llm_calls"] += service.llm.calls
+    return totals
+
+
+async def run_phase(
+    name: str,
+    workers: List[AIService],
+    route: Callable[[str], int],
+    workload: List[tuple]
+) -> Dict[str, Any]:
+    """İş yükünü verilen yönlendirmeyle çalıştırır; sayaçların bu fazdaki artışını raporlar"""
+    before = counters(workers)
+    for user_id, question in workload:
+        await workers[route(user_id)].query(question, user_id)
+    after = counters(workers)
+    delta = {key: after[key] - before[key] for key in after}
+    states = [worker_state(service) for service in workers]
+    lookups = delta["cache_hits"] + delta["cache_misses"]
+    pipeline_lookups = delta["pipeline_hits"] + delta["pipeline_misses"]
+    return {
+        "phase": name,
+        "queries": len(workload),
+        "cache_hit_rate": round(delta["cache_hits"] / max(1, lookups), 3),
+        "pipeline_hit_rate": round(delta["pipeline_hits"] / max(1, pipeline_lookups), 3),
+        "llm_calls_per_query": round(delta["llm_calls"] / len(workload), 2),
+        "tenants_per_worker": round(sum(s["pipelines"] for s in states) / len(states), 1),
+        "namespaces_per_worker": round(sum(s["loaded_namespaces"] for s in states) / len(states), 1),
+        "cache_kb_per_worker": round(sum(s["semantic_cache_kb"] for s in states) / len(states), 1),
+        "workers": states,
+    }
+
+
+def build_workload(tenants: List[str], count: int, zipf: float, rng: random.Random) -> List[tuple]:
+    """Zipf dağılımlı tenant'lar (az sayıda çok aktif tenant) ve örnek sorular"""
+    weights = [1 / (rank + 1) ** zipf for rank in range(len(tenants))]
+    chosen = rng.choices(tenants, weights=weights, k=count)
+    return [(user_id, rng.choice(SAMPLE_QUESTIONS)) for user_id in chosen]
+
+
+async def run_strategy(strategy: str, args: argparse.Namespace, index_dir: str, tenants: List[str]) -> List[Dict[str, Any]]:
+    rng = random.Random(args.seed)
+    workload = build_workload(tenants, args.queries, args.zipf, rng)
+    after_removal = build_workload(tenants, args.queries // 2, args.zipf, rng)
+    workers = [build_worker(index_dir) for _ in range(args.workers)]
+    names = [f"worker-{i}" for i in range(args.workers)]
+    ring = HashRing(names)
+
+    if strategy == "random":
+        route = lambda user_id: rng.randrange(len(workers))
+    else:
+        route = lambda user_id: names.index(ring.node_for(user_id))
+    results = [await run_phase(strategy, workers, route, workload)]
+
+    # Bir worker düşer: random'da yük kalanlara dağılır, ring'de yalnızca onun tenant'ları taşınır
+    removed = names[-1]
+    owners = {user_id: ring.node_for(user_id) for user_id in tenants}
+    ring.remove(removed)
+    moved = sum(owners[user_id] != ring.node_for(user_id) for user_id in tenants)
+    alive = len(workers) - 1
+    if strategy == "random":
+        route = lambda user_id: rng.randrange(alive)
+    phase = await run_phase(f"{strategy}_minus_one", workers[:alive], route, after_removal)
+    if strategy == "ring":
+        phase["tenants_moved"] = round(moved / len(tenants), 3)
+    results.append(phase)
+    return results
+
+
+async def main(args: argparse.Namespace):
+    # Worker başına bellek sınırları (gerçek süreçlerdeki gibi)
+    os.environ["PIPELINE_REGISTRY_MAX_TENANTS"] = str(args.max_tenants)
+    os.environ["SEMANTIC_CACHE_MAX_MB"] = str(args.cache_mb)
+    os.environ["EMBEDDING_CACHE_DIR"] = ""
+    os.environ.pop("SHARED_CACHE_PATH", None)
+    tenants = [f"tenant-{i}" for i in range(args.tenants)]
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        loader = build_worker(index_dir)
+        faqs = [FAQ(**faq) for faq in SAMPLE_FAQS]
+        for user_id in tenants:
+            await loader.ingest_faqs(faqs, user_id)
+
+        results = []
+        for strategy in ("random", "ring"):
+            results += await run_strategy(strategy, args, index_dir, tenants)
+
+    print(f"\n{'phase':<18}{'cache hit':>10}{'pipe hit':>10}{'llm/q':>8}{'tenants/w':>11}{'ns/w':>8}{'cache KB/w':>12}{'moved':>8}")
+    for r in results:
+        moved = f"{r['tenants_moved']:.0%}" if "tenants_moved" in r else "-"
+        print(
+            f"{r['phase']:<18}{r['cache_hit_rate']:>10.1%}{r['pipeline_hit_rate']:>10.1%}{r['llm_calls_per_query']:>8}"
+            f"{r['tenants_per_worker']:>11}{r['namespaces_per_worker']:>8}{r['cache_kb_per_worker']:>12}{moved:>8}"
+        )
+    write_json({"benchmark": "sharding", "config": vars(args), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare random worker routing with consistent-hash tenant sharding")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=4000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Tenant popularity skew")
+    parser.add_argument("--max-tenants", type=int, default=50, help="Pipeline registry size per worker")
+    parser.add_argument("--cache-mb", type=float, default=0.25, help="Semantic cache size per worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    asyncio.run(main(parser.parse_args()))
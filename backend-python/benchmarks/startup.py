@@ -0,0 +1,141 @@
+"""
+Soğuk başlangıç benchmark'ı: import süresi ve hazır olma süresi
+
+Her çalıştırma yeni bir Python süreci başlatır ve şunları ölçer:
+- import_ms: `import main` süresi
+- accept_ms: startup hook'unun dönmesi (sunucu probe ve isteği kabul etmeye başlar)
+- ready_ms: arka plan başlatmasının bitmesi (/ready'nin cevap verebildiği an)
+
+Medyan değerler bütçeyi aşarsa çıkış kodu 1 olur; CI'da kullanılabilir.
+API anahtarları yoksa servis development mode'da başlar (status: degraded).
+
+Kullanım:
+    python -m benchmarks.startup --runs 5 --import-budget-ms 1500 --output startup.json
+    python -m benchmarks.startup --top-imports 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.common import percentile, write_json
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_MARKER = "STARTUP_RESULT "
+
+CHILD_SCRIPT = f"""
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def run():
+    await main.startup_event()
+    accepting = time.perf_counter()
+    await main.init_task
+    ready = time.perf_counter()
+    readiness = main.ai_service.readiness()
+    await main.shutdown_event()
+    return accepting, ready, readiness
+
+accepting, ready, readiness = asyncio.run(run())
+print({RESULT_MARKER!r} + json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "accept_ms": (accepting - started) * 1000,
+    "ready_ms": (ready - started) * 1000,
+    "status": readiness["status"],
+}}))
+"""
+
+
+def run_once() -> Dict[str, Any]:
+    """Yeni bir süreçte import ve başlatmayı ölçer"""
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"No result from child process:\n{completed.stdout}\n{completed.stderr}")
+
+
+def top_imports(limit: int) -> List[Dict[str, Any]]:
+    """`python -X importtime` çıktısından kümülatif olarak en pahalı üst seviye paketleri döndürür"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    totals: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Başlık satırı
+        package = name.strip().split(".")[0]
+        # Aynı paketin iç içe modülleri tekrar sayılmasın diye en dıştaki (en büyük) değer alınır
+        totals[package] = max(totals.get(package, 0), int(cumulative))
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"package": package, "cumulative_ms": round(us / 1000, 1)} for package, us in ranked]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(values, 50), 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    runs = []
+    for i in range(args.runs):
+        result = run_once()
+        print(
+            f"run {i + 1}: import {result['import_ms']:.0f} ms, accept {result['accept_ms']:.0f} ms, "
+            f"ready {result['ready_ms']:.0f} ms ({result['status']})"
+        )
+        runs.append(result)
+
+    summary = {
+        "import": summarize([r["import_ms"] for r in runs]),
+        "accept": summarize([r["accept_ms"] for r in runs]),
+        "ready": summarize([r["ready_ms"] for r in runs]),
+    }
+    budgets = {"import": args.import_budget_ms, "ready": args.ready_budget_ms}
+    over_budget = [name for name, budget in budgets.items() if budget and summary[name]["p50_ms"] > budget]
+
+    results: Dict[str, Any] = {
+        "benchmark": "startup",
+        "runs": runs,
+        "summary": summary,
+        "budgets_ms": budgets,
+        "over_budget": over_budget,
+    }
+    if args.top_imports:
+        results["top_imports"] = top_imports(args.top_imports)
+        print("\nSlowest imports (cumulative):")
+        for item in results["top_imports"]:
+            print(f"  {item['package']:<28}{item['cumulative_ms']:>10.1f} ms")
+
+    print(
+        f"\np50 import {summary['import']['p50_ms']} ms (budget {args.import_budget_ms}), "
+        f"p50 ready {summary['ready']['p50_ms']} ms (budget {args.ready_budget_ms})"
+    )
+    write_json(results, args.output)
+    if over_budget:
+        print(f"❌ Over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold import and startup time against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh processes to measure")
+    parser.add_argument("--import-budget-ms", type=float, default=1500, help="Budget for p50 `import main` (0 = none)")
+    parser.add_argument("--ready-budget-ms", type=float, default=5000, help="Budget for p50 time to ready (0 = none)")
+    parser.add_argument("--top-imports", type=int, default=0, help="Also list the N slowest top-level imports")
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+"""
+Transport benchmark: SDK varsayılanları vs havuzlu transport (yeniden deneme, hedge)
+
+Gecikme kuyruğu ve 503 hataları enjekte eden sahte OpenAI sunucusuna
+(benchmarks.fake_upstream) gerçek OpenAIEmbeddings istemcisiyle istek atar
+ve üç yapılandırmayı karşılaştırır:
+- sdk_default: langchain/OpenAI SDK varsayılan transport ve yeniden denemeleri
+- pooled_retry: TransportConfig havuzu, süre sınırı ve jitter'lı yeniden deneme
+- pooled_hedge: aynısı + p95 gecikmesinden sonra hedge isteği
+
+API anahtarı gerektirmez.
+
+Kullanım:
+    python -m benchmarks.transport --requests 400 --concurrency 16 --tail-rate 0.05 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from langchain_openai import OpenAIEmbeddings
+
+from benchmarks.common import summarize_latencies, write_json
+from benchmarks.fake_upstream import FakeUpstreamServer, UpstreamBehavior
+from services.transport import CallPolicy, TransportConfig, build_async_client, build_sync_client
+
+
+def build_embeddings(strategy: str, base_url: str, config: TransportConfig, counters: Dict[str, int]) -> OpenAIEmbeddings:
+    common = {"api_key": "fake", "base_url": base_url, "model": "text-embedding-ada-002", "check_embedding_ctx_length": False}
+    if strategy == "sdk_default":
+        return OpenAIEmbeddings(**common)
+
+    def on_retry(upstream: str, reason: str):
+        counters["retries"] += 1
+
+    def on_hedge(upstream: str, outcome: str):
+        counters["hedges"] += 1
+        counters[outcome] = counters.get(outcome, 0) + 1
+
+    config = replace(config, hedge=strategy == "pooled_hedge")
+    policy = CallPolicy("openai_embeddings", config, on_retry=on_retry, on_hedge=on_hedge)
+    return OpenAIEmbeddings(
+        **common,
+        http_async_client=build_async_client(policy),
+        http_client=build_sync_client(config),
+        max_retries=0
+    )
+
+
+async def run_strategy(strategy: str, args: argparse.Namespace, config: TransportConfig) -> Dict[str, Any]:
+    """Tek bir yapılandırmayı taze bir sahte sunucuya karşı ölçer"""
+    behavior = UpstreamBehavior(
+        base_ms=args.base_ms, tail_rate=args.tail_rate, tail_ms=args.tail_ms,
+        error_rate=args.error_rate, seed=args.seed
+    )
+    counters = {"retries": 0, "hedges": 0}
+    with FakeUpstreamServer(behavior) as server:
+        embeddings = build_embeddings(strategy, server.base_url, config, counters)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies_ms: List[float] = []
+        failures = 0
+
+        async def one(i: int):
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await embeddings.aembed_query(f"question {i}")
+                    latencies_ms.append((time.perf_counter() - started) * 1000)
+                except Exception:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        upstream = dict(behavior.stats)
+
+    return {
+        "strategy": strategy,
+        **summarize_latencies(latencies_ms),
+        "failures": failures,
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "upstream_requests": upstream["requests"],
+        **counters,
+    }
+
+
+async def main(args: argparse.Namespace):
+    config = TransportConfig(
+        max_connections=args.concurrency * 2,
+        max_keepalive_connections=args.concurrency * 2,
+        timeout=args.timeout,
+        max_retries=args.max_retries,
+        hedge_min_samples=args.hedge_min_samples
+    )
+    results = [await run_strategy(strategy, args, config) for strategy in args.strategies.split(",")]
+
+    print(f"\n{'strategy':<14}{'p50':>8}{'p95':>9}{'p99':>9}{'max':>9}{'fail':>6}{'upstream':>10}{'retries':>9}{'hedges':>8}")
+    for r in results:
+        print(
+            f"{r['strategy']:<14}{r['p50_ms']:>8}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}"
+            f"{r['failures']:>6}{r['upstream_requests']:>10}{r['retries']:>9}{r['hedges']:>8}"
+        )
+    write_json({"benchmark": "transport", "config": vars(args), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SDK default transport with pooled retries and hedging")
+    parser.add_argument("--strategies", default="sdk_default,pooled_retry,pooled_hedge")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--base-ms", type=float, default=20.0, help="Fake upstream base latency")
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="Fraction of slow upstream responses")
+    parser.add_argument("--tail-ms", type=float, default=1500.0, help="Extra latency of slow responses")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of 503 responses")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-call deadline for pooled strategies")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--hedge-min-samples", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Optional JSON output path")
+    asyncio.run(main(parser.parse_args()))
@@ -1,13 +1,28 @@
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Path, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.background import BackgroundTask
+import asyncio
 import os
 from dotenv import load_dotenv
 from typing import List, Optional
-import uvicorn
 
-from models import IngestRequest, QueryRequest, IngestResponse, QueryResponse
+from models import (
+    IngestRequest, QueryRequest, IngestResponse, QueryResponse,
+    BatchQueryRequest, BatchQueryResponse, IngestJobStatus,
+    FAQ, FAQUpsertRequest, FAQUpdateRequest, FAQDeleteRequest, FAQSyncRequest, FAQChangeResponse,
+    FAQ_ID_PATTERN
+)
+from services.admission import (
+    PRIORITY_BULK, PRIORITY_INTERACTIVE, AdmissionController, AdmissionRejected, parse_tenant_weights
+)
 from services.ai_service import AIService
+from services.faq_sync import FAQSyncResult, faq_id as stable_faq_id
 from services.auth_service import verify_api_key
+from services.ingest_jobs import IngestJobManager
+from services.metrics import record_admission, record_admission_rejected
+from services.streaming import format_sse
 
 # Load environment variables
 load_dotenv()
@@ -30,10 +45,75 @@ app.add_middleware(
 # AI Service instance
 ai_service = AIService()
 
+# Tenant'lar arası adil kabul: tenant başına eşzamanlılık/hız bütçesi, sorgular ingest'ten öncelikli
+admission = AdmissionController(
+    max_concurrency=int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64")),
+    tenant_max_concurrency=int(os.getenv("ADMISSION_TENANT_MAX_CONCURRENCY", "8")),
+    bulk_max_concurrency=int(os.getenv("ADMISSION_BULK_MAX_CONCURRENCY", "0")) or None,
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "256")),
+    tenant_max_queue=int(os.getenv("ADMISSION_TENANT_MAX_QUEUE", "32")),
+    max_wait_seconds=float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "5")),
+    tenant_rate=float(os.getenv("ADMISSION_TENANT_RATE", "0")),
+    tenant_burst=float(os.getenv("ADMISSION_TENANT_BURST", "0")) or None,
+    interactive_weight=float(os.getenv("ADMISSION_INTERACTIVE_WEIGHT", "4")),
+    tenant_weights=parse_tenant_weights(os.getenv("ADMISSION_TENANT_WEIGHTS", "")),
+    on_admit=record_admission,
+    on_reject=record_admission_rejected
+)
+
+async def run_ingest_job(faqs, user_id, **kwargs):
+    """Arka plan job'ları zaten kabul edildiği için reddedilmez; bulk slotu boşalana kadar bekler"""
+    async with admission.admit(user_id, PRIORITY_BULK, shed=False):
+        return await ai_service.ingest_faqs(faqs, user_id, **kwargs)
+
+# Arka plan ingest job'ları
+ingest_jobs = IngestJobManager(
+    runner=run_ingest_job,
+    job_dir=os.getenv("INGEST_JOB_DIR", "./data/ingest_jobs"),
+    workers=int(os.getenv("INGEST_JOB_WORKERS", "2")),
+    batch_size=int(os.getenv("INGEST_BATCH_SIZE", "100")),
+    retention_seconds=float(os.getenv("INGEST_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+)
+
+# Arka planda çalışan başlatma görevi (startup, bağlantılar kurulurken bloklanmaz)
+init_task: Optional[asyncio.Task] = None
+
+async def initialize_services():
+    """AI servisini başlatır, ardından ingest job worker'larını çalıştırır"""
+    await ai_service.initialize()
+    await ingest_jobs.start()
+    print(f"Service initialized in {ai_service.init_seconds:.2f}s")
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize AI service on startup"""
-    await ai_service.initialize()
+    """Start initialization in the background; /ready reports when it is done"""
+    global init_task
+    init_task = asyncio.create_task(initialize_services())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop ingest workers; unfinished jobs resume from their checkpoint"""
+    if init_task and not init_task.done():
+        init_task.cancel()
+    await ingest_jobs.stop()
+
+async def require_initialized():
+    """Başlatma bitmeden gelen istekleri development mode cevabı yerine 503 ile reddeder"""
+    if not ai_service.initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="Service is starting",
+            headers={"Retry-After": "1"}
+        )
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Kabul edilmeyen istekler iş yapılmadan 429 ve Retry-After ile döner"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"Too many requests ({exc.reason})"},
+        headers={"Retry-After": exc.retry_after_header}
+    )
 
 @app.get("/")
 async def root():
@@ -41,9 +121,23 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: süreç ayakta ve istek kabul ediyor"""
     return {"status": "healthy", "service": "ai-service"}
 
-@app.post("/v1/ingest", response_model=IngestResponse)
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: OpenAI ve vektör backend'i bağlı, gerçek cevap verilebilir (değilse 503)"""
+    readiness = ai_service.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+def expansion_languages(languages: Optional[List[str]]) -> List[str]:
+    """İstekteki çeviri dillerini doğrular; desteklenmeyen dil varsa 400 döner"""
+    try:
+        return ai_service.expansion_languages(languages)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/v1/ingest", response_model=IngestResponse, dependencies=[Depends(require_initialized)])
 async def ingest_data(
     request: IngestRequest,
     _: bool = Depends(verify_api_key)
@@ -57,16 +151,195 @@ async def ingest_data(
     Returns:
         IngestResponse: İşlem durumu
     """
+    languages = expansion_languages(request.languages)
     try:
-        success = await ai_service.ingest_faqs(request.faqs, request.user_id)
-        if success:
-            return IngestResponse(status="success", message="Data ingested successfully")
+        async with admission.admit(request.user_id, PRIORITY_BULK):
+            stats = await ai_service.ingest_faqs(request.faqs, request.user_id, languages=languages)
+        if stats.success:
+            return IngestResponse(
+                status="success",
+                message="Data ingested successfully",
+                ingested=stats.ingested,
+                faqs_per_second=round(stats.faqs_per_second, 2)
+            )
         else:
-            raise HTTPException(status_code=500, detail="Failed to ingest data")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to ingest data ({stats.failed}/{stats.total} FAQs failed)"
+            )
+    except (HTTPException, AdmissionRejected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
-@app.post("/v1/query", response_model=QueryResponse)
+@app.post("/v1/ingest/jobs", response_model=IngestJobStatus, status_code=202, dependencies=[Depends(require_initialized)])
+async def submit_ingest_job(
+    request: IngestRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    SSS verilerini arka planda işlenmek üzere kuyruğa alır.
+    
+    Args:
+        request: SSS listesi ve kullanıcı ID'si
+        
+    Returns:
+        IngestJobStatus: Oluşturulan job (202 Accepted)
+    """
+    languages = expansion_languages(request.languages)
+    admission.check_rate(request.user_id, PRIORITY_BULK)
+    try:
+        return await ingest_jobs.submit(request.faqs, request.user_id, languages=languages)
+    except RuntimeError as e:
+        # Worker'lar henüz başlatılmadı
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit ingest job: {str(e)}")
+
+@app.get("/v1/ingest/jobs/{job_id}", response_model=IngestJobStatus, dependencies=[Depends(require_initialized)])
+async def get_ingest_job(
+    job_id: str,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Ingest job'ının ilerlemesini döndürür.
+    
+    Args:
+        job_id: Job ID'si
+        
+    Returns:
+        IngestJobStatus: İşlenen, başarısız ve kalan SSS sayıları
+    """
+    status = await ingest_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return status
+
+def faq_change_response(result: FAQSyncResult, ids: Optional[List[str]] = None) -> FAQChangeResponse:
+    """SSS değişikliği sonucunu API yanıtına çevirir; yazma başarısızsa 500 döner"""
+    if not result.success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"FAQ changes failed ({result.failed} FAQs failed): {result.error or 'write error'}"
+        )
+    changes = result.changes
+    return FAQChangeResponse(
+        status="dry_run" if result.dry_run else "success",
+        added=len(changes.added),
+        updated=len(changes.updated),
+        unchanged=len(changes.unchanged),
+        deleted=len(changes.deleted),
+        ids=ids or [],
+        dry_run=result.dry_run
+    )
+
+@app.post("/v1/faqs", response_model=FAQChangeResponse, dependencies=[Depends(require_initialized)])
+async def upsert_faqs(
+    request: FAQUpsertRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    SSS'leri kalıcı id'leriyle ekler veya günceller; diğer SSS'lere dokunmaz.
+    
+    Args:
+        request: SSS'ler (id verilmezse sorudan türetilir) ve kullanıcı ID'si
+        
+    Returns:
+        FAQChangeResponse: Eklenen/güncellenen/değişmeyen sayıları ve SSS id'leri
+    """
+    languages = expansion_languages(request.languages)
+    try:
+        async with admission.admit(request.user_id, PRIORITY_BULK):
+            result = await ai_service.sync_faqs(
+                request.faqs, request.user_id, delete_missing=False, languages=languages
+            )
+        return faq_change_response(result, [stable_faq_id(faq) for faq in request.faqs])
+    except (HTTPException, AdmissionRejected):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"FAQ upsert failed: {str(e)}")
+
+@app.put("/v1/faqs/{faq_id}", response_model=FAQChangeResponse, dependencies=[Depends(require_initialized)])
+async def update_faq(
+    request: FAQUpdateRequest,
+    faq_id: str = Path(..., max_length=128, pattern=FAQ_ID_PATTERN),
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Id'si bilinen SSS'yi günceller (soru değişse de id aynı kalır).
+    
+    Args:
+        faq_id: SSS'nin kalıcı id'si
+        request: Yeni soru/cevap ve kullanıcı ID'si
+        
+    Returns:
+        FAQChangeResponse: Güncelleme özeti (SSS yoksa 404)
+    """
+    languages = expansion_languages(request.languages)
+    try:
+        faq = FAQ(id=faq_id, question=request.question, answer=request.answer)
+        async with admission.admit(request.user_id, PRIORITY_BULK):
+            result = await ai_service.update_faq(faq, request.user_id, languages=languages)
+        return faq_change_response(result, [faq_id])
+    except KeyError:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+    except (HTTPException, AdmissionRejected):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"FAQ update failed: {str(e)}")
+
+@app.post("/v1/faqs/delete", response_model=FAQChangeResponse, dependencies=[Depends(require_initialized)])
+async def delete_faqs(
+    request: FAQDeleteRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    SSS'leri kalıcı id'leriyle siler.
+    
+    Args:
+        request: Silinecek SSS id'leri ve kullanıcı ID'si
+        
+    Returns:
+        FAQChangeResponse: Silinen SSS sayısı (bulunamayan id'ler sayılmaz)
+    """
+    try:
+        async with admission.admit(request.user_id, PRIORITY_BULK):
+            result = await ai_service.delete_faqs(request.ids, request.user_id)
+        return faq_change_response(result, result.changes.deleted)
+    except (HTTPException, AdmissionRejected):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"FAQ delete failed: {str(e)}")
+
+@app.post("/v1/faqs/sync", response_model=FAQChangeResponse, dependencies=[Depends(require_initialized)])
+async def sync_faqs(
+    request: FAQSyncRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Tam kataloğu saklanan SSS'lerle karşılaştırır; yalnızca yeni ve değişen
+    SSS'leri embed edip yazar, katalogdan çıkarılanları siler.
+    
+    Args:
+        request: Güncel SSS kataloğu, kullanıcı ID'si, delete_missing ve dry_run
+        
+    Returns:
+        FAQChangeResponse: Değişiklik kümesinin özeti ve katalogdaki SSS id'leri
+    """
+    languages = expansion_languages(request.languages)
+    try:
+        async with admission.admit(request.user_id, PRIORITY_BULK):
+            result = await ai_service.sync_faqs(
+                request.faqs, request.user_id, delete_missing=request.delete_missing,
+                dry_run=request.dry_run, languages=languages
+            )
+        return faq_change_response(result, [stable_faq_id(faq) for faq in request.faqs])
+    except (HTTPException, AdmissionRejected):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"FAQ sync failed: {str(e)}")
+
+@app.post("/v1/query", response_model=QueryResponse, dependencies=[Depends(require_initialized)])
 async def query_bot(
     request: QueryRequest,
     _: bool = Depends(verify_api_key)
@@ -78,15 +351,83 @@ async def query_bot(
         request: Kullanıcı sorusu ve bot/kullanıcı ID'si
         
     Returns:
-        QueryResponse: AI'dan gelen yanıt
+        QueryResponse: AI'dan gelen yanıt ve cevabın geldiği yol
     """
-    try:
-        answer = await ai_service.query(request.message, request.user_id)
-        return QueryResponse(answer=answer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+    async with admission.admit(request.user_id, PRIORITY_INTERACTIVE):
+        try:
+            result = await ai_service.query(request.message, request.user_id, request.language)
+            return QueryResponse(answer=result.answer, path=result.path)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+
+@app.post("/v1/query/batch", response_model=BatchQueryResponse, dependencies=[Depends(require_initialized)])
+async def query_bot_batch(
+    request: BatchQueryRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Birden fazla soruyu tek istekte işler (ör. kesinti sonrası kuyruk, değerlendirme setleri).
+    
+    Args:
+        request: Soru listesi (her biri kendi user_id'siyle)
+        
+    Returns:
+        BatchQueryResponse: İstek sırasıyla cevaplar; başarısız sorular için error alanı dolu
+    """
+    # Tek tenant'ın toplu sorgusu o tenant'ın bütçesinden, karışık batch'ler ortak bir kovadan düşer
+    tenants = {q.user_id for q in request.queries}
+    tenant = tenants.pop() if len(tenants) == 1 else "__batch__"
+    async with admission.admit(tenant, PRIORITY_BULK):
+        try:
+            results = await ai_service.query_batch(request.queries)
+            return BatchQueryResponse(results=results)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Batch query failed: {str(e)}")
+
+@app.post("/v1/query/stream", dependencies=[Depends(require_initialized)])
+async def query_bot_stream(
+    request: QueryRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Kullanıcı sorusunun cevabını üretildikçe server-sent events olarak akıtır.
+    
+    Olaylar: `token` (cevap parçası), `error` (hata mesajı) ve son olarak
+    `done` (ilk token süresi `ttft_ms`, tespit edilen dil ve cevabın geldiği yol).
+    
+    Args:
+        request: Kullanıcı sorusu ve bot/kullanıcı ID'si
+        
+    Returns:
+        StreamingResponse: text/event-stream yanıtı
+    """
+    # Slot akış bitene kadar tutulur; reddedilirse akış başlamadan 429 döner
+    ticket = await admission.acquire(request.user_id, PRIORITY_INTERACTIVE)
+    
+    async def event_stream():
+        try:
+            async for event in ai_service.query_stream(request.message, request.user_id, request.language):
+                event_type = event.pop("type")
+                yield format_sse(event_type, event)
+        finally:
+            admission.release(ticket)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # İstemci akış başlamadan koparsa generator hiç çalışmaz; slot yine de bırakılır
+        background=BackgroundTask(admission.release, ticket)
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus formatında servis metrikleri"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
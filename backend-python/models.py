@@ -1,26 +1,112 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, List, Optional
+
+# Kalıcı SSS id'lerinin biçimi (istek gövdesinde ve URL yolunda aynı kural)
+FAQ_ID_PATTERN = r"^[A-Za-z0-9_.:-]+$"
+
+# SSS yazan isteklerin ortak dil listesi alanı
+ExpansionLanguages = Annotated[
+    Optional[List[str]],
+    Field(
+        description="SSS'lerin ingest sırasında çevrilip ayrıca saklanacağı dil kodları (ör. ['en', 'de'] veya ['all']); verilmezse FAQ_TRANSLATION_LANGUAGES"
+    )
+]
 
 class FAQ(BaseModel):
     """Tek bir SSS modeli"""
     question: str = Field(..., description="Soru metni")
     answer: str = Field(..., description="Cevap metni")
+    id: Optional[str] = Field(
+        None, max_length=128, pattern=FAQ_ID_PATTERN,
+        description="Kalıcı SSS id'si (opsiyonel; verilmezse sorudan türetilir)"
+    )
 
 class IngestRequest(BaseModel):
     """SSS verilerini işleme isteği"""
     faqs: List[FAQ] = Field(..., description="SSS listesi")
     user_id: str = Field(..., description="Kullanıcı ID'si")
+    languages: ExpansionLanguages = None
 
 class IngestResponse(BaseModel):
     """SSS işleme yanıtı"""
     status: str = Field(..., description="İşlem durumu")
     message: str = Field(..., description="İşlem mesajı")
+    ingested: Optional[int] = Field(None, description="İşlenen SSS sayısı")
+    faqs_per_second: Optional[float] = Field(None, description="Ingest hızı (SSS/saniye)")
+
+class FAQUpsertRequest(BaseModel):
+    """Tek tek SSS ekleme/güncelleme isteği"""
+    faqs: List[FAQ] = Field(..., min_length=1, description="Eklenecek veya güncellenecek SSS'ler")
+    user_id: str = Field(..., description="Kullanıcı ID'si")
+    languages: ExpansionLanguages = None
+
+class FAQUpdateRequest(BaseModel):
+    """Id'si bilinen bir SSS'yi güncelleme isteği"""
+    question: str = Field(..., description="Soru metni")
+    answer: str = Field(..., description="Cevap metni")
+    user_id: str = Field(..., description="Kullanıcı ID'si")
+    languages: ExpansionLanguages = None
+
+class FAQDeleteRequest(BaseModel):
+    """SSS silme isteği"""
+    ids: List[str] = Field(..., min_length=1, description="Silinecek SSS id'leri")
+    user_id: str = Field(..., description="Kullanıcı ID'si")
+
+class FAQSyncRequest(BaseModel):
+    """Tam kataloğu saklanan SSS'lerle karşılaştırıp yalnızca farkı yazma isteği"""
+    faqs: List[FAQ] = Field(..., description="Kullanıcının güncel SSS kataloğunun tamamı")
+    user_id: str = Field(..., description="Kullanıcı ID'si")
+    delete_missing: bool = Field(True, description="Katalogda olmayan saklı SSS'ler silinsin mi")
+    dry_run: bool = Field(False, description="Yalnızca farkı hesapla, hiçbir şey yazma")
+    languages: ExpansionLanguages = None
+
+class FAQChangeResponse(BaseModel):
+    """SSS değişikliklerinin özeti"""
+    status: str = Field(..., description="İşlem durumu")
+    added: int = Field(0, description="Yeni eklenen SSS sayısı")
+    updated: int = Field(0, description="İçeriği değiştiği için yeniden yazılan SSS sayısı")
+    unchanged: int = Field(0, description="Değişmediği için atlanan SSS sayısı")
+    deleted: int = Field(0, description="Silinen SSS sayısı")
+    failed: int = Field(0, description="Yazılamayan SSS sayısı")
+    ids: List[str] = Field(default_factory=list, description="İstekteki SSS'lerin kalıcı id'leri (istek sırasıyla)")
+    dry_run: bool = Field(False, description="Değişiklikler yalnızca hesaplandı, uygulanmadı")
+
+class IngestJobStatus(BaseModel):
+    """Arka plan ingest job'ının durumu"""
+    job_id: str = Field(..., description="Job ID'si")
+    user_id: str = Field(..., description="Kullanıcı ID'si")
+    status: str = Field(..., description="queued, running, completed, completed_with_errors veya failed")
+    total: int = Field(..., description="Toplam SSS sayısı")
+    processed: int = Field(..., description="İşlenen SSS sayısı")
+    failed: int = Field(..., description="Başarısız SSS sayısı")
+    remaining: int = Field(..., description="Kalan SSS sayısı")
+    error: Optional[str] = Field(None, description="Job başarısız olduysa hata mesajı")
+    created_at: float = Field(..., description="Oluşturulma zamanı (Unix)")
+    updated_at: float = Field(..., description="Son güncelleme zamanı (Unix)")
 
 class QueryRequest(BaseModel):
     """Soru sorma isteği"""
     message: str = Field(..., description="Kullanıcının sorusu")
     user_id: str = Field(..., description="Bot/Kullanıcı ID'si")
+    language: Optional[str] = Field(None, description="İstemcinin bildirdiği dil kodu (opsiyonel, ör. 'tr')")
 
 class QueryResponse(BaseModel):
     """Soru yanıtı"""
     answer: str = Field(..., description="AI'dan gelen cevap")
+    path: Optional[str] = Field(None, description="Cevabın geldiği yol: cache, direct (kayıtlı SSS cevabı) veya rag")
+
+class BatchQueryRequest(BaseModel):
+    """Toplu soru sorma isteği"""
+    queries: List[QueryRequest] = Field(..., min_length=1, max_length=500, description="Soru listesi")
+
+class BatchQueryItem(BaseModel):
+    """Toplu sorgudaki tek bir sorunun sonucu"""
+    index: int = Field(..., description="Sorunun istekteki sırası")
+    answer: Optional[str] = Field(None, description="AI'dan gelen cevap")
+    language: Optional[str] = Field(None, description="Tespit edilen dil")
+    path: Optional[str] = Field(None, description="Cevabın geldiği yol: cache, direct (kayıtlı SSS cevabı) veya rag")
+    error: Optional[str] = Field(None, description="Bu soru başarısız olduysa hata mesajı")
+
+class BatchQueryResponse(BaseModel):
+    """Toplu soru yanıtı (istek sırasıyla)"""
+    results: List[BatchQueryItem] = Field(..., description="Sonuç listesi")
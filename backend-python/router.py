@@ -0,0 +1,134 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+import os
+from dotenv import load_dotenv
+from typing import Optional
+
+import httpx
+
+from services.sharding import DEFAULT_VNODES, ShardRouter, forward_headers, shard_key
+
+# Load environment variables
+load_dotenv()
+
+app = FastAPI(
+    title="Multilingual Chatbot AI Service Router",
+    description="Routes each tenant to the worker process that owns its shard",
+    version="1.0.0"
+)
+
+# Worker süreçleri (main:app); her tenant tutarlı hash ile bunlardan birine gider
+router = ShardRouter(
+    workers=[w.strip() for w in os.getenv("SHARD_WORKERS", "http://127.0.0.1:8001").split(",") if w.strip()],
+    vnodes=int(os.getenv("SHARD_VNODES", str(DEFAULT_VNODES))),
+    health_interval_seconds=float(os.getenv("SHARD_HEALTH_INTERVAL_SECONDS", "2")),
+    limits=httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    ),
+    timeout=httpx.Timeout(float(os.getenv("SHARD_PROXY_TIMEOUT_SECONDS", "120")), connect=2.0)
+)
+
+@app.on_event("startup")
+async def startup_event():
+    await router.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await router.stop()
+
+@app.get("/health")
+async def health_check():
+    """Liveness: router ayakta"""
+    return {"status": "healthy", "service": "ai-service-router"}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: en az bir worker sağlıklı (değilse 503)"""
+    healthy = len(router.healthy)
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={"ready": healthy > 0, "healthy_workers": healthy, "workers": len(router.workers)}
+    )
+
+@app.get("/shards")
+async def shards():
+    """Halkadaki worker'lar, yeniden dengeleme ve istek sayıları"""
+    return router.stats()
+
+async def proxy(worker: str, request: Request, body: bytes) -> httpx.Response:
+    return await router.send(
+        worker, request.method, request.url.path, request.url.query, dict(request.headers), body
+    )
+
+async def forward(request: Request, tenant: Optional[str], body: bytes) -> Optional[httpx.Response]:
+    """
+    İsteği tenant'ın sahibine iletir
+
+    Bağlanılamayan worker halkadan çıkarılır ve istek bir kez yeni sahibine
+    gönderilir (istek worker'a hiç ulaşmadığı için tekrar göndermek güvenlidir).
+    """
+    for _ in range(2):
+        worker = router.worker_for(tenant)
+        if worker is None:
+            return None
+        try:
+            response = await proxy(worker, request, body)
+            response.extensions["shard_worker"] = worker
+            return response
+        except httpx.ConnectError:
+            router.mark_down(worker)
+    return None
+
+async def find_job(request: Request, job_id: str) -> Optional[httpx.Response]:
+    """Job durumu yalnızca job'ı alan worker'da olduğundan önce kayıtlı worker, sonra diğerleri sorulur"""
+    known = router.worker_for_job(job_id)
+    candidates = [known] if known else []
+    candidates += [w for w in sorted(router.healthy) if w != known]
+    for worker in candidates:
+        try:
+            response = await proxy(worker, request, b"")
+        except httpx.ConnectError:
+            router.mark_down(worker)
+            continue
+        if response.status_code != 404 or worker == candidates[-1]:
+            response.extensions["shard_worker"] = worker
+            router.track_job(job_id, worker)
+            return response
+        await response.aclose()
+    return None
+
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+async def route(request: Request, path: str):
+    """Tüm API isteklerini sahibi olan worker'a aktarır; cevap (SSE dahil) akış olarak döner"""
+    body = await request.body()
+    if request.method == "GET" and path.startswith("v1/ingest/jobs/"):
+        response = await find_job(request, path.rsplit("/", 1)[-1])
+    else:
+        response = await forward(request, shard_key(body), body)
+    if response is None:
+        return JSONResponse(status_code=503, content={"detail": "No healthy workers"}, headers={"Retry-After": "1"})
+
+    worker = response.extensions["shard_worker"]
+    if request.method == "POST" and path == "v1/ingest/jobs" and response.status_code == 202:
+        # Job id'si bir sonraki durum sorgusunun doğru worker'a gitmesi için kaydedilir
+        await response.aread()
+        await response.aclose()
+        job = response.json()
+        router.track_job(job["job_id"], worker)
+        return JSONResponse(status_code=202, content=job, headers={"X-Shard-Worker": worker})
+
+    headers = forward_headers(dict(response.headers))
+    headers["X-Shard-Worker"] = worker
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers=headers,
+        background=BackgroundTask(response.aclose)
+    )
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("router:app", host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
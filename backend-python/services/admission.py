@@ -0,0 +1,302 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+# Öncelik sınıfları: etkileşimli sorgular toplu işlerin (ingest, batch) önüne geçer
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+
+# Bu sayıyı aşınca dolmuş (uzun süredir boşta) tenant hız kovaları silinir
+MAX_IDLE_BUCKETS = 10000
+
+# Reddetme nedenleri (429 detayı ve metrik etiketi)
+REJECT_RATE = "rate_limited"
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_TIMEOUT = "queue_timeout"
+
+
+class AdmissionRejected(Exception):
+    """İstek kabul edilmedi; istemci `retry_after` saniye sonra tekrar denemeli (HTTP 429)"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass
+class Ticket:
+    """Kabul edilen (veya kuyrukta bekleyen) bir istek"""
+    tenant: str
+    priority: str
+    start_tag: float = 0.0
+    seq: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    admitted_at: Optional[float] = None
+    released: bool = False
+    future: Optional[asyncio.Future] = None
+
+
+class _TokenBucket:
+    """Tenant başına istek hızı bütçesi (saniyede `rate`, en fazla `burst` birikir)"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Bir jeton harcar; jeton yoksa bir sonrakine kalan süreyi döndürür (0: kabul)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Sorgu ve ingest isteklerinin tenant'lar arasında adil kabulü.
+
+    Aynı anda en fazla `max_concurrency` istek çalışır; bir tenant bunun en
+    fazla `tenant_max_concurrency` kadarını, toplu işler (bulk) ise
+    `bulk_max_concurrency` kadarını kullanabilir. Slot boşaldığında sıradaki
+    istek start-time fair queueing ile seçilir: her tenant'ın kuyruğu
+    ağırlığıyla orantılı pay alır, etkileşimli istekler toplu işlerden
+    `interactive_weight` kat daha sık sıraya girer. Böylece tek bir tenant'ın
+    trafik patlaması diğerlerini aç bırakmaz.
+
+    Hız bütçesi aşıldığında, kuyruk dolduğunda veya istek `max_wait_seconds`
+    içinde slot alamadığında iş yapılmadan hemen AdmissionRejected fırlatılır.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        tenant_max_concurrency: int = 8,
+        bulk_max_concurrency: Optional[int] = None,
+        max_queue: int = 256,
+        tenant_max_queue: int = 32,
+        max_wait_seconds: float = 5.0,
+        tenant_rate: float = 0.0,
+        tenant_burst: Optional[float] = None,
+        interactive_weight: float = 4.0,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        on_admit: Optional[Callable[[str, float], None]] = None,
+        on_reject: Optional[Callable[[str, str, str], None]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tenant_max_concurrency = max(1, tenant_max_concurrency)
+        self.bulk_max_concurrency = max(1, bulk_max_concurrency or self.max_concurrency // 4)
+        self.max_queue = max_queue
+        self.tenant_max_queue = tenant_max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.tenant_rate = tenant_rate
+        self.tenant_burst = tenant_burst if tenant_burst is not None else max(1.0, tenant_rate)
+        self.weights = {PRIORITY_INTERACTIVE: interactive_weight, PRIORITY_BULK: 1.0}
+        self.tenant_weights = tenant_weights or {}
+        self.on_admit = on_admit
+        self.on_reject = on_reject
+
+        self._queue: List[Ticket] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._in_flight = 0
+        self._bulk_in_flight = 0
+        self._tenant_in_flight: Dict[str, int] = {}
+        self._tenant_queued: Dict[str, int] = {}
+        self._service_seconds = 1.0  # Slot tutma süresinin üstel ortalaması (Retry-After tahmini için)
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def admit(self, tenant: str, priority: str = PRIORITY_INTERACTIVE, shed: bool = True) -> AsyncIterator[Ticket]:
+        """
+        Blok süresince tenant adına bir slot tutar
+
+        Args:
+            tenant: user_id
+            priority: PRIORITY_INTERACTIVE veya PRIORITY_BULK
+            shed: False ise hız/kuyruk sınırları ve bekleme süresi uygulanmaz
+                (ör. zaten kabul edilmiş arka plan job'ları)
+        """
+        ticket = await self.acquire(tenant, priority, shed)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    async def acquire(self, tenant: str, priority: str = PRIORITY_INTERACTIVE, shed: bool = True) -> Ticket:
+        """
+        Slot alınana kadar bekler; `release` ile bırakılmalıdır
+
+        Raises:
+            AdmissionRejected: Hız bütçesi aşıldı, kuyruk dolu veya bekleme süresi doldu
+        """
+        if shed:
+            self.check_rate(tenant, priority)
+
+        ticket = Ticket(tenant=tenant, priority=priority, seq=next(self._seq))
+        if not self._queue and self._eligible(ticket):
+            self._start(ticket)
+            return ticket
+
+        if shed and (len(self._queue) >= self.max_queue or self._tenant_queued.get(tenant, 0) >= self.tenant_max_queue):
+            self._reject(tenant, priority, REJECT_QUEUE_FULL, self._estimated_wait())
+
+        self._enqueue(ticket)
+        self._dispatch()  # Kuyruktakiler tenant sınırında olabilir; bu bilet hemen başlayabilir
+        try:
+            if shed and self.max_wait_seconds > 0:
+                await asyncio.wait_for(asyncio.shield(ticket.future), self.max_wait_seconds)
+            else:
+                await ticket.future
+        except asyncio.TimeoutError:
+            if not self._dequeue(ticket):
+                return ticket  # Zaman aşımıyla aynı anda slot verildi
+            self._reject(tenant, priority, REJECT_TIMEOUT, self._estimated_wait())
+        except BaseException:
+            # İstemci iptal etti: kuyruktan çık, slot verildiyse geri bırak
+            if not self._dequeue(ticket):
+                self.release(ticket)
+            raise
+        return ticket
+
+    def check_rate(self, tenant: str, priority: str = PRIORITY_INTERACTIVE):
+        """
+        Tenant'ın hız bütçesinden bir istek düşer (slot tutmadan, ör. job gönderimi)
+
+        Raises:
+            AdmissionRejected: Bütçe tükendi
+        """
+        if self.tenant_rate <= 0:
+            return
+        bucket = self._buckets.get(tenant)
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_BUCKETS:
+                now = time.monotonic()
+                idle_after = self.tenant_burst / self.tenant_rate
+                self._buckets = {t: b for t, b in self._buckets.items() if now - b.updated < idle_after}
+            bucket = self._buckets[tenant] = _TokenBucket(self.tenant_rate, self.tenant_burst)
+        wait = bucket.take()
+        if wait:
+            self._reject(tenant, priority, REJECT_RATE, wait)
+
+    def release(self, ticket: Ticket):
+        """Slotu bırakır ve sıradaki uygun istekleri başlatır (birden fazla çağrı güvenlidir)"""
+        if ticket.released or ticket.admitted_at is None:
+            return
+        ticket.released = True
+        held = time.monotonic() - ticket.admitted_at
+        self._service_seconds = 0.9 * self._service_seconds + 0.1 * held
+        self._in_flight -= 1
+        if ticket.priority == PRIORITY_BULK:
+            self._bulk_in_flight -= 1
+        remaining = self._tenant_in_flight[ticket.tenant] - 1
+        if remaining:
+            self._tenant_in_flight[ticket.tenant] = remaining
+        else:
+            del self._tenant_in_flight[ticket.tenant]
+        self._dispatch()
+
+    def _eligible(self, ticket: Ticket) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        if self._tenant_in_flight.get(ticket.tenant, 0) >= self.tenant_max_concurrency:
+            return False
+        return ticket.priority != PRIORITY_BULK or self._bulk_in_flight < self.bulk_max_concurrency
+
+    def _start(self, ticket: Ticket):
+        ticket.admitted_at = time.monotonic()
+        self._in_flight += 1
+        if ticket.priority == PRIORITY_BULK:
+            self._bulk_in_flight += 1
+        self._tenant_in_flight[ticket.tenant] = self._tenant_in_flight.get(ticket.tenant, 0) + 1
+        self.admitted += 1
+        if self.on_admit:
+            self.on_admit(ticket.priority, ticket.admitted_at - ticket.enqueued_at)
+
+    def _enqueue(self, ticket: Ticket):
+        # Start-time fair queueing: tenant'ın önceki isteği bitmeden sıradaki başlamaz (sanal zamanda)
+        weight = self.weights.get(ticket.priority, 1.0) * self.tenant_weights.get(ticket.tenant, 1.0)
+        key = (ticket.tenant, ticket.priority)
+        ticket.start_tag = max(self._virtual_time, self._last_finish.get(key, 0.0))
+        self._last_finish[key] = ticket.start_tag + 1.0 / weight
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._queue.append(ticket)
+        self._tenant_queued[ticket.tenant] = self._tenant_queued.get(ticket.tenant, 0) + 1
+
+    def _dequeue(self, ticket: Ticket) -> bool:
+        """Bekleyen bileti kuyruktan çıkarır; zaten slot aldıysa False döner"""
+        if ticket not in self._queue:
+            return False
+        self._queue.remove(ticket)
+        self._forget_queued(ticket)
+        return True
+
+    def _forget_queued(self, ticket: Ticket):
+        remaining = self._tenant_queued[ticket.tenant] - 1
+        if remaining:
+            self._tenant_queued[ticket.tenant] = remaining
+        else:
+            del self._tenant_queued[ticket.tenant]
+
+    def _dispatch(self):
+        """Boş slotları en küçük start tag'li uygun biletlere verir"""
+        while self._queue and self._in_flight < self.max_concurrency:
+            eligible = [ticket for ticket in self._queue if self._eligible(ticket)]
+            if not eligible:
+                return
+            ticket = min(eligible, key=lambda t: (t.start_tag, t.seq))
+            self._queue.remove(ticket)
+            self._forget_queued(ticket)
+            self._virtual_time = max(self._virtual_time, ticket.start_tag)
+            self._start(ticket)
+            ticket.future.set_result(None)
+        if not self._queue and len(self._last_finish) > 4 * self.max_queue:
+            # Sanal zamanın gerisinde kalan tenant kayıtları artık sırayı etkilemez
+            self._last_finish = {k: v for k, v in self._last_finish.items() if v > self._virtual_time}
+
+    def _estimated_wait(self) -> float:
+        """Kuyruğun boşalması için tahmini süre (Retry-After)"""
+        return (len(self._queue) + 1) * self._service_seconds / self.max_concurrency
+
+    def _reject(self, tenant: str, priority: str, reason: str, retry_after: float):
+        self.rejected += 1
+        if self.on_reject:
+            self.on_reject(tenant, priority, reason)
+        raise AdmissionRejected(reason, retry_after)
+
+    def stats(self) -> Dict[str, int]:
+        """Anlık slot ve kuyruk durumu"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "bulk_in_flight": self._bulk_in_flight,
+            "queued": len(self._queue),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def parse_tenant_weights(value: str) -> Dict[str, float]:
+    """"tenantA:4,tenantB:2" biçimindeki ağırlık listesini çözer"""
+    weights = {}
+    for item in value.split(","):
+        if ":" in item:
+            tenant, weight = item.rsplit(":", 1)
+            weights[tenant.strip()] = float(weight)
+    return weights
@@ -1,14 +1,160 @@
+import asyncio
 import os
-from typing import List
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from langchain.schema import Document
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
-from pinecone import Pinecone
-from langdetect import detect
-from models import FAQ
+import time
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from models import FAQ, BatchQueryItem, QueryRequest
+from services.concurrency import ConcurrencyLimiter
+from services.context_builder import ContextBuilder
+from services.ingest_pipeline import BatchCallback, IngestPipeline, IngestRecord, IngestStats
+from services.language_detector import LanguageDetector
+from services.lexical_index import BM25Index, is_decisive, reciprocal_rank_fusion
+from services.metrics import (
+    QUERY_COALESCED_TOTAL, QUERY_TTFT_SECONDS, PrometheusTokenHandler,
+    bind_tenant, log_if_slow, record_cache_lookup, record_context, record_query_path, record_retrieval,
+    record_upstream_hedge, record_upstream_retry, stage_timer
+)
+from services.pipeline_registry import PipelineRegistry, TenantPipeline
+from services.semantic_cache import SemanticCache
+from services.embedding_cache import CachedEmbeddings, EmbeddingCache
+from services.faq_sync import (
+    FAQChangeSet, FAQSyncResult, content_hash, dedupe_faqs, diff_catalog, faq_id, is_variant, variant_id
+)
+from services.shared_cache import KIND_ANSWER, SharedCache, content_key
+from services.sharding import DEFAULT_VNODES, HashRing
+from services.singleflight import SingleFlight
+from services.streaming import split_sentences
+from services.translation_cache import TranslationCache, normalize_text
+from services.transport import CallPolicy, TransportConfig, build_async_client, build_sync_client
+from services.vector_index import LocalVectorIndex, LocalVectorStore
+
+# Pinecone'da tek istekte okunan / silinen kayıt sayısı
+PINECONE_FETCH_BATCH = 100
+PINECONE_DELETE_BATCH = 1000
+
+# Desteklenen vektör backend'leri
+VECTOR_BACKENDS = ("pinecone", "local")
+
+# Sorgu pipeline modları: translate (çevir -> getir -> üret -> geri çevir) veya multilingual (tek çağrı)
+PIPELINE_MODES = ("translate", "multilingual")
+
+# Sohbet modeli (token sayımı da bu modelin tokenizer'ıyla yapılır)
+CHAT_MODEL = "gpt-3.5-turbo"
+
+# Embedding modeli (embedding önbelleği de model bazında ayrılır)
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# Cevabın geldiği yol (QueryResult.path)
+PATH_CACHE = "cache"  # Paylaşımlı veya semantik cevap önbelleği
+PATH_DIRECT = "direct"  # Eşleşen SSS'nin kayıtlı cevabı, LLM üretimi yok
+PATH_RAG = "rag"  # Retrieval + LLM üretimi
+PATH_DEVELOPMENT = "development"
+PATH_ERROR = "error"
+
+# Hata durumunda kullanıcıya dönen cevap
+ERROR_ANSWER = "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."
+
+RAG_PROMPT_TEMPLATE = """
+Aşağıdaki bağlamı kullanarak kullanıcının sorusuna cevap ver. 
+Eğer bağlamda cevabı bulamazsan, "Bu konuda bilgim yok, lütfen daha spesifik bir soru sorun." şeklinde yanıtla.
+Cevabını mümkün olduğunca doğal ve yardımcı bir tonda ver.
+
+Bağlam:
+{context}
+
+Soru: {question}
+
+Cevap:"""
+
+# PIPELINE_MODE=multilingual: çeviri adımları olmadan tek çağrıda kullanıcının dilinde cevap
+MULTILINGUAL_RAG_PROMPT_TEMPLATE = """
+Aşağıdaki bağlamı kullanarak kullanıcının sorusuna cevap ver. Bağlam sorudan farklı bir dilde olabilir.
+Cevabını mutlaka {language} dilinde ver.
+Eğer bağlamda cevabı bulamazsan, "Bu konuda bilgim yok, lütfen daha spesifik bir soru sorun." cümlesinin {language} karşılığıyla yanıtla.
+Cevabını mümkün olduğunca doğal ve yardımcı bir tonda ver.
+
+Bağlam:
+{context}
+
+Soru: {question}
+
+Cevap:"""
+
+# Her iki çeviri yönü için ortak prompt
+TRANSLATION_PROMPT_TEMPLATE = "Translate the following text to {language}. Only return the translation, nothing else:\n\n{text}"
+
+# Dil kodlarının tam isimleri
+LANGUAGE_NAMES = {
+    "en": "English",
+    "tr": "Turkish",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "ru": "Russian",
+    "ar": "Arabic",
+    "zh": "Chinese",
+    "ja": "Japanese",
+    "ko": "Korean"
+}
+
+
+@dataclass
+class CachedAnswerLookup:
+    """Önbellek aramasının sonucu ve cevabı sonradan yazmak için gereken bilgiler"""
+    answer: Optional[str] = None
+    embedding: Optional[List[float]] = None  # Semantik önbellek için sorgu embedding'i
+    generation: int = 0  # Semantik önbellek generation'ı (lookup anındaki)
+    shared_key: Optional[str] = None  # Paylaşımlı önbellekteki cevap anahtarı
+
+
+@dataclass
+class QueryResult:
+    """Sorgu cevabı ve cevabın hangi yoldan geldiği"""
+    answer: str
+    path: str = PATH_RAG
+
+
+@dataclass
+class RetrievalResult:
+    """Getirilen dokümanlar; vektör araması yapıldıysa en yakın SSS ve benzerlik skoru"""
+    docs: List[Document]
+    top_match: Optional[Document] = None
+    top_score: Optional[float] = None
+    scores: Optional[List[Optional[float]]] = None  # docs ile aynı sırada vektör skorları (yalnızca sözcüksel: None)
+
+
+def _unique_faqs(docs: List[Document]) -> List[Document]:
+    """Aynı SSS'nin farklı dil varyantlarından yalnızca en üst sıradakini tutar"""
+    seen = set()
+    unique = []
+    for doc in docs:
+        key = doc.metadata.get("faq_id") or doc.page_content
+        if key not in seen:
+            seen.add(key)
+            unique.append(doc)
+    return unique
+
+
+def _faq_content(question: str, answer: str) -> str:
+    """Embed edilen SSS metni: soru ve cevap birlikte"""
+    return f"Soru: {question}\nCevap: {answer}"
+
+
+async def _gather_bounded(factories: List[Callable[[], Awaitable[Any]]], limit: int) -> List[Any]:
+    """Coroutine fabrikalarını en fazla `limit` paralellikle çalıştırır; hatalar sonuç olarak döner"""
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run(factory: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await factory()
+    
+    return await asyncio.gather(*(run(factory) for factory in factories), return_exceptions=True)
+
 
 class AIService:
     """
@@ -21,11 +167,171 @@ class AIService:
         self.embeddings = None
         self.llm = None
         self.vector_store = None
+        
+        # initialize() sırasında bir kez derlenen chain'ler
+        self.rag_chain = None
+        self.multilingual_chain = None
+        self.translation_chain = None
+        
+        # user_id başına hazır retriever'ların LRU kaydı
+        self.pipelines = PipelineRegistry(
+            factory=self._create_tenant_pipeline,
+            max_tenants=int(os.getenv("PIPELINE_REGISTRY_MAX_TENANTS", "1000")),
+            idle_ttl_seconds=float(os.getenv("PIPELINE_IDLE_TTL_SECONDS", "1800")),
+            on_evict=self._release_tenant
+        )
+        self.local_index = None  # Süreç içi vektör indeksi (VECTOR_BACKEND=local)
+        self.vector_store_factory: Optional[Callable[[str], VectorStore]] = None  # Enjekte edilen store (ör. benchmark)
+        
+        # user_id başına sözcüksel (BM25) indeks; vektör sonuçlarıyla birleştirilir
+        self.lexical_enabled = os.getenv("LEXICAL_INDEX_ENABLED", "true").lower() == "true"
+        self.lexical_min_coverage = float(os.getenv("LEXICAL_DECISIVE_COVERAGE", "0.6"))
+        self.lexical_decisive_ratio = float(os.getenv("LEXICAL_DECISIVE_RATIO", "2.0"))
+        self.lexical_indexes: Dict[str, BM25Index] = {}
+        # Yerel backend'de BM25 indeksinin diskle eşitlendiği konum (LocalVectorIndex cursor'ı)
+        self._lexical_cursors: Dict[str, Tuple[str, int, int]] = {}
+        # Namespace başına görülen son paylaşımlı generation (başka worker yazınca türetilmiş durum düşürülür)
+        self._seen_generations: Dict[str, int] = {}
+        # Pinecone'da saklanan kayıtlardan arka planda kurulan BM25 indeksleri; kurulum sürerken gelen yazmalar
+        self._lexical_seeds: Dict[str, List[Callable[[BM25Index], None]]] = {}
+        self._seed_tasks: Set[asyncio.Task] = set()
+        
+        # Retrieval'da getirilen aday doküman sayısı; kaçının prompt'a gireceğine bağlam bütçesi karar verir
+        self.retrieval_k = int(os.getenv("RETRIEVAL_K", "5"))
+        
+        # Token bütçeli bağlam: skora göre uyarlanan k, kopya SSS eleme, uzun SSS kırpma
+        self.context_builder = ContextBuilder(
+            max_tokens=int(os.getenv("CONTEXT_MAX_TOKENS", "1200")),
+            max_doc_tokens=int(os.getenv("CONTEXT_MAX_DOC_TOKENS", "400")),
+            max_docs=self.retrieval_k,
+            score_gap=float(os.getenv("CONTEXT_SCORE_GAP", "0.1")),
+            duplicate_threshold=float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", "0.85"))
+        )
+        
+        # En yakın SSS'nin benzerlik skoru bu eşiği aşarsa kayıtlı cevabı LLM üretimi olmadan döner (0: kapalı)
+        self.direct_answer_threshold = float(os.getenv("DIRECT_ANSWER_THRESHOLD", "0.92"))
+        
+        # İngest'te SSS'lerin önceden çevrileceği diller ("all": LANGUAGE_NAMES'in tamamı); istek ayrıca belirtebilir
+        self.faq_translation_languages = [
+            lang.strip() for lang in os.getenv("FAQ_TRANSLATION_LANGUAGES", "").split(",") if lang.strip()
+        ]
+        # Kullanıcının dilindeki kayıtlarda çevirisiz arama (False: her soru PIPELINE_MODE yolundan geçer)
+        self.native_retrieval_enabled = True
+        
+        # Başlatma durumu (/ready için)
+        self.initialized = False
+        self.init_error: Optional[str] = None
+        self.init_seconds: Optional[float] = None
         self.index_name = os.getenv("PINECONE_INDEX_NAME", "multilang-chatbot-index")
+        self.vector_backend = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+        self.pipeline_mode = os.getenv("PIPELINE_MODE", "translate").lower()
+        
+        # Deterministik, önbellekli dil tespiti
+        self.language_detector = LanguageDetector(
+            supported_languages=LANGUAGE_NAMES.keys(),
+            default_language=os.getenv("DEFAULT_LANGUAGE", "tr"),
+            cache_size=int(os.getenv("LANGUAGE_CACHE_SIZE", "10000"))
+        )
+        
+        # Eşzamanlı aynı sorguların birleştirilmesi (single-flight)
+        self.singleflight = None
+        if os.getenv("QUERY_COALESCING_ENABLED", "true").lower() == "true":
+            self.singleflight = SingleFlight(on_merge=QUERY_COALESCED_TOTAL.inc)
+        
+        # OpenAI ve vektör store istemcilerinin ortak transport ayarları: bağlantı havuzu,
+        # çağrı başına süre sınırı, jitter'lı yeniden deneme ve opsiyonel hedge
+        self.transport_config = TransportConfig(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5")),
+            timeout=float(os.getenv("HTTP_TIMEOUT_SECONDS", "30")),
+            max_retries=int(os.getenv("HTTP_MAX_RETRIES", "2")),
+            retry_base_delay=float(os.getenv("HTTP_RETRY_BASE_SECONDS", "0.2")),
+            retry_max_delay=float(os.getenv("HTTP_RETRY_MAX_SECONDS", "2")),
+            hedge=os.getenv("HTTP_HEDGE_ENABLED", "false").lower() == "true",
+            hedge_quantile=float(os.getenv("HTTP_HEDGE_QUANTILE", "0.95")),
+            hedge_min_samples=int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", "20"))
+        )
+        # Sohbet cevapları pahalı ve akışlı olduğu için hedge edilmez
+        self.chat_policy = CallPolicy(
+            "openai_chat", replace(self.transport_config, hedge=False),
+            on_retry=record_upstream_retry, on_hedge=record_upstream_hedge
+        )
+        self.embedding_policy = CallPolicy(
+            "openai_embeddings", self.transport_config,
+            on_retry=record_upstream_retry, on_hedge=record_upstream_hedge
+        )
+        self.vector_policy = CallPolicy(
+            "vector_store", self.transport_config,
+            on_retry=record_upstream_retry, on_hedge=record_upstream_hedge
+        )
+        
+        # Uçuştaki LLM/embedding ve vektör store çağrıları için eşzamanlılık sınırları
+        self.llm_limiter = ConcurrencyLimiter("llm", int(os.getenv("LLM_MAX_CONCURRENCY", "32")))
+        self.vector_limiter = ConcurrencyLimiter("vector_store", int(os.getenv("VECTOR_MAX_CONCURRENCY", "64")))
         
-    async def initialize(self):
-        """Servis başlatma - Pinecone, OpenAI bağlantıları"""
+        # Kalıcı embedding önbelleği: değişmeyen SSS'ler ve tekrarlanan sorular yeniden embed edilmez
+        self.embedding_cache = None
+        self.embedding_cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "./data/embedding_cache")
+        self.embedding_cache_max_bytes = int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.embedding_cache_dtype = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+        
+        # Aynı makinedeki tüm worker'ların paylaştığı önbellek (cevap, çeviri)
+        self.shared_cache = None
+        shared_cache_path = os.getenv("SHARED_CACHE_PATH")
+        if shared_cache_path:
+            self.shared_cache = SharedCache(
+                path=shared_cache_path,
+                max_bytes=int(float(os.getenv("SHARED_CACHE_MAX_MB", "256")) * 1024 * 1024)
+            )
+        self.shared_answer_ttl = float(os.getenv("SHARED_CACHE_ANSWER_TTL_SECONDS", "3600"))
+        
+        # Shard modunda (router.py) bu worker'ın halkadaki adresi; yalnızca kendi tenant'larını ısıtır
+        self.shard_ring = None
+        self.shard_self = os.getenv("SHARD_SELF", "").rstrip("/")
+        shard_workers = [w.strip().rstrip("/") for w in os.getenv("SHARD_WORKERS", "").split(",") if w.strip()]
+        if self.shard_self and shard_workers:
+            self.shard_ring = HashRing(shard_workers, vnodes=int(os.getenv("SHARD_VNODES", str(DEFAULT_VNODES))))
+        
+        # Her iki çeviri yönü tarafından paylaşılan çeviri önbelleği
+        self.translation_cache = TranslationCache(
+            max_entries=int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "10000")),
+            disk_path=os.getenv("TRANSLATION_CACHE_PATH") or None,
+            shared=self.shared_cache,
+            disk_max_bytes=int(float(os.getenv("TRANSLATION_CACHE_DISK_MAX_MB", "64")) * 1024 * 1024)
+        )
+        
+        # Benzer sorular için namespace bazlı cevap önbelleği
+        self.semantic_cache = None
+        if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true":
+            self.semantic_cache = SemanticCache(
+                threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+                ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600")),
+                max_entries_per_namespace=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000")),
+                max_bytes=int(float(os.getenv("SEMANTIC_CACHE_MAX_MB", "64")) * 1024 * 1024)
+            )
+        
+    async def initialize(self, vector_backend: Optional[str] = None):
+        """
+        Servis başlatma - Pinecone/yerel indeks, OpenAI bağlantıları
+        
+        Args:
+            vector_backend: "pinecone" veya "local" (varsayılan: VECTOR_BACKEND)
+        """
+        self.initialized = False
+        self.init_error = None
+        started = time.perf_counter()
         try:
+            self.pipelines.clear()
+            self._clear_lexical_indexes()
+            if vector_backend:
+                self.vector_backend = vector_backend.lower()
+            if self.vector_backend not in VECTOR_BACKENDS:
+                raise ValueError(f"Unknown vector backend: {self.vector_backend}")
+            if self.pipeline_mode not in PIPELINE_MODES:
+                raise ValueError(f"Unknown pipeline mode: {self.pipeline_mode}")
+            
             # OpenAI bağlantısı
             openai_api_key = os.getenv("OPENAI_API_KEY")
             if not openai_api_key or openai_api_key == "your_openai_api_key_here":
@@ -34,30 +340,76 @@ class AIService:
                 self.embeddings = None
                 self.llm = None
             else:
+                # Ağır istemci kütüphaneleri yalnızca gerçekten kullanılacaksa yüklenir
+                from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+                
+                # Yeniden denemeler ve süre sınırı transport'ta; SDK'nınkiler kapatılır
                 self.embeddings = OpenAIEmbeddings(
                     openai_api_key=openai_api_key,
-                    model="text-embedding-ada-002"
+                    model=EMBEDDING_MODEL,
+                    http_async_client=build_async_client(self.embedding_policy),
+                    http_client=build_sync_client(self.transport_config),
+                    max_retries=0
                 )
+                if self.embedding_cache_dir:
+                    # Aynı dizini kullanan tüm worker'lar önbelleği paylaşır
+                    self.embedding_cache = EmbeddingCache(
+                        root_dir=self.embedding_cache_dir,
+                        model=EMBEDDING_MODEL,
+                        max_bytes=self.embedding_cache_max_bytes,
+                        dtype=self.embedding_cache_dtype
+                    )
+                    self.embeddings = CachedEmbeddings(self.embeddings, self.embedding_cache)
+                    print(f"Using embedding cache at {self.embedding_cache.path} ({self.embedding_cache.dtype})")
                 
                 self.llm = ChatOpenAI(
                     openai_api_key=openai_api_key,
-                    model="gpt-3.5-turbo",
-                    temperature=0.3
+                    model=CHAT_MODEL,
+                    temperature=0.3,
+                    http_async_client=build_async_client(self.chat_policy),
+                    http_client=build_sync_client(self.transport_config),
+                    max_retries=0
                 )
+                
+                # Tokenizer istek yolunda değil burada yüklenir (ilk seferde indirilebilir)
+                try:
+                    await asyncio.to_thread(self.context_builder.counter.load, CHAT_MODEL)
+                except Exception as e:
+                    print(f"⚠️ Tokenizer could not be loaded, estimating context tokens: {str(e)}")
             
-            # Pinecone bağlantısı
-            pinecone_api_key = os.getenv("PINECONE_API_KEY")
-            if not pinecone_api_key or pinecone_api_key == "your_pinecone_api_key_here":
-                print("⚠️ PINECONE_API_KEY not set. Vector store will be mocked.")
-                # Mock için index
-                self.pc = None
-                self.index = None
+            if self.vector_backend == "local":
+                # Yerel, memory-mapped vektör indeksi - ağ gidiş-dönüşü yok
+                self.local_index = LocalVectorIndex(
+                    root_dir=os.getenv("LOCAL_INDEX_DIR", "./data/vector_index"),
+                    dtype=os.getenv("LOCAL_INDEX_DTYPE", "float16")
+                )
+                print(f"Using local vector index at {self.local_index.root_dir} ({self.local_index.dtype})")
             else:
-                # Pinecone client'ı başlat (new API)
-                self.pc = Pinecone(api_key=pinecone_api_key)
-                
-                # Index'i kontrol et ve gerekirse oluştur
-                await self._ensure_index_exists()
+                # Pinecone bağlantısı
+                pinecone_api_key = os.getenv("PINECONE_API_KEY")
+                if not pinecone_api_key or pinecone_api_key == "your_pinecone_api_key_here":
+                    print("⚠️ PINECONE_API_KEY not set. Vector store will be mocked.")
+                    # Mock için index
+                    self.pc = None
+                    self.index = None
+                else:
+                    # Pinecone client'ı başlat (new API)
+                    from pinecone import Pinecone
+                    
+                    self.pc = Pinecone(api_key=pinecone_api_key, pool_threads=self.transport_config.max_connections)
+                    
+                    # Index'i kontrol et ve gerekirse oluştur
+                    await self._ensure_index_exists()
+            
+            if self.llm:
+                self._build_chains()
+            
+            # Sık kullanılan kullanıcıların pipeline'larını önceden hazırla
+            hot_tenants = [t.strip() for t in os.getenv("HOT_TENANTS", "").split(",") if t.strip()]
+            hot_tenants = [t for t in hot_tenants if self.owns_tenant(t)]
+            if hot_tenants and self.embeddings and self._vector_store_ready():
+                warmed = await self.pipelines.warm(hot_tenants)
+                print(f"Warmed RAG pipelines for {warmed} hot tenants")
             
             print("AI Service initialized successfully")
             
@@ -65,10 +417,147 @@ class AIService:
             print(f"Failed to initialize AI Service: {str(e)}")
             print("⚠️ Running in development mode with limited functionality")
             # Don't raise exception in development
+            self.init_error = str(e)
             self.pc = None
             self.index = None
+            self.local_index = None
             self.embeddings = None
             self.llm = None
+        finally:
+            self.init_seconds = time.perf_counter() - started
+            self.initialized = True
+    
+    def use_components(
+        self,
+        embeddings=None,
+        llm=None,
+        vector_store_factory: Optional[Callable[[str], VectorStore]] = None
+    ):
+        """
+        OpenAI ve vektör backend'i yerine verilen bileşenleri kullanır
+        
+        Benchmark ve yük testlerinde sahte (gecikmesi ayarlanabilir)
+        bileşenleri enjekte etmek için kullanılır.
+        
+        Args:
+            embeddings: LangChain Embeddings
+            llm: LangChain sohbet modeli
+            vector_store_factory: user_id alıp o namespace'in VectorStore'unu dönen fabrika
+        """
+        if embeddings is not None:
+            self.embeddings = embeddings
+        if llm is not None:
+            self.llm = llm
+            self._build_chains()
+        if vector_store_factory is not None:
+            self.vector_store_factory = vector_store_factory
+        self.pipelines.clear()
+        self._clear_lexical_indexes()
+        self.initialized = True
+    
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Servisin gerçek istekleri cevaplayıp cevaplayamayacağını raporlar
+        
+        Returns:
+            Dict[str, Any]: ready bayrağı, durum ("initializing", "ready", "degraded")
+                ve bileşen bazında kontroller
+        """
+        checks = {
+            "llm": self.llm is not None,
+            "embeddings": self.embeddings is not None,
+            "vector_store": self._vector_store_ready(),
+        }
+        if not self.initialized:
+            status = "initializing"
+        elif all(checks.values()):
+            status = "ready"
+        else:
+            status = "degraded"  # Anahtarlar eksik ya da başlatma hata verdi: development mode
+        return {
+            "ready": status == "ready",
+            "status": status,
+            "checks": checks,
+            "error": self.init_error,
+            "init_seconds": round(self.init_seconds, 3) if self.init_seconds is not None else None,
+        }
+    
+    def owns_tenant(self, user_id: str) -> bool:
+        """Shard modunda tenant'ın sahibi bu worker mı? (shard modu kapalıysa her zaman True)"""
+        if self.shard_ring is None:
+            return True
+        return self.shard_ring.node_for(user_id) == self.shard_self
+    
+    def _vector_store_ready(self) -> bool:
+        """Seçili vektör backend'i kullanıma hazır mı?"""
+        if self.vector_store_factory is not None:
+            return True
+        if self.vector_backend == "local":
+            return self.local_index is not None
+        return self.index is not None
+    
+    def _build_chains(self):
+        """Prompt'ları ve LCEL chain'lerini bir kez derler (istek başına değil)"""
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+        
+        parser = StrOutputParser()
+        # Token kullanımı /metrics'te adım ve tenant bazında sayılır
+        config = {"callbacks": [PrometheusTokenHandler()]}
+        self.rag_chain = (
+            ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE) | self.llm | parser
+        ).with_config(config)
+        self.multilingual_chain = (
+            ChatPromptTemplate.from_template(MULTILINGUAL_RAG_PROMPT_TEMPLATE) | self.llm | parser
+        ).with_config(config)
+        self.translation_chain = (
+            ChatPromptTemplate.from_template(TRANSLATION_PROMPT_TEMPLATE) | self.llm | parser
+        ).with_config(config)
+    
+    def _create_tenant_pipeline(self, user_id: str) -> TenantPipeline:
+        """Kullanıcının vektör store'unu kurar (PipelineRegistry fabrikası, thread'de çalışır)"""
+        vector_store = self._get_vector_store(user_id)
+        if self.vector_backend == "local" and self.vector_store_factory is None:
+            # Namespace dosyalarını şimdi yükle ki ilk sorgu beklemesin
+            self.local_index.namespace(user_id)
+        return TenantPipeline(user_id=user_id, vector_store=vector_store)
+    
+    def _release_tenant(self, user_id: str):
+        """Registry'den düşen kullanıcının süreç içi durumunu bırakır (PipelineRegistry on_evict)"""
+        self.lexical_indexes.pop(user_id, None)
+        self._lexical_cursors.pop(user_id, None)
+        self._lexical_seeds.pop(user_id, None)
+        if self._seen_generations.pop(user_id, None) is not None and self.semantic_cache:
+            # Görülen generation unutulunca başka worker'ın ingest'i fark edilemez; eski cevaplar da bırakılır
+            self.semantic_cache.invalidate(user_id)
+        if self.local_index is not None:
+            self.local_index.release(user_id)
+    
+    def _get_vector_store(self, user_id: str):
+        """
+        Kullanıcının namespace'i için vektör store döndürür
+        
+        Args:
+            user_id: Kullanıcı ID'si (namespace için)
+            
+        Returns:
+            VectorStore: PineconeVectorStore veya LocalVectorStore
+        """
+        if self.vector_store_factory is not None:
+            return self.vector_store_factory(user_id)
+        if self.vector_backend == "local":
+            return LocalVectorStore(
+                index=self.local_index,
+                embedding=self.embeddings,
+                namespace=user_id
+            )
+        from langchain_pinecone import PineconeVectorStore
+        
+        return PineconeVectorStore(
+            index=self.index,
+            embedding=self.embeddings,
+            namespace=user_id
+        )
     
     async def _ensure_index_exists(self):
         """Pinecone index'ini kontrol et ve gerekirse oluştur"""
@@ -77,13 +566,15 @@ class AIService:
                 return
                 
             # Mevcut index'leri listele
-            existing_indexes = [index.name for index in self.pc.list_indexes()]
+            # Pinecone istemcisi senkron; event loop'u bloklamamak için thread'de çalışır
+            existing_indexes = [index.name for index in await asyncio.to_thread(self.pc.list_indexes)]
             
             if self.index_name not in existing_indexes:
                 print(f"Creating new Pinecone index: {self.index_name}")
                 
                 # Yeni index oluştur
-                self.pc.create_index(
+                await asyncio.to_thread(
+                    self.pc.create_index,
                     name=self.index_name,
                     dimension=1536,  # OpenAI ada-002 embedding dimension
                     metric="cosine",
@@ -98,158 +589,1197 @@ class AIService:
                 print(f"Index {self.index_name} created successfully")
             
             # Index'e bağlan
-            self.index = self.pc.Index(self.index_name)
+            # urllib3 bağlantı havuzu eşzamanlı vektör çağrılarını karşılayacak kadar büyük olmalı
+            self.index = await asyncio.to_thread(
+                self.pc.Index, self.index_name, connection_pool_maxsize=self.transport_config.max_connections
+            )
             print(f"Connected to index: {self.index_name}")
             
         except Exception as e:
             print(f"Error ensuring index exists: {str(e)}")
             raise
     
-    async def ingest_faqs(self, faqs: List[FAQ], user_id: str) -> bool:
+    async def ingest_faqs(
+        self,
+        faqs: List[FAQ],
+        user_id: str,
+        batch_size: Optional[int] = None,
+        skip_batches: Optional[Set[int]] = None,
+        on_batch_done: Optional[BatchCallback] = None,
+        languages: Optional[List[str]] = None
+    ) -> IngestStats:
         """
-        SSS verilerini işleyip Pinecone'a yükler
+        SSS verilerini batch'ler halinde embed edip vektör store'a yükler
         
         Args:
             faqs: SSS listesi
             user_id: Kullanıcı ID'si (namespace için)
+            batch_size: Batch boyutu (varsayılan: INGEST_BATCH_SIZE)
+            skip_batches: Önceki çalışmada tamamlanmış, atlanacak batch'ler
+            on_batch_done: Her batch bittiğinde çağrılır (checkpoint için)
+            languages: Soru ve cevabın önceden çevrilip ayrıca indeksleneceği
+                diller (varsayılan: FAQ_TRANSLATION_LANGUAGES)
             
         Returns:
-            bool: İşlem başarılı ise True
+            IngestStats: İşlenen/başarısız SSS sayıları ve throughput
         """
         try:
+            # Vektör id'leri SSS'nin kalıcı id'sidir: tekrar gönderilen SSS kopya üretmez, üzerine yazar
+            faqs = dedupe_faqs(faqs)
             if not faqs:
-                return True
+                return IngestStats(total=0)
+            languages = self.expansion_languages(languages)
             
             # Development mode check
-            if not self.embeddings or not self.index:
+            if not self.embeddings or not self._vector_store_ready():
                 print("⚠️ Running in development mode - FAQ ingestion simulated")
                 print(f"Would ingest {len(faqs)} FAQs for user {user_id}")
-                return True
+                return IngestStats(total=len(faqs), ingested=len(faqs))
             
-            # Her SSS için doküman oluştur
-            documents = []
-            for i, faq in enumerate(faqs):
-                # Soru ve cevabı birleştir
-                content = f"Soru: {faq.question}\nCevap: {faq.answer}"
-                
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "question": faq.question,
-                        "answer": faq.answer,
-                        "user_id": user_id,
-                        "faq_id": f"{user_id}_{i}"
-                    }
-                )
-                documents.append(doc)
+            if languages and not self.llm:
+                print("⚠️ OPENAI_API_KEY not set. FAQs are ingested without translations.")
+                languages = []
             
-            # Vektör store oluştur ve dökümanları ekle
-            vector_store = PineconeVectorStore.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                index_name=self.index_name,
-                namespace=user_id  # Kullanıcı verilerini ayır
+            bind_tenant(user_id)
+            pipeline = IngestPipeline(
+                embeddings=self.embeddings,
+                upsert=lambda ids, texts, vectors, metadatas: self._upsert_embeddings(
+                    user_id, ids, texts, vectors, metadatas
+                ),
+                batch_size=batch_size or int(os.getenv("INGEST_BATCH_SIZE", "100")),
+                concurrency=int(os.getenv("INGEST_CONCURRENCY", "4")),
+                upsert_batch_size=int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "100")),
+                embed_limiter=self.llm_limiter,
+                expand=(lambda batch: self._expand_records(batch, languages)) if languages else None
             )
+            try:
+                with stage_timer("ingest", "total"):
+                    stats = await pipeline.run(
+                        self._faq_records(faqs, user_id, languages),
+                        total=len(faqs),
+                        skip_batches=skip_batches,
+                        on_batch_done=on_batch_done
+                    )
+            finally:
+                await self._invalidate_answers(user_id)
             
-            print(f"Successfully ingested {len(faqs)} FAQs for user {user_id}")
-            return True
+            print(
+                f"Ingested {stats.ingested}/{stats.total} FAQs for user {user_id} "
+                f"in {stats.elapsed:.2f}s ({stats.faqs_per_second:.1f} FAQs/sec)"
+            )
+            return stats
             
         except Exception as e:
             print(f"Error ingesting FAQs: {str(e)}")
-            return False
+            return IngestStats(total=len(faqs), failed=len(faqs), error=str(e))
+    
+    def _faq_records(self, faqs: List[FAQ], user_id: str, languages: List[str]) -> Iterator[IngestRecord]:
+        """SSS'leri tembel olarak (id, içerik, metadata) kayıtlarına çevirir"""
+        for faq in faqs:
+            record_id = faq_id(faq)
+            metadata = {
+                "question": faq.question,
+                "answer": faq.answer,
+                "user_id": user_id,
+                "faq_id": record_id,
+                "content_hash": content_hash(faq),
+                "language": self._faq_language(faq)
+            }
+            if languages:
+                metadata["languages"] = languages  # Delta sync dil kümesi değişen SSS'leri yeniden yazar
+            yield record_id, _faq_content(faq.question, faq.answer), metadata
+    
+    async def _expand_records(self, batch: List[IngestRecord], languages: List[str]) -> List[IngestRecord]:
+        """
+        Batch'e her SSS'nin istenen dillerdeki çevirilerini ayrı kayıtlar olarak ekler
+        
+        Varyantlar "<faq_id>#<dil>" id'siyle ve language metadata'sıyla yazılır;
+        sorgu o dilde geldiğinde çeviri yapılmadan getirilir ve cevabı döner.
+        Çeviri hatası batch'i başarısız yapar (yarım çevrilmiş SSS yazılmaz).
+        """
+        targets = [
+            (record, language)
+            for record in batch
+            for language in languages
+            if language != record[2]["language"]
+        ]
+        translations = await asyncio.gather(*(
+            asyncio.gather(
+                self._translate(record[2]["question"], language),
+                self._translate(record[2]["answer"], language)
+            )
+            for record, language in targets
+        ))
+        variants = []
+        for (record, language), (question, answer) in zip(targets, translations):
+            doc_id, _, metadata = record
+            metadata = {**metadata, "question": question, "answer": answer, "language": language}
+            metadata.pop("languages", None)
+            variants.append((variant_id(doc_id, language), _faq_content(question, answer), metadata))
+        return batch + variants
+    
+    def expansion_languages(self, languages: Optional[List[str]] = None) -> List[str]:
+        """
+        İngest'te SSS'lerin çevrileceği dilleri çözümler
+        
+        Raises:
+            ValueError: Desteklenmeyen dil kodu varsa
+        """
+        languages = self.faq_translation_languages if languages is None else languages
+        if "all" in languages:
+            return sorted(LANGUAGE_NAMES)
+        unsupported = [lang for lang in languages if lang not in LANGUAGE_NAMES]
+        if unsupported:
+            raise ValueError(f"Unsupported languages: {', '.join(unsupported)}")
+        return sorted(set(languages))
+    
+    def _faq_language(self, faq: FAQ) -> str:
+        """SSS'nin yazıldığı dil (soru ve cevap birlikte, kısa sorulardan daha güvenilir)"""
+        return self._detect_language(f"{faq.question}\n{faq.answer}")
+    
+    async def _invalidate_answers(self, user_id: str):
+        """Namespace değişti; önbellekteki cevaplar artık eskimiş olabilir"""
+        if self.semantic_cache:
+            self.semantic_cache.invalidate(user_id)
+        if self.shared_cache:
+            generation = await self.shared_cache.abump_generation(user_id)
+            if self._seen_generations.get(user_id) == generation - 1:
+                # Yalnızca kendi yazmamız: süreç içi durum güncel (arada başka worker yazdıysa düşürülecek)
+                self._seen_generations[user_id] = generation
+        pipeline = self.pipelines.peek(user_id)
+        if pipeline is not None:
+            pipeline.writes += 1
+    
+    async def _upsert_embeddings(
+        self,
+        user_id: str,
+        ids: List[str],
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: List[dict]
+    ):
+        """Önceden hesaplanmış embedding'leri kullanıcının namespace'ine ve sözcüksel indekse yazar"""
+        with stage_timer("ingest", "upsert"):
+            if self.vector_backend == "local" or self.vector_store_factory is not None:
+                vector_store = (await self.pipelines.aget(user_id)).vector_store
+                await self._vector_thread_call(vector_store.add_embeddings, texts, vectors, metadatas, ids, hedge=False)
+            else:
+                # PineconeVectorStore metni "text" metadata anahtarından okur
+                records = [
+                    {"id": doc_id, "values": vector, "metadata": {**metadata, "text": text}}
+                    for doc_id, text, vector, metadata in zip(ids, texts, vectors, metadatas)
+                ]
+                await self._vector_thread_call(self.index.upsert, vectors=records, namespace=user_id, hedge=False)
+        
+        await self._update_lexical_index(user_id, lambda index: index.add(ids, texts, metadatas))
+    
+    async def sync_faqs(
+        self,
+        faqs: List[FAQ],
+        user_id: str,
+        delete_missing: bool = True,
+        dry_run: bool = False,
+        languages: Optional[List[str]] = None
+    ) -> FAQSyncResult:
+        """
+        Kataloğu saklanan SSS'lerle karşılaştırıp yalnızca farkı uygular
+        
+        Args:
+            faqs: Kullanıcının güncel SSS kataloğu
+            user_id: Kullanıcı ID'si (namespace için)
+            delete_missing: Katalogda olmayan saklı SSS'ler silinsin mi; False ise
+                yalnızca verilen SSS'ler eklenir/güncellenir (upsert)
+            dry_run: Yalnızca farkı hesapla, hiçbir şey yazma
+            languages: Önceden çevrilecek diller (varsayılan: FAQ_TRANSLATION_LANGUAGES);
+                farklı dil kümesiyle yazılmış SSS'ler güncellenmiş sayılır
+            
+        Returns:
+            FAQSyncResult: Değişiklik kümesi ve yazma sonucu
+        """
+        languages = self.expansion_languages(languages)
+        ids = None if delete_missing else [faq_id(faq) for faq in faqs]
+        stored = await self._stored_faqs(user_id, ids, languages)
+        changes = diff_catalog(stored, faqs, delete_missing=delete_missing)
+        return await self._apply_faq_changes(changes, user_id, dry_run, languages)
+    
+    async def update_faq(self, faq: FAQ, user_id: str, languages: Optional[List[str]] = None) -> FAQSyncResult:
+        """
+        Id'si verilen SSS'nin sorusunu/cevabını günceller
+        
+        Raises:
+            KeyError: SSS namespace'te yoksa
+        """
+        languages = self.expansion_languages(languages)
+        stored = await self._stored_faqs(user_id, [faq.id], languages)
+        if faq.id not in stored and self.embeddings and self._vector_store_ready():
+            raise KeyError(faq.id)
+        return await self._apply_faq_changes(diff_catalog(stored, [faq], delete_missing=False), user_id, languages=languages)
+    
+    async def delete_faqs(self, ids: List[str], user_id: str) -> FAQSyncResult:
+        """Verilen id'lerdeki SSS'leri siler (olmayan id'ler yok sayılır)"""
+        stored = await self._stored_faqs(user_id, list(dict.fromkeys(ids)))
+        return await self._apply_faq_changes(FAQChangeSet(deleted=list(stored)), user_id)
+    
+    async def _apply_faq_changes(
+        self,
+        changes: FAQChangeSet,
+        user_id: str,
+        dry_run: bool = False,
+        languages: Optional[List[str]] = None
+    ) -> FAQSyncResult:
+        """Değişen SSS'leri embed edip yazar, silinenleri vektör store'dan ve sözcüksel indeksten kaldırır"""
+        result = FAQSyncResult(changes=changes, dry_run=dry_run)
+        if dry_run or changes.empty:
+            return result
+        
+        bind_tenant(user_id)
+        languages = self.expansion_languages(languages)
+        stale = []
+        if changes.to_write:
+            stats = await self.ingest_faqs(changes.to_write, user_id, languages=languages)
+            result.failed = stats.failed
+            result.error = stats.error
+            if stats.success:
+                # Artık yazılmayan dil varyantları (dil kümesi daraldı ya da SSS'nin kendi dili değişti)
+                for faq in changes.updated:
+                    written = set(languages) - {self._faq_language(faq)}
+                    stale += [variant_id(faq_id(faq), language) for language in LANGUAGE_NAMES if language not in written]
+        # Silinen SSS'lerin tüm dil varyantları da silinir
+        deleted = changes.deleted + [variant_id(doc_id, language) for doc_id in changes.deleted for language in LANGUAGE_NAMES]
+        if deleted or stale:
+            try:
+                await self._delete_embeddings(user_id, deleted + stale)
+            except Exception as e:
+                print(f"Error deleting FAQs: {str(e)}")
+                result.error = str(e)
+            finally:
+                await self._invalidate_answers(user_id)
+        
+        print(
+            f"Synced FAQs for user {user_id}: {len(changes.added)} added, {len(changes.updated)} updated, "
+            f"{len(changes.unchanged)} unchanged, {len(changes.deleted)} deleted"
+        )
+        return result
+    
+    async def _stored_faqs(
+        self,
+        user_id: str,
+        ids: Optional[List[str]] = None,
+        languages: Optional[List[str]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Namespace'te saklı SSS'lerin içerik özetleri (dil varyantları hariç)
+        
+        Args:
+            user_id: Kullanıcı ID'si (namespace için)
+            ids: Yalnızca bu id'lere bakılır (verilmezse namespace'in tamamı)
+            languages: Verilirse başka dil kümesiyle çevrilmiş SSS'lerin özeti None döner
+            
+        Returns:
+            Dict[str, Optional[str]]: Kayıt id'si -> içerik özeti (kalıcı id'lerden
+                önce yazılmış ya da yeniden yazılması gereken kayıtlarda None)
+        """
+        records = await self._stored_metadata(user_id, ids)
+        stored = {}
+        for doc_id, metadata in records.items():
+            if is_variant(doc_id):
+                continue
+            stale = languages is not None and sorted(metadata.get("languages") or []) != languages
+            stored[doc_id] = None if stale else metadata.get("content_hash")
+        return stored
+    
+    async def _stored_metadata(self, user_id: str, ids: Optional[List[str]] = None) -> Dict[str, dict]:
+        """Namespace'teki kayıtların metadata'sı (Pinecone'da dil varyantları hariç)"""
+        if not self.embeddings or not self._vector_store_ready():
+            return {}
+        if self.vector_backend == "local" or self.vector_store_factory is not None:
+            vector_store = (await self.pipelines.aget(user_id)).vector_store
+            return await self._vector_thread_call(vector_store.get_metadata, ids)
+        return await self._vector_thread_call(self._pinecone_metadata, user_id, ids)
+    
+    async def _stored_documents(self, user_id: str) -> Dict[str, Document]:
+        """Namespace'teki tüm kayıtlar (dil varyantları dahil) metinleriyle"""
+        if self.vector_backend == "local" or self.vector_store_factory is not None:
+            vector_store = (await self.pipelines.aget(user_id)).vector_store
+            return await self._vector_thread_call(vector_store.get_documents)
+        records = await self._vector_thread_call(self._pinecone_metadata, user_id, None, True)
+        # Metin upsert'te "text" metadata anahtarına yazılır
+        return {
+            doc_id: Document(page_content=metadata.pop("text", ""), metadata=metadata, id=doc_id)
+            for doc_id, metadata in records.items()
+        }
+    
+    def _pinecone_metadata(
+        self,
+        user_id: str,
+        ids: Optional[List[str]] = None,
+        include_variants: bool = False
+    ) -> Dict[str, dict]:
+        """Pinecone namespace'indeki kayıtların metadata'sı (senkron; thread'de çalışır)"""
+        if ids is None:
+            ids = [
+                doc_id for page in self.index.list(namespace=user_id) for doc_id in page
+                if include_variants or not is_variant(doc_id)
+            ]
+        records = {}
+        for start in range(0, len(ids), PINECONE_FETCH_BATCH):
+            response = self.index.fetch(ids=ids[start:start + PINECONE_FETCH_BATCH], namespace=user_id)
+            for doc_id, vector in response.vectors.items():
+                records[doc_id] = vector.metadata or {}
+        return records
+    
+    async def _delete_embeddings(self, user_id: str, ids: List[str]):
+        """Kayıtları kullanıcının namespace'inden ve sözcüksel indeksten siler"""
+        with stage_timer("ingest", "delete"):
+            if self.vector_backend == "local" or self.vector_store_factory is not None:
+                vector_store = (await self.pipelines.aget(user_id)).vector_store
+                await self._vector_thread_call(vector_store.delete, ids, hedge=False)
+            else:
+                for start in range(0, len(ids), PINECONE_DELETE_BATCH):
+                    batch = ids[start:start + PINECONE_DELETE_BATCH]
+                    await self._vector_thread_call(self.index.delete, ids=batch, namespace=user_id, hedge=False)
+        
+        await self._update_lexical_index(user_id, lambda index: index.delete(ids))
     
-    async def query(self, user_message: str, user_id: str) -> str:
+    async def query(self, user_message: str, user_id: str, language_hint: Optional[str] = None) -> QueryResult:
         """
         Kullanıcı sorusunu işleyip çoklu dil desteğiyle yanıt verir
         
         Args:
             user_message: Kullanıcının sorusu
             user_id: Kullanıcı ID'si (namespace için)
+            language_hint: İstemcinin bildirdiği dil kodu (opsiyonel)
             
         Returns:
-            str: AI'dan gelen yanıt
+            QueryResult: AI'dan gelen yanıt ve yolu (cache, direct, rag)
         """
         try:
             # Development mode check
-            if not self.llm or not self.embeddings or not self.index:
+            if not self.llm or not self.embeddings or not self._vector_store_ready():
                 print("⚠️ Running in development mode - query simulated")
-                return f"Development mode: Received query '{user_message}' for user {user_id}. Please configure OpenAI and Pinecone API keys for full functionality."
+                return QueryResult(self._development_answer(user_message, user_id), PATH_DEVELOPMENT)
             
-            # 1. Kullanıcının dilini tespit et
-            try:
-                original_language = detect(user_message)
-            except:
-                original_language = "tr"  # Default Turkish
+            started = time.perf_counter()
+            spans = bind_tenant(user_id)
+            with stage_timer("query", "total"):
+                # 1. Kullanıcının dilini tespit et
+                with stage_timer("query", "detect"):
+                    original_language = self._detect_language(user_message, language_hint)
+                
+                # Aynı tenant'tan aynı anda gelen aynı soru tek bir pipeline'da birleştirilir
+                if self.singleflight:
+                    key = (user_id, normalize_text(user_message), original_language)
+                    result = await self.singleflight.do(
+                        key, lambda: self._answer_query(user_message, user_id, original_language)
+                    )
+                else:
+                    result = await self._answer_query(user_message, user_id, original_language)
+            record_query_path(result.path)
+            log_if_slow("query", user_id, spans, (time.perf_counter() - started) * 1000)
+            return result
             
+        except Exception as e:
+            print(f"Error in query: {str(e)}")
+            return QueryResult(ERROR_ANSWER, PATH_ERROR)
+    
+    async def _answer_query(self, user_message: str, user_id: str, original_language: str) -> QueryResult:
+        """query için önbellek kontrolü, retrieval, üretim ve çeviri adımları"""
+        # Benzer bir soru daha önce cevaplandıysa önbellekten döndür
+        with stage_timer("query", "cache_lookup"):
+            lookup = await self._lookup_cached_answer(user_message, user_id, original_language)
+        if lookup.answer is not None:
+            return QueryResult(lookup.answer, PATH_CACHE)
+        
+        # SSS'ler kullanıcının dilinde de indekslendiyse (ingest'te çevrildiyse) o dilde getir
+        with stage_timer("query", "retrieve"):
+            retrieval = await self._retrieve_in_language(user_message, user_id, original_language)
+            if retrieval is None and self.pipeline_mode == "multilingual":
+                retrieval = await self._retrieve(user_message, user_id)
+        
+        if retrieval is not None:
+            # Ham mesajla getirildi: çeviri adımları olmadan tek çağrıda kullanıcının dilinde cevapla
+            direct_match = self._direct_match(retrieval)
+            if direct_match is None:
+                with stage_timer("query", "generate"):
+                    final_answer = await self.llm_limiter.run(
+                        self.multilingual_chain.ainvoke(
+                            self._multilingual_input(retrieval, user_message, original_language)
+                        )
+                    )
+        else:
             # 2. Soruyu İngilizce'ye çevir (eğer İngilizce değilse)
             if original_language != "en":
-                english_question = await self._translate_to_english(user_message)
+                with stage_timer("query", "translate_in"):
+                    english_question = await self._translate_to_english(user_message)
             else:
                 english_question = user_message
             
-            # 3. Vektör store'u kullanarak ilgili SSS'leri bul
-            vector_store = PineconeVectorStore(
-                index=self.index,
-                embedding=self.embeddings,
-                namespace=user_id
-            )
-            
-            retriever = vector_store.as_retriever(
-                search_kwargs={"k": 3}  # En alakalı 3 dokümanı getir
-            )
+            # 3. Sözcüksel indeks ve vektör store'u kullanarak ilgili SSS'leri bul
+            with stage_timer("query", "retrieve"):
+                retrieval = await self._retrieve(english_question, user_id, original_message=user_message)
+            direct_match = self._direct_match(retrieval)
+            if direct_match is None:
+                # 4-5. RAG chain ile İngilizce cevabı al (event loop bloklanmaz)
+                with stage_timer("query", "generate"):
+                    english_answer = await self.llm_limiter.run(
+                        self.rag_chain.ainvoke({"context": self._build_context(retrieval), "question": english_question})
+                    )
+                
+                # 6. Cevabı orijinal dile çevir (eğer gerekiyorsa)
+                if original_language != "en":
+                    with stage_timer("query", "translate_out"):
+                        final_answer = await self._translate_to_language(english_answer, original_language)
+                else:
+                    final_answer = english_answer
+        
+        # Soru kayıtlı bir SSS ile neredeyse aynıysa onun cevabı (gerekirse çevrilerek) döner
+        if direct_match is not None:
+            with stage_timer("query", "translate_out"):
+                final_answer = await self._localize_answer(direct_match, original_language)
+        
+        await self._store_cached_answer(lookup, user_id, final_answer, original_language)
+        return QueryResult(final_answer, PATH_DIRECT if direct_match is not None else PATH_RAG)
+    
+    async def query_stream(
+        self,
+        user_message: str,
+        user_id: str,
+        language_hint: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Kullanıcı sorusunu işler ve cevabı üretildikçe parça parça döndürür
+        
+        İngilizce cevaplar token token akar. Diğer dillerde cevap cümlelere
+        bölünür; her cümle tamamlanır tamamlanmaz çevrilip gönderilirken
+        üretim arka planda devam eder.
+        
+        Args:
+            user_message: Kullanıcının sorusu
+            user_id: Kullanıcı ID'si (namespace için)
+            language_hint: İstemcinin bildirdiği dil kodu (opsiyonel)
             
-            # 4. RAG pipeline oluştur
-            rag_prompt = ChatPromptTemplate.from_template("""
-Aşağıdaki bağlamı kullanarak kullanıcının sorusuna cevap ver. 
-Eğer bağlamda cevabı bulamazsan, "Bu konuda bilgim yok, lütfen daha spesifik bir soru sorun." şeklinde yanıtla.
-Cevabını mümkün olduğunca doğal ve yardımcı bir tonda ver.
-
-Bağlam:
-{context}
-
-Soru: {question}
-
-Cevap:""")
+        Yields:
+            Dict[str, Any]: {"type": "token", "text": ...} olayları ve son olarak
+                {"type": "done", "ttft_ms": ..., "language": ..., "path": ...}
+        """
+        started = time.perf_counter()
+        ttft = None
+        state: Dict[str, Any] = {"language": None, "hint": language_hint, "path": None}
+        
+        try:
+            async for text in self._stream_answer(user_message, user_id, state):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                    QUERY_TTFT_SECONDS.observe(ttft)
+                yield {"type": "token", "text": text}
+        except Exception as e:
+            print(f"Error in streaming query: {str(e)}")
+            state["path"] = PATH_ERROR
+            yield {"type": "error", "text": ERROR_ANSWER}
+        
+        if state["path"] in (PATH_CACHE, PATH_DIRECT, PATH_RAG):
+            record_query_path(state["path"])
+        ttft_ms = round(ttft * 1000, 1) if ttft is not None else None
+        yield {"type": "done", "ttft_ms": ttft_ms, "language": state["language"], "path": state["path"]}
+    
+    async def _stream_answer(self, user_message: str, user_id: str, state: Dict[str, Any]) -> AsyncIterator[str]:
+        """query_stream için cevap metnini parça parça üretir"""
+        # Development mode check
+        if not self.llm or not self.embeddings or not self._vector_store_ready():
+            print("⚠️ Running in development mode - query simulated")
+            state["path"] = PATH_DEVELOPMENT
+            yield self._development_answer(user_message, user_id)
+            return
+        
+        bind_tenant(user_id)
+        with stage_timer("query_stream", "detect"):
+            original_language = self._detect_language(user_message, state["hint"])
+        state["language"] = original_language
+        
+        with stage_timer("query_stream", "cache_lookup"):
+            lookup = await self._lookup_cached_answer(user_message, user_id, original_language)
+        if lookup.answer is not None:
+            state["path"] = PATH_CACHE
+            yield lookup.answer
+            return
+        
+        with stage_timer("query_stream", "retrieve"):
+            retrieval = await self._retrieve_in_language(user_message, user_id, original_language)
+            if retrieval is None and self.pipeline_mode == "multilingual":
+                retrieval = await self._retrieve(user_message, user_id)
+        native = retrieval is not None
+        
+        if native:
+            rag_chain = self.multilingual_chain
+            rag_input = self._multilingual_input(retrieval, user_message, original_language)
+        else:
+            if original_language != "en":
+                with stage_timer("query_stream", "translate_in"):
+                    english_question = await self._translate_to_english(user_message)
+            else:
+                english_question = user_message
             
-            # RAG chain oluştur
-            def format_docs(docs):
-                return "\n\n".join(doc.page_content for doc in docs)
+            with stage_timer("query_stream", "retrieve"):
+                retrieval = await self._retrieve(english_question, user_id, original_message=user_message)
+            rag_chain = self.rag_chain
+            rag_input = {"context": self._build_context(retrieval), "question": english_question}
+        
+        direct_match = self._direct_match(retrieval)
+        if direct_match is not None:
+            state["path"] = PATH_DIRECT
+            answer = await self._localize_answer(direct_match, original_language)
+            await self._store_cached_answer(lookup, user_id, answer, original_language)
+            yield answer
+            return
+        
+        state["path"] = PATH_RAG
+        answer_parts = []
+        if original_language == "en" or native:
+            async with self.llm_limiter.slot():
+                async for token in rag_chain.astream(rag_input):
+                    answer_parts.append(token)
+                    yield token
+        else:
+            # Üretim arka planda sürerken tamamlanan cümleler sırayla çevrilir
+            sentences: asyncio.Queue = asyncio.Queue()
+            producer = asyncio.create_task(self._stream_sentences(rag_chain, rag_input, sentences))
+            try:
+                while True:
+                    sentence = await sentences.get()
+                    if sentence is None:
+                        break
+                    translated = await self._translate_to_language(sentence, original_language)
+                    chunk = translated if not answer_parts else " " + translated
+                    answer_parts.append(chunk)
+                    yield chunk
+                await producer
+            finally:
+                producer.cancel()
+        
+        await self._store_cached_answer(lookup, user_id, "".join(answer_parts), original_language)
+    
+    async def _stream_sentences(self, rag_chain, rag_input: Dict[str, Any], sentences: asyncio.Queue):
+        """RAG cevabını akıtır ve tamamlanan cümleleri kuyruğa koyar (sonunda None)"""
+        buffer = ""
+        try:
+            async with self.llm_limiter.slot():
+                async for token in rag_chain.astream(rag_input):
+                    buffer += token
+                    complete, buffer = split_sentences(buffer)
+                    for sentence in complete:
+                        await sentences.put(sentence)
+            if buffer.strip():
+                await sentences.put(buffer.strip())
+        finally:
+            await sentences.put(None)
+    
+    def _development_answer(self, user_message: str, user_id: str) -> str:
+        return f"Development mode: Received query '{user_message}' for user {user_id}. Please configure OpenAI and Pinecone API keys for full functionality."
+    
+    def _detect_language(self, text: str, hint: Optional[str] = None) -> str:
+        """Metnin dilini tespit eder (istemci ipucu varsa onu kullanır)"""
+        return self.language_detector.detect(text, hint)
+    
+    async def _lookup_cached_answer(
+        self,
+        user_message: str,
+        user_id: str,
+        language: str
+    ) -> CachedAnswerLookup:
+        """
+        Önce paylaşımlı önbellekte aynı soruyu, sonra semantik önbellekte benzer bir soruyu arar
+        
+        Returns:
+            CachedAnswerLookup: Bulunan cevap (yoksa None) ve sonradan yazmak için anahtarlar
+        """
+        lookup = CachedAnswerLookup()
+        # Başka bir worker ingest ettiyse süreç içi semantik önbellekteki cevaplar eskimiştir
+        await self._check_generation(user_id)
+        if self.shared_cache:
+            lookup.shared_key = await self._shared_answer_key(user_id, language, user_message)
+            lookup.answer = await self.shared_cache.aget_text(KIND_ANSWER, lookup.shared_key)
+            record_cache_lookup("shared_answer", lookup.answer is not None)
+            if lookup.answer is not None:
+                return lookup
+        
+        if self.semantic_cache:
+            lookup.generation = self.semantic_cache.generation(user_id)
+            lookup.embedding = await self.llm_limiter.run(self.embeddings.aembed_query(user_message))
+            lookup.answer = self.semantic_cache.lookup(user_id, lookup.embedding, language)
+            record_cache_lookup("semantic", lookup.answer is not None)
+        return lookup
+    
+    async def _store_cached_answer(self, lookup: CachedAnswerLookup, user_id: str, answer: str, language: str):
+        """Üretilen cevabı lookup sırasında alınan anahtar/generation ile önbelleklere yazar"""
+        if lookup.embedding is not None:
+            self.semantic_cache.store(user_id, lookup.embedding, answer, language, generation=lookup.generation)
+        if lookup.shared_key is not None:
+            await self.shared_cache.aput_text(KIND_ANSWER, lookup.shared_key, answer, ttl_seconds=self.shared_answer_ttl)
+    
+    async def _shared_answer_key(self, user_id: str, language: str, user_message: str) -> str:
+        """Generation anahtara dahildir; ingest sonrası eski cevaplar hiçbir worker'da okunmaz"""
+        generation = await self.shared_cache.ageneration(user_id)
+        return content_key(user_id, str(generation), language, normalize_text(user_message))
+    
+    async def _retrieve(
+        self,
+        question: str,
+        user_id: str,
+        original_message: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> RetrievalResult:
+        """
+        Kullanıcının namespace'inden en alakalı SSS dokümanlarını getirir
+        
+        Sözcüksel eşleşme kesinse (sipariş numarası, ürün kodu, "iade" gibi)
+        embedding ve vektör sorgusu hiç yapılmaz; değilse iki sıralama RRF
+        ile birleştirilir.
+        
+        Args:
+            question: Retrieval sorusu (translate modunda İngilizce çevirisi)
+            user_id: Kullanıcı ID'si (namespace için)
+            original_message: Kullanıcının ham mesajı; verilirse sözcüksel arama
+                bununla yapılır
+            language: Verilirse yalnızca bu dildeki SSS kayıtları (ve çeviri varyantları) aranır
             
-            rag_chain = (
-                RunnableParallel({"context": retriever | format_docs, "question": RunnablePassthrough()})
-                | rag_prompt
-                | self.llm
-                | StrOutputParser()
+        Returns:
+            RetrievalResult: Dokümanlar ve (vektör araması yapıldıysa) en yakın SSS'nin skoru
+        """
+        lexical_hits = await self._lexical_search(user_id, question, original_message, language)
+        # Eksik olabilecek bir indeksin (Pinecone) "kesin" eşleşmesi silinmiş ya da eski bir SSS olabilir
+        if self._lexical_index_complete() and is_decisive(
+            lexical_hits, self.lexical_min_coverage, self.lexical_decisive_ratio
+        ):
+            record_retrieval("lexical")
+            docs = _unique_faqs([doc for doc, _, _ in lexical_hits])
+            # Vektör skoru yok; soru kayıtlı SSS sorusuyla birebir aynıysa tam eşleşme sayılır
+            top_question = docs[0].metadata.get("question")
+            if top_question and normalize_text(top_question) == normalize_text(original_message or question):
+                return RetrievalResult(docs=docs, top_match=docs[0], top_score=1.0)
+            return RetrievalResult(docs=docs)
+        
+        vector_store = (await self.pipelines.aget(user_id)).vector_store
+        search_kwargs = {"filter": {"language": language}} if language else {}
+        scored = await self._vector_call(
+            lambda: vector_store.asimilarity_search_with_score(question, k=self.retrieval_k, **search_kwargs)
+        )
+        return self._retrieval_result(scored, lexical_hits)
+    
+    async def _retrieve_in_language(self, message: str, user_id: str, language: str) -> Optional[RetrievalResult]:
+        """
+        Ham mesajla yalnızca kullanıcının dilindeki SSS kayıtlarında arar
+        
+        SSS'ler o dilde yazıldıysa ya da ingest'te o dile çevrildiyse çeviri
+        gerekmez. Yalnızca bir kısmının o dilde kaydı varsa bu arama diğer
+        dillerdeki SSS'leri gizler; sonuç ancak doğrudan cevap kadar yakınsa
+        kullanılır. Aksi halde None döner ve soru tüm kayıtlarda aranır.
+        """
+        coverage = (await self._language_coverage(user_id)).get(language, 0.0)
+        if coverage == 0:
+            return None
+        retrieval = await self._retrieve(message, user_id, original_message=message, language=language)
+        return retrieval if self._native_retrieval_usable(retrieval, coverage) else None
+    
+    def _native_retrieval_usable(self, retrieval: RetrievalResult, coverage: float) -> bool:
+        """Dil filtreli sonuç tek başına yeterli mi? (tüm SSS'ler o dilde ya da doğrudan eşleşme)"""
+        if not retrieval.docs:
+            return False
+        return coverage >= 1.0 or self._direct_match(retrieval) is not None
+    
+    async def _language_coverage(self, user_id: str) -> Dict[str, float]:
+        """
+        Her dil için namespace'teki SSS'lerin o dilde kaydı olanlarının oranı
+        
+        Kaynak kayıtların dili ve ingest'te çevrildikleri diller sayılır.
+        Sonuç pipeline'da saklanır; bu süreç, yerel indeksi paylaşan başka bir
+        süreç ya da (paylaşımlı önbellekle) başka bir worker namespace'e
+        yazınca yeniden hesaplanır. Çevirisiz arama kapalıysa boş döner.
+        """
+        if not self.native_retrieval_enabled:
+            return {}
+        # peek: bu bakım aramasının pipeline önbellek istatistiklerini şişirmemesi için
+        pipeline = self.pipelines.peek(user_id) or await self.pipelines.aget(user_id)
+        if self._lexical_index_complete():
+            external = self.local_index.namespace(user_id).version
+        else:
+            external = await self._check_generation(user_id)
+        version = (pipeline.writes, external)
+        if pipeline.language_coverage is not None and pipeline.coverage_version == version:
+            return pipeline.language_coverage
+        
+        records = await self._stored_metadata(user_id)
+        sources = [metadata for doc_id, metadata in records.items() if not is_variant(doc_id)]
+        counts = Counter(
+            language
+            for metadata in sources
+            for language in {metadata.get("language"), *(metadata.get("languages") or [])}
+            if language
+        )
+        coverage = {language: count / len(sources) for language, count in counts.items()}
+        pipeline.language_coverage, pipeline.coverage_version = coverage, version
+        return coverage
+    
+    def _retrieval_result(
+        self,
+        scored: List[Tuple[Document, float]],
+        lexical_hits: List[Tuple[Document, float, float]]
+    ) -> RetrievalResult:
+        """Skorlu vektör sonuçlarını sözcüksel sonuçlarla birleştirir; en yakın SSS'yi ayrıca saklar"""
+        docs = _unique_faqs(self._fuse_lexical([doc for doc, _ in scored], lexical_hits))
+        dense_scores = {doc.page_content: score for doc, score in scored}
+        scores = [dense_scores.get(doc.page_content) for doc in docs]
+        if not scored:
+            return RetrievalResult(docs=docs, scores=scores)
+        top_match, top_score = scored[0]
+        return RetrievalResult(docs=docs, top_match=top_match, top_score=top_score, scores=scores)
+    
+    def _direct_match(self, retrieval: RetrievalResult) -> Optional[Document]:
+        """En yakın SSS, kayıtlı cevabı doğrudan dönecek kadar benzer mi? (DIRECT_ANSWER_THRESHOLD)"""
+        if self.direct_answer_threshold <= 0 or retrieval.top_score is None:
+            return None
+        if retrieval.top_score < self.direct_answer_threshold or not retrieval.top_match.metadata.get("answer"):
+            return None
+        return retrieval.top_match
+    
+    async def _localize_answer(self, doc: Document, language: str) -> str:
+        """SSS'nin kayıtlı cevabını döndürür; cevap kullanıcının dilinde değilse çevirir"""
+        answer = doc.metadata["answer"]
+        answer_language = doc.metadata.get("language") or self._detect_language(answer)
+        if answer_language == language:
+            return answer
+        return await self._translate_to_language(answer, language)
+    
+    def _lexical_index_complete(self) -> bool:
+        """BM25 indeksi namespace'in tamamını mı içeriyor? (yalnızca diskten eşitlenen yerel backend'de)"""
+        return self.vector_backend == "local" and self.vector_store_factory is None and self.local_index is not None
+    
+    async def _lexical_index(self, user_id: str) -> Optional[BM25Index]:
+        """
+        Namespace'in BM25 indeksini döndürür (yoksa oluşturur)
+        
+        Yerel vektör backend'inde indeks diskteki dokümanlardan kurulur ve her
+        çağrıda diğer worker'ların yazdıklarıyla artımlı eşitlenir. Pinecone'da
+        saklanan kayıtlardan arka planda kurulur, sonra bu sürecin yazmalarıyla
+        güncellenir; kurulum bitene kadar None döner (yalnızca vektör araması).
+        Başka bir worker namespace'e yazınca (paylaşımlı generation değişince)
+        düşürülüp yeniden kurulur.
+        """
+        if not self.lexical_enabled:
+            return None
+        if not self._lexical_index_complete():
+            await self._check_generation(user_id)
+            lexical_index = self.lexical_indexes.get(user_id)
+            if lexical_index is None and user_id not in self._lexical_seeds:
+                pending = self._lexical_seeds[user_id] = []
+                task = asyncio.create_task(self._seed_lexical_index(user_id, pending))
+                self._seed_tasks.add(task)
+                task.add_done_callback(self._seed_tasks.discard)
+            return lexical_index
+        
+        cursor, reset, added, removed = self.local_index.namespace(user_id).changes_since(
+            self._lexical_cursors.get(user_id)
+        )
+        lexical_index = self.lexical_indexes.get(user_id)
+        if reset or lexical_index is None:
+            lexical_index = self.lexical_indexes[user_id] = BM25Index()
+        if added:
+            lexical_index.add([r[0] for r in added], [r[1] for r in added], [r[2] for r in added])
+        if removed:
+            lexical_index.delete(removed)
+        self._lexical_cursors[user_id] = cursor
+        return lexical_index
+    
+    async def _seed_lexical_index(self, user_id: str, pending: List[Callable[[BM25Index], None]]):
+        """BM25 indeksini namespace'te saklanan kayıtlardan kurar (Pinecone; arka plan task'ı)"""
+        try:
+            generation = await self._check_generation(user_id)
+            documents = await self._stored_documents(user_id)
+            lexical_index = BM25Index()
+            await asyncio.to_thread(
+                lexical_index.add,
+                list(documents),
+                [doc.page_content for doc in documents.values()],
+                [doc.metadata for doc in documents.values()]
             )
+            # Kurulum sürerken başka bir worker yazdıysa ya da kullanıcı düşürüldüyse bu kopya kullanılmaz
+            if await self._check_generation(user_id) != generation or self._lexical_seeds.get(user_id) is not pending:
+                return
+            # Bu süreçte kurulum sırasında yapılan yazmalar üzerine uygulanır (ekleme/silme tekrarlanabilir)
+            for apply in pending:
+                apply(lexical_index)
+            self.lexical_indexes[user_id] = lexical_index
+            print(f"Built lexical index for user {user_id} from {len(documents)} stored records")
+        except Exception as e:
+            print(f"Error building lexical index for user {user_id}: {str(e)}")
+        finally:
+            if self._lexical_seeds.get(user_id) is pending:
+                del self._lexical_seeds[user_id]
+    
+    async def _update_lexical_index(self, user_id: str, apply: Callable[[BM25Index], None]):
+        """
+        Bu sürecin yazmasını BM25 indeksine uygular
+        
+        Yerel backend'de indeks sonraki aramada diskten artımlı eşitlenir.
+        Pinecone'da indeks kuruluyorsa yazma kurulum bitince de uygulanır;
+        indeks yoksa sonraki kurulum kaydı zaten saklanmış olarak bulur.
+        """
+        if not self.lexical_enabled or self._lexical_index_complete():
+            return
+        await self._check_generation(user_id)
+        lexical_index = self.lexical_indexes.get(user_id)
+        if lexical_index is not None:
+            apply(lexical_index)
+        pending = self._lexical_seeds.get(user_id)
+        if pending is not None:
+            pending.append(apply)
+    
+    async def _check_generation(self, user_id: str) -> Optional[int]:
+        """
+        Paylaşımlı generation başka bir worker'ın yazmasıyla değiştiyse
+        namespace'in süreç içi durumunu (BM25 indeksi, semantik önbellek) düşürür
+        """
+        if not self.shared_cache:
+            return
+        generation = await self.shared_cache.ageneration(user_id)
+        seen = self._seen_generations.get(user_id)
+        if seen is not None and seen != generation:
+            self.lexical_indexes.pop(user_id, None)
+            if self.semantic_cache:
+                self.semantic_cache.invalidate(user_id)
+        self._seen_generations[user_id] = generation
+        return generation
+    
+    def _clear_lexical_indexes(self):
+        self.lexical_indexes.clear()
+        self._lexical_seeds.clear()
+        self._lexical_cursors.clear()
+        self._seen_generations.clear()
+    
+    async def _lexical_search(
+        self,
+        user_id: str,
+        question: str,
+        original_message: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> List[Tuple[Document, float, float]]:
+        """
+        Namespace'in BM25 indeksinde arar
+        
+        SSS'ler orijinal dillerinde indekslendiği için ham mesaj varsa o kullanılır;
+        çeviri anahtar kelimeleri (ör. "iade" -> "return") kaybettirebilir.
+        """
+        lexical_index = await self._lexical_index(user_id)
+        if lexical_index is None:
+            return []
+        return lexical_index.search(original_message or question, k=self.retrieval_k, language=language)
+    
+    def _fuse_lexical(
+        self,
+        dense_docs: List[Document],
+        lexical_hits: List[Tuple[Document, float, float]]
+    ) -> List[Document]:
+        """Vektör sonuçlarını sözcüksel sonuçlarla RRF üzerinden birleştirir"""
+        if not lexical_hits:
+            record_retrieval("dense")
+            return dense_docs
+        record_retrieval("hybrid")
+        return reciprocal_rank_fusion([dense_docs, [doc for doc, _, _ in lexical_hits]], self.retrieval_k)
+    
+    def _build_context(self, retrieval: RetrievalResult) -> str:
+        """Getirilen SSS'lerden token bütçesine sığan prompt bağlamını oluşturur"""
+        context = self.context_builder.build(retrieval.docs, retrieval.scores)
+        record_context(context.tokens, len(context.docs), context.trimmed, context.dropped)
+        return context.text
+    
+    def _multilingual_input(self, retrieval: RetrievalResult, question: str, language: str) -> Dict[str, str]:
+        return {
+            "context": self._build_context(retrieval),
+            "question": question,
+            "language": LANGUAGE_NAMES.get(language, language)
+        }
+    
+    async def query_batch(self, queries: List[QueryRequest]) -> List[BatchQueryItem]:
+        """
+        Birden fazla soruyu birlikte işler; embedding, retrieval ve üretim
+        maliyetlerini sorular arasında paylaştırır
+        
+        Tüm mesajlar tek bir batch embedding çağrısıyla vektöre çevrilir,
+        retrieval namespace başına eşzamanlı çalışır ve üretim/çeviri çağrıları
+        BATCH_MAX_CONCURRENCY ile sınırlı paralellikte yapılır.
+        
+        Args:
+            queries: Soru listesi (her biri kendi user_id'sine sahip olabilir)
             
-            # 5. İngilizce cevabı al
-            english_answer = rag_chain.invoke(english_question)
-            
-            # 6. Cevabı orijinal dile çevir (eğer gerekiyorsa)
-            if original_language != "en":
-                final_answer = await self._translate_to_language(english_answer, original_language)
-            else:
-                final_answer = english_answer
+        Returns:
+            List[BatchQueryItem]: İstek sırasıyla sonuçlar; başarısız sorular için error dolu
+        """
+        results = [BatchQueryItem(index=i) for i in range(len(queries))]
+        
+        # Development mode check
+        if not self.llm or not self.embeddings or not self._vector_store_ready():
+            print("⚠️ Running in development mode - batch query simulated")
+            for item, q in zip(results, queries):
+                item.answer = self._development_answer(q.message, q.user_id)
+                item.path = PATH_DEVELOPMENT
+            return results
+        
+        limit = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+        
+        def fail(i: int, error: BaseException):
+            print(f"Error in batch query item {i}: {str(error)}")
+            results[i].error = str(error) or type(error).__name__
+        
+        for item, q in zip(results, queries):
+            item.language = self._detect_language(q.message, q.language)
+        pending = list(range(len(queries)))
+        for user_id in {q.user_id for q in queries}:
+            await self._check_generation(user_id)
+        
+        # Diğer worker'larda aynı soru cevaplandıysa paylaşımlı önbellekten al
+        shared_keys: Dict[int, str] = {}
+        if self.shared_cache:
+            remaining = []
+            for i in pending:
+                shared_keys[i] = await self._shared_answer_key(queries[i].user_id, results[i].language, queries[i].message)
+                cached = await self.shared_cache.aget_text(KIND_ANSWER, shared_keys[i])
+                record_cache_lookup("shared_answer", cached is not None)
+                if cached is not None:
+                    results[i].answer = cached
+                    results[i].path = PATH_CACHE
+                else:
+                    remaining.append(i)
+            pending = remaining
+        
+        try:
+            # 1. Tüm mesajlar için tek embedding çağrısı ve semantik önbellek kontrolü
+            message_vectors = None
+            generations = [0] * len(queries)
+            if self.semantic_cache and pending:
+                generations = [self.semantic_cache.generation(q.user_id) for q in queries]
+                message_vectors = dict(zip(pending, await self.llm_limiter.run(
+                    self.embeddings.aembed_documents([queries[i].message for i in pending])
+                )))
+                remaining = []
+                for i in pending:
+                    cached = self.semantic_cache.lookup(queries[i].user_id, message_vectors[i], results[i].language)
+                    record_cache_lookup("semantic", cached is not None)
+                    if cached is not None:
+                        results[i].answer = cached
+                        results[i].path = PATH_CACHE
+                    else:
+                        remaining.append(i)
+                pending = remaining
             
-            return final_answer
+            # 2. Kullanıcının dilinde SSS kaydı olabilecek soruların ham mesaj vektörleri
+            #    (semantik önbellek için hesaplandıysa yeniden kullanılır)
+            tenants = list({queries[i].user_id for i in pending})
+            coverages = dict(zip(tenants, await asyncio.gather(*(self._language_coverage(t) for t in tenants))))
+            candidates = [i for i in pending if coverages[queries[i].user_id].get(results[i].language, 0.0) > 0]
+            raw_vectors: Dict[int, List[float]] = dict(message_vectors or {})
+            to_embed = [i for i in candidates if i not in raw_vectors]
+            if to_embed:
+                embedded = await self.llm_limiter.run(
+                    self.embeddings.aembed_documents([queries[i].message for i in to_embed])
+                )
+                raw_vectors.update(zip(to_embed, embedded))
+        except Exception as e:
+            for i in pending:
+                fail(i, e)
+            return results
+        
+        retrievals: Dict[int, RetrievalResult] = {}
+        direct_matches: Dict[int, Document] = {}
+        
+        async def retrieve(indexes: List[int], vectors: Dict[int, List[float]], questions: Dict[int, str], native: bool):
+            """Namespace (native ise namespace ve dil) başına eşzamanlı retrieval"""
+            groups: Dict[Tuple[str, Optional[str]], List[int]] = {}
+            for i in indexes:
+                groups.setdefault((queries[i].user_id, results[i].language if native else None), []).append(i)
+            retrieved = await asyncio.gather(
+                *(
+                    self._retrieve_by_vectors(user_id, [vectors[i] for i in group], language)
+                    for (user_id, language), group in groups.items()
+                ),
+                return_exceptions=True
+            )
+            for ((user_id, language), group), namespace_hits in zip(groups.items(), retrieved):
+                for position, i in enumerate(group):
+                    if isinstance(namespace_hits, BaseException):
+                        fail(i, namespace_hits)
+                        continue
+                    lexical_hits = await self._lexical_search(user_id, questions[i], queries[i].message, language)
+                    retrieval = self._retrieval_result(namespace_hits[position], lexical_hits)
+                    if native and not self._native_retrieval_usable(retrieval, coverages[user_id].get(language, 0.0)):
+                        # Dil filtresi diğer dillerdeki SSS'leri gizlerdi: soru tüm kayıtlarda aranır
+                        continue
+                    retrievals[i] = retrieval
+                    direct_match = self._direct_match(retrieval)
+                    if direct_match is not None:
+                        direct_matches[i] = direct_match
+        
+        # 3. Bu sorular ham mesajla, yalnızca kullanıcının dilindeki kayıtlarda aranır
+        messages = {i: queries[i].message for i in pending}
+        await retrieve(candidates, raw_vectors, messages, native=True)
+        native = {i for i in candidates if i in retrievals}
+        rest = [i for i in pending if results[i].error is None and i not in native]
+        
+        question_vectors: Dict[int, List[float]] = {}
+        try:
+            # 4. Kalanlar için retrieval sorusu: multilingual modda ham mesaj, aksi halde İngilizce çevirisi
+            questions = dict(messages)
+            translate = self.pipeline_mode != "multilingual"
+            if translate:
+                to_translate = [i for i in rest if results[i].language != "en"]
+                translated = await _gather_bounded(
+                    [lambda i=i: self._translate_to_english(queries[i].message) for i in to_translate], limit
+                )
+                for i, text in zip(to_translate, translated):
+                    if isinstance(text, BaseException):
+                        fail(i, text)
+                    else:
+                        questions[i] = text
+                rest = [i for i in rest if results[i].error is None]
             
+            # Retrieval soruları için tek batch embedding çağrısı (mesajla aynıysa yeniden kullanılır)
+            question_vectors.update(
+                (i, raw_vectors[i]) for i in rest if i in raw_vectors and questions[i] == queries[i].message
+            )
+            to_embed = [i for i in rest if i not in question_vectors]
+            if to_embed:
+                embedded = await self.llm_limiter.run(
+                    self.embeddings.aembed_documents([questions[i] for i in to_embed])
+                )
+                question_vectors.update(zip(to_embed, embedded))
         except Exception as e:
-            print(f"Error in query: {str(e)}")
-            return "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."
+            for i in rest:
+                fail(i, e)
+            rest = []
+        
+        await retrieve(rest, question_vectors, questions, native=False)
+        pending = [i for i in pending if results[i].error is None]
+        
+        # 5. Kayıtlı SSS cevabı yeterince yakın olanlar hariç sınırlı paralellikle üretim
+        #    (kullanıcının dilinde getirilenler ve multilingual mod: tek çağrıda o dilde cevap)
+        to_generate = [i for i in pending if i not in direct_matches]
+        inputs = {}
+        for i in to_generate:
+            if i in native or not translate:
+                inputs[i] = (self.multilingual_chain, self._multilingual_input(retrievals[i], questions[i], results[i].language))
+            else:
+                inputs[i] = (self.rag_chain, {"context": self._build_context(retrievals[i]), "question": questions[i]})
+        answers = await _gather_bounded(
+            [lambda i=i: self.llm_limiter.run(inputs[i][0].ainvoke(inputs[i][1])) for i in to_generate], limit
+        )
+        
+        # 6. Gerekirse cevapları kullanıcının diline çevir
+        needs_translation = []
+        for i, answer in zip(to_generate, answers):
+            if isinstance(answer, BaseException):
+                fail(i, answer)
+                continue
+            results[i].answer = answer
+            results[i].path = PATH_RAG
+            if translate and i not in native and results[i].language != "en":
+                needs_translation.append(i)
+        localized = await _gather_bounded(
+            [lambda i=i: self._localize_answer(direct_matches[i], results[i].language) for i in direct_matches],
+            limit
+        )
+        for i, answer in zip(direct_matches, localized):
+            if isinstance(answer, BaseException):
+                fail(i, answer)
+            else:
+                results[i].answer = answer
+                results[i].path = PATH_DIRECT
+        translated = await _gather_bounded(
+            [lambda i=i: self._translate_to_language(results[i].answer, results[i].language) for i in needs_translation],
+            limit
+        )
+        for i, text in zip(needs_translation, translated):
+            if isinstance(text, BaseException):
+                fail(i, text)
+                results[i].answer = None
+            else:
+                results[i].answer = text
+        
+        for i in pending:
+            if results[i].error is not None:
+                continue
+            if message_vectors is not None:
+                self.semantic_cache.store(
+                    queries[i].user_id, message_vectors[i], results[i].answer, results[i].language,
+                    generation=generations[i]
+                )
+            if i in shared_keys:
+                await self.shared_cache.aput_text(
+                    KIND_ANSWER, shared_keys[i], results[i].answer, ttl_seconds=self.shared_answer_ttl
+                )
+        
+        return results
+    
+    async def _retrieve_by_vectors(
+        self,
+        user_id: str,
+        vectors: List[List[float]],
+        language: Optional[str] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """Bir namespace için birden fazla sorgu vektörüyle (verilirse yalnızca o dilde) skorlu retrieval yapar"""
+        vector_store = (await self.pipelines.aget(user_id)).vector_store
+        search_filter = {"language": language} if language else None
+        if isinstance(vector_store, LocalVectorStore):
+            # Yerel indeks tüm sorguları tek NumPy çağrısında çözer
+            return await self._vector_thread_call(
+                vector_store.similarity_search_by_vectors_with_score, vectors, self.retrieval_k, search_filter
+            )
+        search_kwargs = {"filter": search_filter} if search_filter else {}
+        return await asyncio.gather(*(
+            self._vector_call(
+                lambda vector=vector: vector_store.asimilarity_search_by_vector_with_score(
+                    vector, k=self.retrieval_k, **search_kwargs
+                )
+            )
+            for vector in vectors
+        ))
+    
+    async def _vector_call(self, call: Callable[[], Awaitable[Any]], hedge: bool = True) -> Any:
+        """
+        Vektör store çağrısını eşzamanlılık sınırı ve CallPolicy (süre sınırı, yeniden
+        deneme, HTTP_HEDGE_ENABLED ise okumalarda hedge) altında yapar
+        
+        Args:
+            call: Her denemede yeni coroutine üreten fonksiyon
+            hedge: Çağrı tekrarlanabilir bir okuma mı (yazmalar hedge edilmez)
+        """
+        return await self.vector_limiter.run(self.vector_policy.run(call, hedge=self._vector_hedge(hedge)))
+    
+    async def _vector_thread_call(self, func: Callable[..., Any], *args: Any, hedge: bool = True, **kwargs: Any) -> Any:
+        """
+        Senkron vektör store çağrısını thread'de, _vector_call ile aynı politika altında yapar
+        
+        Süre sınırına takılan ya da hedge'i kaybeden thread iptal edilemez ve
+        çalışmaya devam eder. Bu yüzden slot politikanın tamamı için değil her
+        deneme için alınır ve thread bitene kadar bırakılmaz; uçuştaki gerçek
+        çağrı sayısı VECTOR_MAX_CONCURRENCY'yi aşmaz.
+        
+        Args:
+            func: Thread'de çalışacak senkron fonksiyon
+            *args, **kwargs: Fonksiyonun argümanları
+            hedge: Çağrı tekrarlanabilir bir okuma mı (yazmalar hedge edilmez)
+        """
+        return await self.vector_policy.run(
+            lambda: self.vector_limiter.run_in_thread(func, *args, **kwargs), hedge=self._vector_hedge(hedge)
+        )
+    
+    def _vector_hedge(self, hedge: bool) -> Optional[bool]:
+        """CallPolicy'ye verilecek hedge ayarı (None: HTTP_HEDGE_ENABLED)"""
+        # Süreç içi yerel indekste hedge yalnızca CPU harcar
+        local = self.vector_backend == "local" and self.vector_store_factory is None
+        return None if hedge and not local else False
     
     async def _translate_to_english(self, text: str) -> str:
         """Metni İngilizce'ye çevirir"""
         try:
-            if not self.llm:
-                return text
-                
-            translation_prompt = ChatPromptTemplate.from_template(
-                "Translate the following text to English. Only return the translation, nothing else:\n\n{text}"
-            )
-            
-            chain = translation_prompt | self.llm | StrOutputParser()
-            return chain.invoke({"text": text})
-            
+            return await self._translate(text, "en")
         except Exception as e:
             print(f"Translation to English failed: {str(e)}")
             return text  # Çeviri başarısız ise orijinal metni döndür
@@ -257,33 +1787,26 @@ Cevap:""")
     async def _translate_to_language(self, text: str, target_language: str) -> str:
         """Metni hedef dile çevirir"""
         try:
-            if not self.llm:
-                return text
-                
-            # Dil kodlarını tam isimlere çevir
-            language_names = {
-                "tr": "Turkish",
-                "es": "Spanish", 
-                "fr": "French",
-                "de": "German",
-                "it": "Italian",
-                "pt": "Portuguese",
-                "ru": "Russian",
-                "ar": "Arabic",
-                "zh": "Chinese",
-                "ja": "Japanese",
-                "ko": "Korean"
-            }
-            
-            target_lang_name = language_names.get(target_language, target_language)
-            
-            translation_prompt = ChatPromptTemplate.from_template(
-                f"Translate the following text to {target_lang_name}. Only return the translation, nothing else:\n\n{{text}}"
-            )
-            
-            chain = translation_prompt | self.llm | StrOutputParser()
-            return chain.invoke({"text": text})
-            
+            return await self._translate(text, target_language)
         except Exception as e:
             print(f"Translation to {target_language} failed: {str(e)}")
             return text  # Çeviri başarısız ise orijinal metni döndür
+    
+    async def _translate(self, text: str, target_language: str) -> str:
+        """Metni çeviri önbelleği üzerinden hedef dile çevirir; hata çağırana iletilir"""
+        if not self.llm:
+            return text
+        
+        cached = await self.translation_cache.aget(text, target_language)
+        record_cache_lookup("translation", cached is not None)
+        if cached is not None:
+            return cached
+        
+        # Dil kodlarını tam isimlere çevir
+        target_lang_name = LANGUAGE_NAMES.get(target_language, target_language)
+        
+        translation = await self.llm_limiter.run(
+            self.translation_chain.ainvoke({"language": target_lang_name, "text": text})
+        )
+        await self.translation_cache.aput(text, target_language, translation)
+        return translation
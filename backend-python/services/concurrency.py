@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class ConcurrencyLimiter:
+    """
+    Aynı anda uçuşta olan dış çağrıların (LLM, vektör store) sayısını sınırlar.
+
+    Sınır doluyken gelen çağrılar event loop'u bloklamadan FIFO sırasıyla
+    kuyrukta bekler; böylece tek bir yavaş çağrı diğer istekleri durdurmaz.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.peak_waiting = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Blok süresince bir slot tutar (ör. akış halindeki LLM cevapları için)
+        """
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Çağrıyı bir slot boşaldığında çalıştırır
+
+        Args:
+            awaitable: Çalıştırılacak coroutine
+
+        Returns:
+            Coroutine'in sonucu
+        """
+        try:
+            async with self.slot():
+                return await awaitable
+        finally:
+            # Slot beklerken iptal edildiyse coroutine hiç çalışmamış olabilir
+            if inspect.iscoroutine(awaitable) and inspect.getcoroutinestate(awaitable) == inspect.CORO_CREATED:
+                awaitable.close()
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Senkron çağrıyı bir slot tutarak thread'de çalıştırır
+
+        Bekleyen coroutine iptal edilse de (süre sınırı, kaybeden hedge) thread
+        durdurulamaz; slot bu yüzden thread bitene kadar tutulur ve thread'de
+        gerçekten çalışan çağrı sayısı sınırı aşmaz.
+
+        Args:
+            func: Çalıştırılacak senkron fonksiyon
+            *args, **kwargs: Fonksiyonun argümanları
+
+        Returns:
+            Fonksiyonun sonucu
+        """
+        await self._acquire()
+        try:
+            context = contextvars.copy_context()
+            future = asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(context.run, func, *args, **kwargs)
+            )
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release_thread)
+        return await asyncio.shield(future)
+
+    async def _acquire(self):
+        queued = self._semaphore.locked()
+        if queued:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            if queued:
+                self.waiting -= 1
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self.completed += 1
+        self._semaphore.release()
+
+    def _release_thread(self, future: "asyncio.Future[Any]"):
+        self._release()
+        # Bekleyen taraf iptal edildiyse hata kimse tarafından okunmaz; uyarı basılmasın
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Anlık kuyruk ve uçuştaki çağrı sayıları"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "completed": self.completed,
+        }
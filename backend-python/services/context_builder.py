@@ -0,0 +1,168 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from langchain_core.documents import Document
+
+from services.lexical_index import tokenize
+
+# tiktoken yüklenemezse kullanılan yaklaşık karakter/token oranı (Türkçe için temkinli)
+CHARS_PER_TOKEN = 3.5
+
+# Doküman bütçeye sığmıyorsa en az bu kadar token kalıyorsa kırpılarak eklenir
+MIN_TRIMMED_TOKENS = 64
+
+# Kırpılan dokümanın sonuna eklenen işaret
+TRIM_MARKER = " …"
+
+# Dokümanlar arasındaki ayırıcı
+SEPARATOR = "\n\n"
+
+
+class TokenCounter:
+    """
+    Model tokenizer'ıyla (tiktoken) token sayar ve metin kırpar.
+
+    tiktoken kodlaması ilk kullanımda internetten indirilebildiği için
+    istek yolunda değil, `load` ile başlatma sırasında yüklenir. Yüklenemezse
+    karakter sayısından tahmin yapılır.
+    """
+
+    def __init__(self):
+        self._encoding = None
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def load(self, model: str):
+        """Modelin tokenizer'ını yükler (hata verirse tahmine devam edilir)"""
+        import tiktoken
+
+        self._encoding = tiktoken.encoding_for_model(model)
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Metni en fazla `max_tokens` token olacak şekilde keser (kelime ortasından bölmez)"""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            cut = self._encoding.decode(tokens[:max_tokens])
+        else:
+            limit = int(max_tokens * CHARS_PER_TOKEN)
+            if len(text) <= limit:
+                return text
+            cut = text[:limit]
+        if " " in cut:
+            cut = cut.rsplit(" ", 1)[0]
+        return cut.rstrip() + TRIM_MARKER
+
+
+@dataclass
+class AssembledContext:
+    """Prompt'a girecek bağlam ve seçim istatistikleri"""
+    text: str
+    docs: List[Document]
+    tokens: int
+    dropped: Dict[str, int] = field(default_factory=dict)  # neden -> atlanan doküman sayısı
+    trimmed: int = 0
+
+
+class ContextBuilder:
+    """
+    Getirilen SSS'lerden token bütçesine sığan prompt bağlamını oluşturur.
+
+    Dokümanlar retrieval sırasıyla değerlendirilir:
+    - k uyarlanır: en iyi eşleşmeden `score_gap`'ten fazla düşük skorlu
+      dokümanlar alınmaz (alakasız bağlam yerine daha kısa prompt)
+    - Önceden seçilmiş bir SSS'ye kelime kümesi olarak `duplicate_threshold`
+      kadar benzeyenler atlanır (aynı SSS'nin kopyaları, yeniden ingest)
+    - `max_doc_tokens`'tan uzun dokümanlar kırpılır
+    - Toplam `max_tokens` aşılmaz; kısa SSS'lerde bütçe daha fazla dokümana yeter
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 1200,
+        max_doc_tokens: int = 400,
+        max_docs: int = 5,
+        score_gap: float = 0.1,
+        duplicate_threshold: float = 0.85,
+        counter: Optional[TokenCounter] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.max_doc_tokens = max_doc_tokens
+        self.max_docs = max_docs
+        self.score_gap = score_gap
+        self.duplicate_threshold = duplicate_threshold
+        self.counter = counter or TokenCounter()
+
+    def build(self, docs: List[Document], scores: Optional[List[Optional[float]]] = None) -> AssembledContext:
+        """
+        Bağlamı oluşturur
+
+        Args:
+            docs: Retrieval sırasıyla dokümanlar
+            scores: Dokümanların vektör benzerlik skorları (yalnızca sözcüksel
+                eşleşen dokümanlar için None)
+
+        Returns:
+            AssembledContext: Bağlam metni, seçilen dokümanlar ve token sayısı
+        """
+        scores = scores or [None] * len(docs)
+        top_score = next((score for score in scores if score is not None), None)
+        selected: List[Document] = []
+        parts: List[str] = []
+        term_sets: List[Set[str]] = []
+        dropped: Dict[str, int] = {}
+        trimmed = 0
+        used = 0
+
+        def drop(reason: str):
+            dropped[reason] = dropped.get(reason, 0) + 1
+
+        for doc, score in zip(docs, scores):
+            if len(selected) >= self.max_docs:
+                drop("max_docs")
+                continue
+            if selected and score is not None and top_score is not None and top_score - score > self.score_gap:
+                drop("low_score")
+                continue
+            terms = set(tokenize(doc.page_content))
+            if any(_jaccard(terms, other) >= self.duplicate_threshold for other in term_sets):
+                drop("duplicate")
+                continue
+
+            text = doc.page_content
+            tokens = self.counter.count(text)
+            if tokens > self.max_doc_tokens:
+                text = self.counter.truncate(text, self.max_doc_tokens)
+                tokens = self.counter.count(text)
+                trimmed += 1
+            remaining = self.max_tokens - used
+            if tokens > remaining:
+                if remaining < MIN_TRIMMED_TOKENS:
+                    drop("budget")
+                    continue
+                text = self.counter.truncate(text, remaining)
+                tokens = self.counter.count(text)
+                trimmed += 1
+
+            selected.append(doc)
+            parts.append(text)
+            term_sets.append(terms)
+            used += tokens
+
+        text = SEPARATOR.join(parts)
+        return AssembledContext(text=text, docs=selected, tokens=used, dropped=dropped, trimmed=trimmed)
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
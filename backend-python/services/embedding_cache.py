@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl  # Aynı dizini paylaşan worker süreçleri arasında yazma kilidi
+except ImportError:  # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+# Metin anahtarı: blake2b özeti (çakışma olasılığı ihmal edilebilir, sabit 16 bayt)
+KEY_BYTES = 16
+
+# Boyut sınırı aşıldığında en son kullanılanlar bu orana inene kadar tutulur
+COMPACT_TARGET_RATIO = 0.75
+
+DTYPES = {"float16": np.float16, "float32": np.float32}
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    """
+    Tek bir embedding modeli için kalıcı, içerik adresli vektör önbelleği.
+
+    Kayıtlar `<root_dir>/<model>/embeddings.bin` dosyasında sabit uzunluklu
+    [16 bayt metin özeti][vektör] satırları olarak tutulur; dosya
+    memory-mapped okunur, yeni kayıtlar sona eklenir. Aynı dizini kullanan
+    worker süreçleri dosya kilidiyle ekleme yapar ve birbirlerinin yazdığı
+    kayıtları bir sonraki ıskada görür.
+
+    Dosya `max_bytes`'ı aşınca en uzun süredir kullanılmayan kayıtlar atılarak
+    yeni bir dosyaya yazılır ve atomik olarak değiştirilir.
+    """
+
+    def __init__(self, root_dir: str, model: str, max_bytes: int = 512 * 1024 * 1024, dtype: str = "float16"):
+        self.path = os.path.join(root_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+        self.model = model
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._rows: Dict[bytes, int] = {}
+        self._records: Optional[np.memmap] = None
+        self._loaded_rows = 0
+        self._inode: Optional[int] = None
+        self._last_access = np.zeros(0, dtype=np.float64)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._load_meta()
+
+    @property
+    def _data_file(self) -> str:
+        return os.path.join(self.path, "embeddings.bin")
+
+    @property
+    def _meta_file(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def _lock_file(self) -> str:
+        return os.path.join(self.path, "lock")
+
+    @property
+    def _record_dtype(self) -> np.dtype:
+        return np.dtype([("key", f"V{KEY_BYTES}"), ("vector", DTYPES[self.dtype], (self.dim,))])
+
+    def _load_meta(self):
+        if os.path.exists(self._meta_file):
+            with open(self._meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.dtype = meta["dtype"]  # Dosya hangi tiple yazıldıysa o kullanılır
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Önbellekteki vektörleri döndürür
+
+        Returns:
+            List[Optional[List[float]]]: Metin sırasıyla vektörler (yoksa None)
+        """
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._refresh()  # Başka bir worker eklemiş olabilir
+            now = time.time()
+            vectors: List[Optional[List[float]]] = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    vectors.append(None)
+                    continue
+                self.hits += 1
+                self._last_access[row] = now
+                vectors.append(np.asarray(self._records[row]["vector"], dtype=np.float32).tolist())
+            return vectors
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """Yeni vektörleri dosyanın sonuna ekler (zaten kayıtlı olanlar atlanır)"""
+        if not texts:
+            return
+        with self._lock, self._file_lock():
+            self._refresh()
+            pending: Dict[bytes, List[float]] = {}
+            for text, vector in zip(texts, vectors):
+                key = text_key(text)
+                if key not in self._rows:
+                    pending[key] = vector
+            if not pending:
+                return
+            matrix = np.asarray(list(pending.values()), dtype=np.float32)
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                with open(self._meta_file, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model, "dim": self.dim, "dtype": self.dtype}, f)
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension mismatch: expected {self.dim}, got {matrix.shape[1]}")
+
+            records = np.empty(len(pending), dtype=self._record_dtype)
+            records["key"] = [np.void(key) for key in pending]
+            records["vector"] = matrix
+            with open(self._data_file, "ab") as f:
+                # Yarım kalmış bir önceki yazma varsa kesilir ki satırlar hizalı kalsın
+                f.truncate(self._loaded_rows * self._record_dtype.itemsize)
+                f.write(records.tobytes())
+            self._refresh()
+
+            if os.path.getsize(self._data_file) > self.max_bytes:
+                self._compact()
+
+    def _refresh(self):
+        """Dosyaya eklenen (veya sıkıştırmayla değişen) kayıtları belleğe alır"""
+        try:
+            stat = os.stat(self._data_file)
+        except FileNotFoundError:
+            return
+        if self.dim is None:
+            self._load_meta()
+            if self.dim is None:
+                return
+        if stat.st_ino != self._inode:
+            # Dosya başka bir süreçte sıkıştırıldı: baştan yükle
+            self._inode = stat.st_ino
+            self._rows = {}
+            self._loaded_rows = 0
+            self._last_access = np.zeros(0, dtype=np.float64)
+        rows = stat.st_size // self._record_dtype.itemsize
+        if rows <= self._loaded_rows and self._records is not None:
+            return
+        self._records = np.memmap(self._data_file, dtype=self._record_dtype, mode="r", shape=(rows,)) if rows else None
+        if rows > self._loaded_rows:
+            for row, key in enumerate(self._records["key"][self._loaded_rows:rows], start=self._loaded_rows):
+                self._rows[key.tobytes()] = row
+            # Yeni satırlar şimdi kullanılmış sayılır (ingest'te yazılıp henüz okunmamış vektörler ilk atılmasın);
+            # aralarında dosya sırası korunur
+            fresh = time.time() + np.arange(rows - self._loaded_rows) * 1e-9
+            self._last_access = np.concatenate([self._last_access, fresh])
+            self._loaded_rows = rows
+
+    def _compact(self):
+        """En son kullanılan kayıtları hedef boyuta kadar tutarak dosyayı yeniden yazar"""
+        keep_rows = int(self.max_bytes * COMPACT_TARGET_RATIO) // self._record_dtype.itemsize
+        keep = np.sort(np.argsort(-self._last_access)[:keep_rows])
+        tmp_file = self._data_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(np.ascontiguousarray(self._records[keep]).tobytes())
+        last_access = self._last_access[keep]
+        self.evictions += self._loaded_rows - len(keep)
+        self._records = None
+        os.replace(tmp_file, self._data_file)
+        self._inode = None
+        self._refresh()
+        self._last_access = last_access
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = os.path.getsize(self._data_file) if os.path.exists(self._data_file) else 0
+            return {
+                "entries": len(self._rows),
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedding'leri EmbeddingCache'ten okuyan, yalnızca eksikleri hesaplatan sarmalayıcı.
+
+    Ingest'te değişmeyen SSS'ler ve sorgu yolunda tekrarlanan sorular için
+    API çağrısı yapılmaz.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            self.cache.put_many([texts[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Iskada dosya yeniden okunur; memmap okumaları da event loop'u bloklamasın
+        vectors = await asyncio.to_thread(self.cache.get_many, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = await self.embeddings.aembed_documents([texts[i] for i in missing])
+            # Dosya kilidi ve yazma event loop'u bloklamasın
+            await asyncio.to_thread(self.cache.put_many, [texts[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vector = (await asyncio.to_thread(self.cache.get_many, [text]))[0]
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self.cache.put_many, [text], [vector])
+        return vector
@@ -0,0 +1,115 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from models import FAQ
+from services.translation_cache import normalize_text
+
+# Türetilmiş SSS id'lerinin öneki (istemcinin verdiği id'lerden ayırt etmek için)
+FAQ_ID_PREFIX = "faq_"
+
+# Çeviri varyantlarının id ayracı: "<faq_id>#<dil>" (FAQ.id deseninde "#" geçemez)
+VARIANT_SEPARATOR = "#"
+
+
+def faq_id(faq: FAQ) -> str:
+    """
+    SSS'nin kalıcı id'si
+
+    İstemci id verdiyse o kullanılır; yoksa normalize edilmiş sorudan
+    türetilir. Böylece cevabı düzenlenen SSS aynı vektörün üzerine yazılır,
+    katalogdaki sırası değişse de id'si değişmez.
+    """
+    if faq.id:
+        return faq.id
+    digest = hashlib.blake2b(normalize_text(faq.question).encode("utf-8"), digest_size=8).hexdigest()
+    return f"{FAQ_ID_PREFIX}{digest}"
+
+
+def variant_id(doc_id: str, language: str) -> str:
+    """SSS'nin ingest sırasında çevrilmiş dil varyantının kayıt id'si"""
+    return f"{doc_id}{VARIANT_SEPARATOR}{language}"
+
+
+def is_variant(doc_id: str) -> bool:
+    return VARIANT_SEPARATOR in doc_id
+
+
+def content_hash(faq: FAQ) -> str:
+    """Soru ve cevabın özeti; saklanan SSS'nin değişip değişmediğini gösterir"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(faq.question.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(faq.answer.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def dedupe_faqs(faqs: List[FAQ]) -> List[FAQ]:
+    """Aynı id'li SSS'lerden sonuncusunu tutar (ilk görüldüğü sırayla)"""
+    by_id: Dict[str, FAQ] = {}
+    for faq in faqs:
+        by_id[faq_id(faq)] = faq
+    return list(by_id.values())
+
+
+@dataclass
+class FAQChangeSet:
+    """Bir kataloğun saklanan SSS'lere göre farkı"""
+    added: List[FAQ] = field(default_factory=list)
+    updated: List[FAQ] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def to_write(self) -> List[FAQ]:
+        """Embed edilip yazılması gereken SSS'ler"""
+        return self.added + self.updated
+
+    @property
+    def empty(self) -> bool:
+        return not self.added and not self.updated and not self.deleted
+
+
+def diff_catalog(
+    stored: Dict[str, Optional[str]],
+    faqs: List[FAQ],
+    delete_missing: bool = True
+) -> FAQChangeSet:
+    """
+    Kataloğu saklanan SSS'lerle karşılaştırır
+
+    Args:
+        stored: Saklanan SSS id'leri -> içerik özeti (eski kayıtlarda None)
+        faqs: Yeni katalog (veya yalnızca güncellenecek SSS'ler)
+        delete_missing: Katalogda olmayan saklı SSS'ler silinsin mi (tam senkron)
+
+    Returns:
+        FAQChangeSet: Eklenecek, güncellenecek, değişmeyen ve silinecek SSS'ler
+    """
+    changes = FAQChangeSet()
+    seen = set()
+    for faq in dedupe_faqs(faqs):
+        doc_id = faq_id(faq)
+        seen.add(doc_id)
+        if doc_id not in stored:
+            changes.added.append(faq)
+        elif stored[doc_id] != content_hash(faq):
+            changes.updated.append(faq)
+        else:
+            changes.unchanged.append(doc_id)
+    if delete_missing:
+        changes.deleted = [doc_id for doc_id in stored if doc_id not in seen]
+    return changes
+
+
+@dataclass
+class FAQSyncResult:
+    """Bir SSS değişikliği isteğinin sonucu"""
+    changes: FAQChangeSet
+    failed: int = 0
+    error: Optional[str] = None
+    dry_run: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.failed == 0
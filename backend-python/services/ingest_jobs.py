@@ -0,0 +1,337 @@
+import asyncio
+import functools
+import json
+import os
+import re
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    import fcntl  # Aynı job dizinini paylaşan worker süreçleri arasında job sahipliği
+except ImportError:  # Windows: tek süreç varsayılır
+    fcntl = None
+
+from models import FAQ
+from services.faq_sync import dedupe_faqs
+from services.ingest_pipeline import IngestStats
+
+# Job durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_COMPLETED_WITH_ERRORS = "completed_with_errors"
+JOB_FAILED = "failed"
+
+# Servis yeniden başladığında kaldığı yerden devam ettirilecek durumlar
+RESUMABLE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Saklama süresi dolunca dosyaları silinebilecek durumlar
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_COMPLETED_WITH_ERRORS, JOB_FAILED)
+
+# Job id'leri uuid4 hex'tir; URL'den gelen id ile dosya yolu kurulmadan önce kontrol edilir
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# ingest_faqs(faqs, user_id, batch_size=..., skip_batches=..., on_batch_done=...)
+IngestRunner = Callable[..., Awaitable[IngestStats]]
+
+
+class IngestJobManager:
+    """
+    Arka planda çalışan, kaldığı yerden devam edebilen toplu ingest job'ları.
+
+    Her job'ın SSS listesi ve checkpoint'i `job_dir` altında saklanır.
+    Tamamlanan her batch checkpoint'e yazılır; servis yarıda kesilirse
+    job yeniden başlatıldığında yalnızca tamamlanmamış batch'ler embed edilir.
+
+    Dizini paylaşan worker süreçleri bir job'ı çalıştırmadan önce onun kilit
+    dosyasını alır (süreç ölünce kilit de bırakılır); böylece her job tek bir
+    worker'da çalışır. Başka bir worker'ın job'ının durumu diskteki
+    checkpoint'ten okunur. Biten job'ların dosyaları `retention_seconds`
+    sonra silinir. Dosya işlemleri event loop'u bloklamasın diye tek
+    thread'li ayrı bir executor'da yapılır.
+    """
+
+    def __init__(
+        self,
+        runner: IngestRunner,
+        job_dir: str,
+        workers: int = 2,
+        batch_size: int = 100,
+        retention_seconds: float = 7 * 24 * 3600,
+    ):
+        self.runner = runner
+        self.job_dir = job_dir
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.retention_seconds = retention_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Bu süreçte sahiplenilmiş (kuyrukta ya da çalışan) job'lar ve kilit dosyaları
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._claims: Dict[str, Optional[IO]] = {}
+        # Checkpoint'ler sırayla yazılsın diye tek thread
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-jobs")
+
+    def _job_file(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _faqs_file(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.faqs.jsonl")
+
+    def _lock_file(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.lock")
+
+    async def _run_io(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Dosya işlemini job executor'ında çalıştırır"""
+        return await asyncio.get_running_loop().run_in_executor(self._io, functools.partial(fn, *args))
+
+    async def start(self):
+        """Worker'ları başlatır ve başka bir worker'ın çalıştırmadığı yarım kalmış job'ları kuyruğa geri alır"""
+        await self._run_io(functools.partial(os.makedirs, self.job_dir, exist_ok=True))
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+        resumed = await self._run_io(self._claim_unfinished)
+        for job in resumed:
+            self._jobs[job["job_id"]] = job
+            self._queue.put_nowait(job["job_id"])
+        if resumed:
+            print(f"Resuming {len(resumed)} unfinished ingest jobs")
+
+    async def stop(self):
+        """Worker'ları durdurur; çalışan job'lar checkpoint'ten devam eder"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job_id in list(self._claims):
+            await self._run_io(self._release, job_id)
+        self._jobs.clear()
+
+    def _claim_unfinished(self) -> List[Dict[str, Any]]:
+        """Süresi dolan biten job'ları siler; yarım kalmış job'lardan kilidi alınabilenleri döndürür"""
+        self._prune()
+        claimed = []
+        for name in sorted(os.listdir(self.job_dir)):
+            if not name.endswith(".json"):
+                continue
+            job_id = name[: -len(".json")]
+            job = self._read(job_id)
+            if job is None or job["status"] not in RESUMABLE_STATUSES or not self._claim(job_id):
+                continue
+            # Kilit alınana kadar sahibi job'ı bitirmiş olabilir
+            job = self._read(job_id)
+            if job is not None and job["status"] in RESUMABLE_STATUSES:
+                claimed.append(job)
+            else:
+                self._release(job_id)
+        return claimed
+
+    def _claim(self, job_id: str) -> bool:
+        """Job'ın kilit dosyasını bloklamadan alır; başka bir süreç tutuyorsa False"""
+        if fcntl is None:
+            self._claims[job_id] = None
+            return True
+        f = open(self._lock_file(job_id), "a")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        self._claims[job_id] = f
+        return True
+
+    def _release(self, job_id: str):
+        f = self._claims.pop(job_id, None)
+        if f is not None:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._job_file(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _prune(self):
+        """Saklama süresi dolan biten job'ların checkpoint, SSS ve kilit dosyalarını siler"""
+        if self.retention_seconds <= 0:
+            return
+        cutoff = time.time() - self.retention_seconds
+        for name in os.listdir(self.job_dir):
+            if not name.endswith(".json"):
+                continue
+            job_id = name[: -len(".json")]
+            try:
+                # Checkpoint her güncellemede yazıldığından mtime son güncelleme zamanıdır
+                if os.path.getmtime(self._job_file(job_id)) >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            job = self._read(job_id)
+            if job is None or job["status"] not in FINISHED_STATUSES or job_id in self._claims:
+                continue
+            for path in (self._faqs_file(job_id), self._lock_file(job_id), self._job_file(job_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    async def submit(self, faqs: List[FAQ], user_id: str, languages: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Yeni bir ingest job'ı oluşturup kuyruğa ekler
+
+        Args:
+            faqs: SSS listesi
+            user_id: Kullanıcı ID'si (namespace için)
+            languages: SSS'lerin önceden çevrileceği diller (None ise servis varsayılanı)
+
+        Returns:
+            Dict[str, Any]: Job durumu
+        """
+        if self._queue is None:
+            raise RuntimeError("Ingest job manager is not started")
+
+        # Runner da aynı id'li SSS'leri tekilleştirir; toplam ve batch sınırları onun listesiyle aynı olmalı
+        faqs = dedupe_faqs(faqs)
+        job_id = uuid.uuid4().hex
+        lines = [json.dumps(faq.model_dump(), ensure_ascii=False) + "\n" for faq in faqs]
+        await self._run_io(self._write_faqs, job_id, lines)
+
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": JOB_QUEUED,
+            "total": len(faqs),
+            "languages": languages,
+            "batch_size": self.batch_size,
+            "completed_batches": [],
+            "failed_batches": {},
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._jobs[job_id] = job
+        await asyncio.wrap_future(self._save(job))
+        self._queue.put_nowait(job_id)
+        return self._status(job)
+
+    def _write_faqs(self, job_id: str, lines: List[str]):
+        # Yeni job'ın kilidi, başka bir worker'ın start()'ı onu devralamasın diye dosyalardan önce alınır
+        self._claim(job_id)
+        with open(self._faqs_file(job_id), "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job'ın işlenen, başarısız ve kalan SSS sayılarını döndürür"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            # Başka bir worker'ın ya da bitmiş bir job: checkpoint diskten okunur
+            if not JOB_ID_PATTERN.match(job_id):
+                return None
+            job = await self._run_io(self._read, job_id)
+            if job is None:
+                return None
+        return self._status(job)
+
+    def _status(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        processed = self._processed(job)
+        failed = sum(job["failed_batches"].values())
+        return {
+            "job_id": job["job_id"],
+            "user_id": job["user_id"],
+            "status": job["status"],
+            "total": job["total"],
+            "processed": processed,
+            "failed": failed,
+            "remaining": max(0, job["total"] - processed - failed),
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    def _processed(self, job: Dict[str, Any]) -> int:
+        total, size = job["total"], job["batch_size"]
+        return sum(min(size, total - index * size) for index in job["completed_batches"])
+
+    def _save(self, job: Dict[str, Any]) -> Future:
+        """Checkpoint'in o anki halini executor'da atomik olarak diske yazar (yazmalar sırayla yapılır)"""
+        job["updated_at"] = time.time()
+        return self._io.submit(self._write_job, job["job_id"], json.dumps(job))
+
+    def _write_job(self, job_id: str, payload: str):
+        tmp_path = self._job_file(job_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self._job_file(job_id))
+
+    def _read_faqs(self, job_id: str) -> List[FAQ]:
+        with open(self._faqs_file(job_id), "r", encoding="utf-8") as f:
+            return dedupe_faqs([FAQ(**json.loads(line)) for line in f if line.strip()])
+
+    def _finish(self, job_id: str, completed: bool):
+        """Job'ın kilidini bırakır; tamamlandıysa SSS dosyasını ve süresi dolan eski job'ları siler"""
+        if completed:
+            os.remove(self._faqs_file(job_id))
+        self._release(job_id)
+        self._prune()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(self._jobs[job_id])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Ingest job {job_id} crashed: {str(e)}")
+                # Yarım kalan job'ı servis yeniden başladığında bir worker devralır
+                self._jobs.pop(job_id, None)
+                await self._run_io(self._release, job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        faqs = await self._run_io(self._read_faqs, job_id)
+
+        job["total"] = len(faqs)  # Tekilleştirmeden önce kaydedilmiş job'lar için
+        job["status"] = JOB_RUNNING
+        job["failed_batches"] = {}  # Başarısız batch'ler yeniden denenir
+        await asyncio.wrap_future(self._save(job))
+
+        def on_batch_done(batch_index: int, size: int, succeeded: bool):
+            if succeeded:
+                job["completed_batches"].append(batch_index)
+                job["failed_batches"].pop(str(batch_index), None)
+            else:
+                job["failed_batches"][str(batch_index)] = size
+            self._save(job)  # Beklenmez: executor checkpoint'leri sırayla yazar, job sonunda son hal beklenir
+
+        stats = await self.runner(
+            faqs,
+            job["user_id"],
+            batch_size=job["batch_size"],
+            languages=job.get("languages"),
+            skip_batches=set(job["completed_batches"]),
+            # Vektör id'leri SSS'lerin kalıcı id'leri olduğundan yarım kalan batch tekrar yazılırsa kopya oluşmaz
+            on_batch_done=on_batch_done,
+        )
+
+        if stats.error:
+            job["status"] = JOB_FAILED
+            job["error"] = stats.error
+        elif job["failed_batches"]:
+            job["status"] = JOB_COMPLETED_WITH_ERRORS
+        else:
+            job["status"] = JOB_COMPLETED
+            job["completed_batches"] = list(range((job["total"] + job["batch_size"] - 1) // job["batch_size"]))
+        await asyncio.wrap_future(self._save(job))
+        # Bundan sonra durum diskteki checkpoint'ten okunur
+        self._jobs.pop(job_id, None)
+        await self._run_io(self._finish, job_id, job["status"] == JOB_COMPLETED)
+        print(f"Ingest job {job_id} finished with status {job['status']}")
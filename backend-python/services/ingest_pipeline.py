@@ -0,0 +1,154 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from services.concurrency import ConcurrencyLimiter
+from services.metrics import stage_timer
+
+# (id, metin, metadata) üçlüsü
+IngestRecord = Tuple[str, str, Dict[str, Any]]
+
+# upsert(ids, texts, vectors, metadatas) imzalı asenkron yazma fonksiyonu
+UpsertFn = Callable[[List[str], List[str], List[List[float]], List[Dict[str, Any]]], Awaitable[None]]
+
+# on_batch_done(batch_index, batch_size, succeeded) imzalı ilerleme bildirimi
+BatchCallback = Callable[[int, int, bool], None]
+
+# Batch'in kayıtlarına embed edilmeden önce ek kayıtlar (ör. çeviri varyantları) ekleyen fonksiyon
+ExpandFn = Callable[[List[IngestRecord]], Awaitable[List[IngestRecord]]]
+
+
+@dataclass
+class IngestStats:
+    """Bir ingest çalışmasının özeti"""
+    total: int
+    ingested: int = 0
+    failed: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.failed == 0
+
+    @property
+    def faqs_per_second(self) -> float:
+        return self.ingested / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _batched(records: Iterable[IngestRecord], size: int) -> Iterator[List[IngestRecord]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class IngestPipeline:
+    """
+    Akışlı ingest pipeline'ı.
+
+    Kayıtları tembel olarak batch'lere böler, en fazla `concurrency` batch'i
+    aynı anda embed eder ve her batch biter bitmez parçalar halinde upsert eder.
+    Bellekte aynı anda en fazla `concurrency * batch_size` kayıt bulunur.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        upsert: UpsertFn,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        upsert_batch_size: int = 100,
+        embed_limiter: Optional[ConcurrencyLimiter] = None,
+        expand: Optional[ExpandFn] = None,
+    ):
+        self.embeddings = embeddings
+        self.upsert = upsert
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.embed_limiter = embed_limiter
+        self.expand = expand
+
+    async def _process_batch(self, batch: List[IngestRecord]):
+        """Bir batch'i (genişletilmişse varyantlarıyla) embed edip upsert parçaları halinde yazar"""
+        if self.expand:
+            with stage_timer("ingest", "expand"):
+                batch = await self.expand(batch)
+        ids = [record[0] for record in batch]
+        texts = [record[1] for record in batch]
+        metadatas = [record[2] for record in batch]
+
+        with stage_timer("ingest", "embed"):
+            if self.embed_limiter:
+                vectors = await self.embed_limiter.run(self.embeddings.aembed_documents(texts))
+            else:
+                vectors = await self.embeddings.aembed_documents(texts)
+
+        for start in range(0, len(batch), self.upsert_batch_size):
+            end = start + self.upsert_batch_size
+            await self.upsert(ids[start:end], texts[start:end], vectors[start:end], metadatas[start:end])
+
+    async def run(
+        self,
+        records: Iterable[IngestRecord],
+        total: int,
+        skip_batches: Optional[Set[int]] = None,
+        on_batch_done: Optional[BatchCallback] = None,
+    ) -> IngestStats:
+        """
+        Kayıtları embed edip vektör store'a yazar
+
+        Args:
+            records: (id, metin, metadata) kayıtları (tembel iterable olabilir)
+            total: Toplam kayıt sayısı (raporlama için)
+            skip_batches: Daha önce tamamlanmış, atlanacak batch sıra numaraları
+            on_batch_done: Her batch bittiğinde çağrılır (checkpoint için)
+
+        Returns:
+            IngestStats: İşlenen/başarısız kayıt sayıları ve throughput
+        """
+        stats = IngestStats(total=total)
+        started = time.perf_counter()
+        pending: Dict[asyncio.Task, Tuple[int, int]] = {}
+        skip_batches = skip_batches or set()
+
+        async def drain(return_when: str):
+            done, _ = await asyncio.wait(pending.keys(), return_when=return_when)
+            for task in done:
+                batch_index, size = pending.pop(task)
+                stats.batches += 1
+                succeeded = task.exception() is None
+                if succeeded:
+                    stats.ingested += size
+                else:
+                    stats.failed += size
+                    print(f"Ingest batch failed ({size} FAQs): {task.exception()}")
+                if on_batch_done:
+                    on_batch_done(batch_index, size, succeeded)
+
+        try:
+            for batch_index, batch in enumerate(_batched(records, self.batch_size)):
+                if batch_index in skip_batches:
+                    continue
+                # Eşzamanlılık sınırına ulaşıldıysa bir batch'in bitmesini bekle
+                if len(pending) >= self.concurrency:
+                    await drain(asyncio.FIRST_COMPLETED)
+                pending[asyncio.create_task(self._process_batch(batch))] = (batch_index, len(batch))
+            if pending:
+                await drain(asyncio.ALL_COMPLETED)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            stats.elapsed = time.perf_counter() - started
+
+        return stats
@@ -0,0 +1,179 @@
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from services.translation_cache import normalize_text
+
+# Kısa sohbet mesajlarında sık görülen, dili kesin belli eden kelimeler
+SHORT_TEXT_LEXICON = {
+    "hi": "en", "hello": "en", "hey": "en", "thanks": "en", "thank you": "en", "bye": "en", "yes": "en",
+    "merhaba": "tr", "selam": "tr", "teşekkürler": "tr", "teşekkür ederim": "tr", "sağol": "tr",
+    "evet": "tr", "hayır": "tr", "tamam": "tr", "iade": "tr", "kargo": "tr",
+    "hola": "es", "gracias": "es", "adiós": "es",
+    "bonjour": "fr", "merci": "fr", "salut": "fr", "au revoir": "fr",
+    "hallo": "de", "danke": "de", "tschüss": "de",
+    "ciao": "it", "grazie": "it",
+    "olá": "pt", "obrigado": "pt", "obrigada": "pt",
+}
+
+# Yalnızca Türkçede görülen harfler
+TURKISH_CHARS = set("ğışĞİŞ")
+
+# Bu karakter sayısının altındaki metinlerde langdetect güvenilmez kabul edilir
+SHORT_TEXT_CHARS = 20
+
+
+def _script_of(char: str) -> Optional[str]:
+    """Karakterin yazı sistemini (script) Unicode aralığından bulur"""
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    if 0x3040 <= code <= 0x30FF:
+        return "kana"
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return "han"
+    if 0x0600 <= code <= 0x06FF or 0x0750 <= code <= 0x077F:
+        return "arabic"
+    if 0x0400 <= code <= 0x04FF:
+        return "cyrillic"
+    if unicodedata.category(char).startswith("L"):
+        return "latin"
+    return None
+
+
+class LanguageDetector:
+    """
+    Hızlı ve deterministik dil tespiti.
+
+    Sırasıyla: istemci ipucu -> önbellek -> yazı sistemi kısayolları
+    (Arapça, Çince, Japonca, Korece, Rusça) -> Türkçe harfler -> kısa metin
+    sözlüğü -> sabit seed ile langdetect. langdetect profilleri ilk
+    ihtiyaçta bir kez yüklenir.
+    """
+
+    def __init__(
+        self,
+        supported_languages: Iterable[str],
+        default_language: str = "tr",
+        cache_size: int = 10000,
+        min_confidence: float = 0.7,
+        seed: int = 0,
+    ):
+        self.supported_languages = set(supported_languages)
+        self.default_language = default_language
+        self.cache_size = cache_size
+        self.min_confidence = min_confidence
+        self.seed = seed
+        self._factory = None
+        self._factory_lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "hint": 0, "cache": 0, "script": 0, "lexicon": 0, "langdetect": 0, "fallback": 0
+        }
+
+    def detect(self, text: str, hint: Optional[str] = None) -> str:
+        """
+        Metnin dil kodunu döndürür
+
+        Args:
+            text: Kullanıcı mesajı
+            hint: İstemcinin bildirdiği dil kodu (desteklenen bir dilse doğrudan kullanılır)
+
+        Returns:
+            str: ISO 639-1 dil kodu
+        """
+        if hint:
+            hint = hint.lower().split("-")[0]
+            if hint in self.supported_languages:
+                self.stats["hint"] += 1
+                return hint
+
+        key = normalize_text(text)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache"] += 1
+                return self._cache[key]
+
+        language, source = self._detect_uncached(key)
+        self.stats[source] += 1
+
+        with self._lock:
+            self._cache[key] = language
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return language
+
+    def _detect_uncached(self, text: str):
+        if not text:
+            return self.default_language, "fallback"
+
+        script_language = self._detect_by_script(text)
+        if script_language:
+            return script_language, "script"
+
+        words = text.strip(" .!?,;:¡¿")
+        if words in SHORT_TEXT_LEXICON:
+            return SHORT_TEXT_LEXICON[words], "lexicon"
+
+        try:
+            candidates = self._langdetect_candidates(text)
+        except Exception:
+            return self.default_language, "fallback"
+
+        for candidate in candidates:
+            code = candidate.lang.split("-")[0]
+            if code not in self.supported_languages:
+                continue
+            # Kısa metinlerde düşük güvenli tahminler yerine varsayılan dil kullanılır
+            if len(text) < SHORT_TEXT_CHARS and candidate.prob < self.min_confidence:
+                break
+            return code, "langdetect"
+        return self.default_language, "fallback"
+
+    def _detect_by_script(self, text: str) -> Optional[str]:
+        """Latin dışı yazı sistemleri ve Türkçeye özgü harfler için kısayol"""
+        counts: Dict[str, int] = {}
+        for char in text:
+            if char in TURKISH_CHARS:
+                counts["turkish"] = counts.get("turkish", 0) + 1
+            script = _script_of(char)
+            if script:
+                counts[script] = counts.get(script, 0) + 1
+
+        letters = sum(v for k, v in counts.items() if k != "turkish")
+        if not letters:
+            return None
+        if counts.get("hangul", 0) * 2 >= letters:
+            return "ko"
+        if counts.get("kana", 0):
+            return "ja"  # Japonca Han karakterleriyle birlikte kana da kullanır
+        if counts.get("han", 0) * 2 >= letters:
+            return "zh"
+        if counts.get("arabic", 0) * 2 >= letters:
+            return "ar"
+        if counts.get("cyrillic", 0) * 2 >= letters:
+            return "ru"
+        if counts.get("turkish", 0):
+            return "tr"
+        return None
+
+    def _langdetect_candidates(self, text: str):
+        detector = self._get_factory().create()
+        detector.append(text)
+        return detector.get_probabilities()
+
+    def _get_factory(self):
+        """langdetect profillerini ilk kullanımda bir kez yükler"""
+        if self._factory is None:
+            with self._factory_lock:
+                if self._factory is None:
+                    from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+
+                    factory = DetectorFactory()
+                    factory.load_profile(PROFILES_DIRECTORY)
+                    factory.set_seed(self.seed)
+                    self._factory = factory
+        return self._factory
@@ -0,0 +1,168 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Türkçe büyük/küçük harf dönüşümü: "I" -> "ı", "İ" -> "i" (casefold bunu yanlış yapar)
+TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+
+# Klavyede Türkçe karakter kullanmayan kullanıcılar için sadeleştirme
+ASCII_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ç": "c", "ö": "o", "ü": "u", "â": "a", "î": "i", "û": "u"})
+
+# Kelimeler ve tire/eğik çizgiyle ayrılmış kodlar (ör. "ORD-12345", "A4/80")
+TOKEN_PATTERN = re.compile(r"\w+(?:[-/]\w+)*", re.UNICODE)
+
+# Boşluksuz yazılan diller (Çince, Japonca, Korece) karakter ikilileriyle indekslenir
+CJK_PATTERN = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]+")
+
+# Eklemeli diller (özellikle Türkçe) için önek kökleme uzunluğu: "siparişlerim" -> "sipar"
+PREFIX_LENGTH = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Metni BM25 terimlerine böler
+
+    Türkçeye uygun küçük harfe çevirme, aksan sadeleştirme ve önek kökleme
+    yapar; rakam içeren kodlar (sipariş numarası, ürün kodu) bütün olarak ve
+    parçalarıyla birlikte korunur. CJK metinler karakter ikililerine bölünür.
+    """
+    text = unicodedata.normalize("NFKC", text).translate(TURKISH_LOWER).lower().translate(ASCII_FOLD)
+    tokens: List[str] = []
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        if CJK_PATTERN.search(token):
+            for run in CJK_PATTERN.findall(token):
+                tokens.extend(run[i:i + 2] for i in range(max(1, len(run) - 1)))
+            continue
+        parts = re.split(r"[-/]", token)
+        if len(parts) > 1:
+            tokens.append(token)  # Kodun tamamı: tam eşleşme en güçlü sinyal
+        for part in parts:
+            if any(ch.isdigit() for ch in part):
+                tokens.append(part)
+            elif len(part) > 1:
+                tokens.append(part[:PREFIX_LENGTH])
+    return tokens
+
+
+class BM25Index:
+    """
+    Bir namespace'in SSS'leri için bellek içi ters indeks (Okapi BM25).
+
+    Aynı id ile eklenen doküman öncekinin yerine geçer.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Document] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None):
+        """Dokümanları indekse ekler (varsa günceller)"""
+        metadatas = metadatas or [{} for _ in texts]
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                self._remove(doc_id)
+                terms = Counter(tokenize(text))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+                self._doc_terms[doc_id] = list(terms)
+                length = sum(terms.values())
+                self._lengths[doc_id] = length
+                self._total_length += length
+                self._docs[doc_id] = Document(page_content=text, metadata=dict(metadata), id=doc_id)
+
+    def delete(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def search(self, query: str, k: int = 4, language: Optional[str] = None) -> List[Tuple[Document, float, float]]:
+        """
+        Sorguya en uygun dokümanları döndürür
+
+        Args:
+            query: Sorgu metni
+            k: Döndürülecek en fazla doküman
+            language: Verilirse yalnızca metadata'daki dili bu olan dokümanlar
+
+        Returns:
+            List[Tuple[Document, float, float]]: (doküman, BM25 skoru, sorgu terimlerinin
+                dokümanda bulunan oranı) üçlüleri, skora göre azalan
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._docs:
+                return []
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    if language is not None and self._docs[doc_id].metadata.get("language") != language:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self._docs[doc_id], score, matched[doc_id] / len(terms)) for doc_id, score in ranked]
+
+    def _remove(self, doc_id: str):
+        if doc_id not in self._docs:
+            return
+        del self._docs[doc_id]
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in self._doc_terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+
+def is_decisive(hits: List[Tuple[Document, float, float]], min_coverage: float, min_ratio: float) -> bool:
+    """
+    Sözcüksel eşleşme dense aramayı gereksiz kılacak kadar kesin mi?
+
+    En iyi doküman sorgu terimlerinin en az `min_coverage` oranını içermeli ve
+    skoru ikinci dokümanın en az `min_ratio` katı olmalıdır.
+    """
+    if not hits:
+        return False
+    _, top_score, coverage = hits[0]
+    if coverage < min_coverage:
+        return False
+    return len(hits) == 1 or top_score >= min_ratio * hits[1][1]
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """
+    Birden fazla sıralamayı Reciprocal Rank Fusion ile birleştirir
+
+    Aynı içerikli dokümanlar (backend'den bağımsız olarak) tek kez sayılır.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            key = doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            docs.setdefault(key, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [docs[key] for key in ranked]
@@ -0,0 +1,246 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram
+
+# Akışlı sorgularda isteğin başından ilk token'a kadar geçen süre
+QUERY_TTFT_SECONDS = Histogram(
+    "chatbot_query_ttft_seconds",
+    "Time from request start to first streamed answer token",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 13.0)
+)
+
+# Uçuştaki aynı sorguya bağlanıp ayrı pipeline çalıştırmayan istekler
+QUERY_COALESCED_TOTAL = Counter(
+    "chatbot_query_coalesced_total",
+    "Queries merged into an identical in-flight query instead of running their own pipeline"
+)
+
+# Query/ingest pipeline adımlarının süresi (detect, translate_in, retrieve, generate, ...)
+STAGE_DURATION_SECONDS = Histogram(
+    "chatbot_stage_duration_seconds",
+    "Duration of a query or ingest pipeline stage",
+    ["operation", "stage", "tenant"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+)
+
+# LLM token kullanımı (kind: prompt/completion)
+LLM_TOKENS_TOTAL = Counter(
+    "chatbot_llm_tokens_total",
+    "LLM tokens used, by pipeline stage",
+    ["stage", "tenant", "kind"]
+)
+
+# Önbellek sonuçları (cache: semantic/translation, result: hit/miss)
+CACHE_LOOKUPS_TOTAL = Counter(
+    "chatbot_cache_lookups_total",
+    "Cache lookups by cache and result",
+    ["cache", "result", "tenant"]
+)
+
+# Retrieval yolu (mode: lexical = yalnızca BM25, hybrid = BM25 + vektör, dense = yalnızca vektör)
+RETRIEVAL_TOTAL = Counter(
+    "chatbot_retrieval_total",
+    "Retrievals by path taken",
+    ["mode", "tenant"]
+)
+
+# Sorgu cevabının geldiği yol (path: cache, direct, rag)
+QUERY_PATH_TOTAL = Counter(
+    "chatbot_query_path_total",
+    "Answered queries by path: answer cache, stored FAQ answer (direct) or RAG generation",
+    ["path", "tenant"]
+)
+
+# Kabul kontrolü: slot için kuyrukta bekleme ve 429 ile reddedilen istekler
+ADMISSION_WAIT_SECONDS = Histogram(
+    "chatbot_admission_wait_seconds",
+    "Time a request waited in the admission queue before running",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+)
+ADMISSION_REJECTED_TOTAL = Counter(
+    "chatbot_admission_rejected_total",
+    "Requests rejected with 429 by admission control",
+    ["priority", "reason", "tenant"]
+)
+
+# Prompt'a giren SSS bağlamının boyutu ve bütçe nedeniyle bağlama alınmayan/kırpılan dokümanlar
+CONTEXT_TOKENS = Histogram(
+    "chatbot_context_tokens",
+    "Tokens of FAQ context placed in the generation prompt",
+    buckets=(50, 100, 200, 300, 400, 600, 800, 1000, 1500, 2000, 3000, 4000)
+)
+CONTEXT_DOCS_TOTAL = Counter(
+    "chatbot_context_docs_total",
+    "Retrieved FAQ documents by context assembly outcome (used, trimmed or dropped reason)",
+    ["outcome"]
+)
+
+# Dış servis çağrılarında yeniden denemeler ve hedge istekleri (upstream: openai_chat, openai_embeddings, vector_store)
+UPSTREAM_RETRIES_TOTAL = Counter(
+    "chatbot_upstream_retries_total",
+    "Retried upstream calls by upstream and reason (status, timeout or error type)",
+    ["upstream", "reason"]
+)
+UPSTREAM_HEDGES_TOTAL = Counter(
+    "chatbot_upstream_hedges_total",
+    "Hedged upstream calls by which request finished first",
+    ["upstream", "outcome"]
+)
+
+# Sınırsız user_id'lerin metrik serisi patlatmaması için ayrı etiket alan tenant sayısı
+METRICS_MAX_TENANTS = int(os.getenv("METRICS_MAX_TENANTS", "100"))
+OTHER_TENANT = "other"
+
+# Toplam süresi bu eşiği aşan sorguların adım süreleri tek satır JSON olarak yazılır (0: kapalı)
+SLOW_QUERY_LOG_MS = float(os.getenv("SLOW_QUERY_LOG_MS", "3000"))
+
+_current_tenant: ContextVar[str] = ContextVar("metrics_tenant", default=OTHER_TENANT)
+_current_stage: ContextVar[str] = ContextVar("metrics_stage", default="unknown")
+_current_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("metrics_spans", default=None)
+_tenant_labels: Set[str] = set()
+_tenant_lock = threading.Lock()
+
+
+def tenant_label(user_id: str) -> str:
+    """İlk METRICS_MAX_TENANTS tenant kendi etiketini alır, sonrakiler "other" altında toplanır"""
+    if user_id in _tenant_labels:
+        return user_id
+    with _tenant_lock:
+        if len(_tenant_labels) < METRICS_MAX_TENANTS:
+            _tenant_labels.add(user_id)
+            return user_id
+    return OTHER_TENANT
+
+
+def bind_tenant(user_id: str) -> List[Tuple[str, float]]:
+    """
+    Mevcut isteğin tenant'ını metrik etiketleri için ayarlar ve yeni bir span listesi başlatır
+
+    Returns:
+        List[Tuple[str, float]]: Bu istekte ölçülen (adım, ms) kayıtları
+    """
+    _current_tenant.set(tenant_label(user_id))
+    spans: List[Tuple[str, float]] = []
+    _current_spans.set(spans)
+    return spans
+
+
+@contextmanager
+def stage_timer(operation: str, stage: str) -> Iterator[None]:
+    """Blok süresini mevcut tenant ve adım etiketiyle histograma yazar"""
+    token = _current_stage.set(stage)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _current_stage.reset(token)
+        STAGE_DURATION_SECONDS.labels(operation, stage, _current_tenant.get()).observe(elapsed)
+        spans = _current_spans.get()
+        if spans is not None:
+            spans.append((stage, round(elapsed * 1000, 1)))
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS_TOTAL.labels(cache, "hit" if hit else "miss", _current_tenant.get()).inc()
+
+
+def record_retrieval(mode: str):
+    RETRIEVAL_TOTAL.labels(mode, _current_tenant.get()).inc()
+
+
+def record_query_path(path: str):
+    QUERY_PATH_TOTAL.labels(path, _current_tenant.get()).inc()
+
+
+def record_admission(priority: str, wait_seconds: float):
+    ADMISSION_WAIT_SECONDS.labels(priority).observe(wait_seconds)
+
+
+def record_admission_rejected(tenant: str, priority: str, reason: str):
+    ADMISSION_REJECTED_TOTAL.labels(priority, reason, tenant_label(tenant)).inc()
+
+
+def record_upstream_retry(upstream: str, reason: str):
+    UPSTREAM_RETRIES_TOTAL.labels(upstream, reason).inc()
+
+
+def record_upstream_hedge(upstream: str, outcome: str):
+    UPSTREAM_HEDGES_TOTAL.labels(upstream, outcome).inc()
+
+
+def record_context(tokens: int, used: int, trimmed: int, dropped: Dict[str, int]):
+    CONTEXT_TOKENS.observe(tokens)
+    CONTEXT_DOCS_TOTAL.labels("used").inc(used)
+    if trimmed:
+        CONTEXT_DOCS_TOTAL.labels("trimmed").inc(trimmed)
+    for reason, count in dropped.items():
+        CONTEXT_DOCS_TOTAL.labels(reason).inc(count)
+
+
+def log_if_slow(operation: str, user_id: str, spans: List[Tuple[str, float]], total_ms: float):
+    """Yavaş istekleri adım süreleriyle birlikte tek satır JSON olarak yazar"""
+    if SLOW_QUERY_LOG_MS <= 0 or total_ms < SLOW_QUERY_LOG_MS:
+        return
+    print(json.dumps({
+        "event": f"slow_{operation}",
+        "user_id": user_id,
+        "total_ms": round(total_ms, 1),
+        "stages": [{"stage": stage, "ms": ms} for stage, ms in spans],
+    }, ensure_ascii=False))
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    """LLM sonucundan (prompt, completion) token sayılarını çıkarır"""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+    # Akışlı çağrılarda kullanım bilgisi mesajın usage_metadata alanında gelir
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            prompt_tokens += metadata.get("input_tokens", 0)
+            completion_tokens += metadata.get("output_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+class PrometheusTokenHandler(BaseCallbackHandler):
+    """LLM token kullanımını çağrının yapıldığı adım ve tenant etiketiyle sayar"""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = _token_usage(response)
+        stage, tenant = _current_stage.get(), _current_tenant.get()
+        if prompt_tokens:
+            LLM_TOKENS_TOTAL.labels(stage, tenant, "prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS_TOTAL.labels(stage, tenant, "completion").inc(completion_tokens)
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """LLM çağrılarının prompt/completion token kullanımını toplar"""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.calls += 1
+        prompt_tokens, completion_tokens = _token_usage(response)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class TenantPipeline:
+    """Bir kullanıcının (namespace) hazır vektör store'u ve ondan türetilen bilgiler"""
+    user_id: str
+    vector_store: Any
+    last_used: float = field(default_factory=time.monotonic)
+    # Bu süreçte namespace'e yapılan yazma sayısı (türetilmiş bilgileri geçersiz kılar)
+    writes: int = 0
+    # Dil -> o dilde kaydı olan SSS oranı ve hesaplandığı sürüm (ilk sorguda hesaplanır)
+    language_coverage: Optional[Dict[str, float]] = None
+    coverage_version: Any = None
+
+
+class PipelineRegistry:
+    """
+    user_id başına hazırlanmış retrieval pipeline'larının LRU kaydı.
+
+    Her istekte vektör store yeniden oluşturmak yerine bir kez kurulup
+    tekrar kullanılır. `max_tenants` aşılınca en az kullanılan,
+    `idle_ttl_seconds` boyunca kullanılmayan kayıtlar da düşürülür;
+    `on_evict` düşürülen kullanıcının başka yerlerde tutulan durumunu
+    bırakmak için çağrılır. Fabrika kilit dışında çalışır; `aget` onu
+    event loop'u bloklamamak için bir thread'de çalıştırır.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], TenantPipeline],
+        max_tenants: int = 1000,
+        idle_ttl_seconds: float = 1800,
+        sweep_interval_seconds: float = 60,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.max_tenants = max_tenants
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._pipelines: "OrderedDict[str, TenantPipeline]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> TenantPipeline:
+        """Kullanıcının pipeline'ını döndürür, yoksa oluşturur"""
+        pipeline = self._lookup(user_id)
+        if pipeline is None:
+            pipeline, evicted = self._build(user_id)
+            self._notify(evicted)
+        return pipeline
+
+    async def aget(self, user_id: str) -> TenantPipeline:
+        """get'in event loop'tan kullanılan hali: pipeline yoksa (disk/ağ işlemi yapabilen) fabrika thread'de çalışır"""
+        pipeline = self._lookup(user_id)
+        if pipeline is None:
+            pipeline, evicted = await asyncio.to_thread(self._build, user_id)
+            self._notify(evicted)
+        return pipeline
+
+    def _lookup(self, user_id: str) -> Optional[TenantPipeline]:
+        now = time.monotonic()
+        evicted: List[str] = []
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval_seconds:
+                evicted = self._evict_idle(now)
+            pipeline = self._pipelines.get(user_id)
+            if pipeline is not None:
+                self._pipelines.move_to_end(user_id)
+                pipeline.last_used = now
+                self.hits += 1
+        self._notify(evicted)
+        return pipeline
+
+    def _build(self, user_id: str) -> Tuple[TenantPipeline, List[str]]:
+        """Pipeline'ı kilit dışında kurar; aynı anda kurulmuşsa önce kaydedilen kullanılır"""
+        pipeline = self.factory(user_id)
+        evicted: List[str] = []
+        with self._lock:
+            existing = self._pipelines.get(user_id)
+            if existing is not None:
+                self._pipelines.move_to_end(user_id)
+                existing.last_used = time.monotonic()
+                self.hits += 1
+                return existing, evicted
+            self.misses += 1
+            self._pipelines[user_id] = pipeline
+            while len(self._pipelines) > self.max_tenants:
+                evicted.append(self._pipelines.popitem(last=False)[0])
+        return pipeline, evicted
+
+    def _notify(self, evicted: List[str]):
+        if self.on_evict:
+            for user_id in evicted:
+                self.on_evict(user_id)
+
+    def peek(self, user_id: str) -> Optional[TenantPipeline]:
+        """Pipeline'ı LRU sırasını ve istatistikleri değiştirmeden döndürür (yoksa None)"""
+        with self._lock:
+            return self._pipelines.get(user_id)
+
+    async def warm(self, user_ids: Iterable[str]) -> int:
+        """Sık kullanılan kullanıcıların pipeline'larını önceden hazırlar"""
+        warmed = 0
+        for user_id in user_ids:
+            await self.aget(user_id)
+            warmed += 1
+        return warmed
+
+    def evict_idle(self) -> int:
+        """Boşta kalan pipeline'ları düşürür, düşürülen sayıyı döndürür"""
+        with self._lock:
+            evicted = self._evict_idle(time.monotonic())
+        self._notify(evicted)
+        return len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._pipelines.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"tenants": len(self._pipelines), "hits": self.hits, "misses": self.misses}
+
+    def _evict_idle(self, now: float) -> List[str]:
+        self._last_sweep = now
+        if self.idle_ttl_seconds <= 0:
+            return []
+        idle = [uid for uid, p in self._pipelines.items() if now - p.last_used > self.idle_ttl_seconds]
+        for user_id in idle:
+            del self._pipelines[user_id]
+        return idle
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class _CacheEntry:
+    vector: np.ndarray
+    answer: str
+    language: Optional[str]
+    created_at: float
+    size: int
+
+
+class _NamespaceCache:
+    """Bir namespace'in girdileri ve arama için önbelleğe alınmış vektör matrisi"""
+
+    def __init__(self):
+        self.keys: List[int] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.generation = 0
+
+
+class SemanticCache:
+    """
+    Sorgu embedding'leri üzerinden çalışan, namespace bazlı cevap önbelleği.
+
+    Yeni bir sorunun embedding'i önbellekteki bir soruya `threshold`
+    kosinüs benzerliğinden daha yakınsa saklanan nihai cevap döndürülür.
+    Girdiler LRU sırasıyla ve TTL ile düşürülür; toplam boyut `max_bytes`
+    ile, namespace başına girdi sayısı `max_entries_per_namespace` ile sınırlıdır.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 3600,
+        max_entries_per_namespace: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_namespace = max_entries_per_namespace
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int], _CacheEntry]" = OrderedDict()
+        self._namespaces: Dict[str, _NamespaceCache] = {}
+        self._lock = threading.Lock()
+        self._next_key = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def generation(self, namespace: str) -> int:
+        """Namespace'in geçersiz kılma sayacı (ingest sırasında yarışan yazmaları önler)"""
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            return ns.generation if ns else 0
+
+    def lookup(self, namespace: str, embedding: List[float], language: Optional[str] = None) -> Optional[str]:
+        """
+        Benzer bir soru için saklanmış cevabı arar
+
+        Args:
+            namespace: Kullanıcı ID'si
+            embedding: Sorgu embedding'i
+            language: Sorunun dili (farklı dildeki cevaplar eşleşmez)
+
+        Returns:
+            Optional[str]: Önbellekteki cevap veya None
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None or not ns.keys:
+                self.misses += 1
+                return None
+
+            self._expire(namespace, ns)
+            if not ns.keys:
+                self.misses += 1
+                return None
+            if ns.matrix is None:
+                ns.matrix = np.stack([self._entries[(namespace, key)].vector for key in ns.keys])
+
+            scores = ns.matrix @ query
+            for idx in np.argsort(-scores):
+                if scores[idx] < self.threshold:
+                    break
+                entry_key = (namespace, ns.keys[idx])
+                entry = self._entries[entry_key]
+                if language is not None and entry.language != language:
+                    continue
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry.answer
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        namespace: str,
+        embedding: List[float],
+        answer: str,
+        language: Optional[str] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Cevabı önbelleğe yazar
+
+        Args:
+            namespace: Kullanıcı ID'si
+            embedding: Sorgu embedding'i
+            answer: Nihai (kullanıcı dilindeki) cevap
+            language: Sorunun dili
+            generation: lookup öncesi alınan generation(); arada namespace
+                geçersiz kılındıysa cevap yazılmaz
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) or 1.0)
+        size = vector.nbytes + len(answer.encode("utf-8"))
+
+        with self._lock:
+            ns = self._namespaces.setdefault(namespace, _NamespaceCache())
+            if generation is not None and generation != ns.generation:
+                return
+
+            key = self._next_key
+            self._next_key += 1
+            self._entries[(namespace, key)] = _CacheEntry(vector, answer, language, time.monotonic(), size)
+            ns.keys.append(key)
+            ns.matrix = None
+            self._bytes += size
+
+            while len(ns.keys) > self.max_entries_per_namespace:
+                oldest = next(k for (n, k) in self._entries if n == namespace)
+                self._remove(namespace, oldest)
+            while self._bytes > self.max_bytes and self._entries:
+                evict_ns, evict_key = next(iter(self._entries))
+                self._remove(evict_ns, evict_key)
+
+    def invalidate(self, namespace: str):
+        """Namespace'in tüm girdilerini siler (ör. yeni SSS'ler ingest edildiğinde)"""
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None:
+                return
+            for key in list(ns.keys):
+                self._remove(namespace, key, count_eviction=False)
+            ns.generation += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Önbellek istatistiklerini döndürür"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _expire(self, namespace: str, ns: _NamespaceCache):
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        for key in [k for k in ns.keys if self._entries[(namespace, k)].created_at < cutoff]:
+            self._remove(namespace, key)
+
+    def _remove(self, namespace: str, key: int, count_eviction: bool = True):
+        entry = self._entries.pop((namespace, key))
+        self._bytes -= entry.size
+        ns = self._namespaces[namespace]
+        ns.keys.remove(key)
+        ns.matrix = None
+        if count_eviction:
+            self.evictions += 1
@@ -0,0 +1,211 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import random
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+# Her worker'ın halkadaki sanal düğüm sayısı (yük dağılımını dengeler)
+DEFAULT_VNODES = 128
+
+# Proxy'de iletilmeyen hop-by-hop başlıklar
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length"
+}
+
+# Job id -> worker eşlemesinde tutulan en fazla job (job durumu yalnızca o worker'ın belleğinde)
+MAX_TRACKED_JOBS = 10000
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Tutarlı hash halkası: anahtarı (user_id) bir worker'a eşler.
+
+    Worker eklenip çıkarıldığında yalnızca o worker'a düşen/düşecek
+    anahtarlar yer değiştirir (yaklaşık 1/N); diğer tenant'ların sıcak
+    durumu yerinde kalır.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        self.vnodes = vnodes
+        self._points: List[Tuple[int, str]] = []
+        self._nodes: Set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> Set[str]:
+        return set(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            bisect.insort(self._points, (_hash(f"{node}#{i}"), node))
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._points = [point for point in self._points if point[1] != node]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """Anahtarın sahibi olan worker (halka boşsa None)"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, (_hash(key), ""))
+        return self._points[index % len(self._points)][1]
+
+
+def shard_key(body: bytes) -> Optional[str]:
+    """
+    İsteğin yönlendirileceği tenant (JSON gövdedeki user_id)
+
+    Toplu sorgularda en çok soruya sahip tenant kullanılır; user_id
+    taşımayan istekler için None döner.
+    """
+    if not body:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if isinstance(payload.get("user_id"), str):
+        return payload["user_id"]
+    queries = payload.get("queries")
+    if isinstance(queries, list):
+        tenants = Counter(q.get("user_id") for q in queries if isinstance(q, dict) and isinstance(q.get("user_id"), str))
+        if tenants:
+            return tenants.most_common(1)[0][0]
+    return None
+
+
+class ShardRouter:
+    """
+    İstekleri user_id'ye göre tutarlı hash'le worker süreçlerine dağıtan proxy.
+
+    Her tenant hep aynı worker'a gider; böylece pipeline, önbellek ve yerel
+    indeks durumu yalnızca o worker'da sıcak tutulur. Worker'lar periyodik
+    olarak /health ile kontrol edilir: cevap vermeyen halkadan çıkarılır,
+    geri gelen tekrar eklenir (yeniden dengeleme).
+    """
+
+    def __init__(
+        self,
+        workers: List[str],
+        vnodes: int = DEFAULT_VNODES,
+        health_interval_seconds: float = 2.0,
+        health_timeout_seconds: float = 1.0,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None
+    ):
+        if not workers:
+            raise ValueError("ShardRouter requires at least one worker")
+        self.workers = [worker.rstrip("/") for worker in workers]
+        self.ring = HashRing(self.workers, vnodes=vnodes)
+        self.health_interval_seconds = health_interval_seconds
+        self.health_timeout_seconds = health_timeout_seconds
+        self.client = httpx.AsyncClient(limits=limits or httpx.Limits(), timeout=timeout or httpx.Timeout(60.0))
+        self.rebalances = 0
+        self.requests: Dict[str, int] = {worker: 0 for worker in self.workers}
+        self._jobs: "OrderedDict[str, str]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> Set[str]:
+        return self.ring.nodes
+
+    async def start(self):
+        self._task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        await self.client.aclose()
+
+    def worker_for(self, tenant: Optional[str]) -> Optional[str]:
+        """Tenant'ın sahibi olan sağlıklı worker (tenant yoksa rastgele biri)"""
+        if tenant is None:
+            healthy = sorted(self.ring.nodes)
+            return random.choice(healthy) if healthy else None
+        return self.ring.node_for(tenant)
+
+    def mark_down(self, worker: str):
+        if worker in self.ring.nodes:
+            self.ring.remove(worker)
+            self.rebalances += 1
+            print(f"Shard worker {worker} is down; its tenants moved to {len(self.ring)} remaining workers")
+
+    def mark_up(self, worker: str):
+        if worker not in self.ring.nodes:
+            self.ring.add(worker)
+            self.rebalances += 1
+            print(f"Shard worker {worker} is up; ring has {len(self.ring)} workers")
+
+    def track_job(self, job_id: str, worker: str):
+        """Job durumu yalnızca job'ı alan worker'ın belleğinde olduğundan job id'si worker'a eşlenir"""
+        self._jobs[job_id] = worker
+        self._jobs.move_to_end(job_id)
+        while len(self._jobs) > MAX_TRACKED_JOBS:
+            self._jobs.popitem(last=False)
+
+    def worker_for_job(self, job_id: str) -> Optional[str]:
+        return self._jobs.get(job_id)
+
+    async def send(self, worker: str, method: str, path: str, query: str, headers: Dict[str, str], body: bytes) -> httpx.Response:
+        """İsteği worker'a iletir; cevap gövdesi akış olarak okunmak üzere açık döner"""
+        url = f"{worker}{path}" + (f"?{query}" if query else "")
+        request = self.client.build_request(method, url, headers=forward_headers(headers), content=body)
+        self.requests[worker] = self.requests.get(worker, 0) + 1
+        return await self.client.send(request, stream=True)
+
+    async def check_health(self):
+        """Tüm worker'ları yoklar ve halkayı günceller"""
+        async def probe(worker: str) -> bool:
+            try:
+                response = await self.client.get(f"{worker}/health", timeout=self.health_timeout_seconds)
+                return response.status_code == 200
+            except httpx.HTTPError:
+                return False
+
+        results = await asyncio.gather(*(probe(worker) for worker in self.workers))
+        for worker, up in zip(self.workers, results):
+            if up:
+                self.mark_up(worker)
+            else:
+                self.mark_down(worker)
+
+    async def _health_loop(self):
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:
+                print(f"Shard health check failed: {str(e)}")
+            await asyncio.sleep(self.health_interval_seconds)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "healthy": sorted(self.ring.nodes),
+            "rebalances": self.rebalances,
+            "requests": dict(self.requests),
+            "tracked_jobs": len(self._jobs),
+        }
+
+
+def forward_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {key: value for key, value in headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
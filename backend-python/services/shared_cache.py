@@ -0,0 +1,268 @@
+import asyncio
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Önbellek türleri (aynı dosyada ayrı anahtar alanları)
+KIND_ANSWER = "answer"
+KIND_TRANSLATION = "translation"
+
+# Okumalarda son erişim zamanı en fazla bu sıklıkla güncellenir (her isabette yazma olmasın)
+TOUCH_INTERVAL_SECONDS = 30
+
+# Boyut kontrolü her N yazmada bir yapılır
+EVICT_CHECK_EVERY = 64
+
+# LRU silmede tek seferde okunan satır sayısı
+EVICT_BATCH_ROWS = 256
+
+# REPLACE yerine upsert: satır silinip eklenmez, boyut trigger'ı eski boyutu görür
+UPSERT_ENTRY = (
+    "INSERT INTO entries (kind, key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(kind, key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+    "expires_at = excluded.expires_at, last_access = excluded.last_access"
+)
+
+
+class SharedCache:
+    """
+    Aynı makinedeki tüm uvicorn worker'larının paylaştığı önbellek katmanı.
+
+    WAL modunda SQLite dosyası üzerine kuruludur; harici servis gerektirmez ve
+    birden fazla süreç aynı anda güvenle okuyup yazabilir. Girdiler tür
+    (answer/translation) ve anahtarla saklanır, isteğe bağlı TTL
+    ile süresi dolar. Toplam boyut `max_bytes`'ı aşınca en uzun süredir
+    kullanılmayan girdiler silinir.
+
+    Namespace generation sayaçları da burada tutulur; bir worker ingest
+    sonrası generation'ı artırdığında diğer worker'ların eski cevapları
+    da geçersiz olur.
+
+    SQLite çağrıları başka worker'ların yazmalarını beklerken (busy timeout)
+    bloklayabilir; event loop'tan `a` önekli metodlar kullanılır, bunlar
+    çağrıları tek thread'li ayrı bir executor'da çalıştırır. Toplam boyut ve
+    girdi sayısı trigger'larla `meta` tablosunda artımlı tutulur.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, busy_timeout_seconds: float = 5.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=busy_timeout_seconds, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        # Bağlantı zaten kilitle sıralandığından tek thread yeterli; varsayılan thread havuzunu doldurmaz
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, last_access REAL NOT NULL, PRIMARY KEY (kind, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generations (namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+            self._create_totals()
+
+    def _create_totals(self):
+        """Toplam boyutu ve girdi sayısını her yazmada güncelleyen trigger'lar (silmede tam tarama olmasın)"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # Trigger'lardan önce oluşturulmuş dosyalar için bir kerelik sayım
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) SELECT 'bytes', CAST(TOTAL(size) AS INTEGER) FROM entries"
+            )
+            self._db.execute("INSERT OR IGNORE INTO meta (name, value) SELECT 'entries', COUNT(*) FROM entries")
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN "
+                "UPDATE meta SET value = value + NEW.size WHERE name = 'bytes'; "
+                "UPDATE meta SET value = value + 1 WHERE name = 'entries'; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN "
+                "UPDATE meta SET value = value - OLD.size WHERE name = 'bytes'; "
+                "UPDATE meta SET value = value - 1 WHERE name = 'entries'; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN "
+                "UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes'; END"
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Senkron çağrıyı önbelleğin executor'ında çalıştırır"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args))
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        """
+        Girdiyi döndürür
+
+        Args:
+            kind: Önbellek türü
+            key: Anahtar
+
+        Returns:
+            Optional[bytes]: Değer veya None (yoksa ya da süresi dolduysa)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, last_access FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+            if now - row[2] > TOUCH_INTERVAL_SECONDS:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ? WHERE kind = ? AND key = ?", (now, kind, key)
+                )
+            self.hits += 1
+            return row[0]
+
+    def put(self, kind: str, key: str, value: bytes, ttl_seconds: float = 0):
+        """
+        Girdiyi yazar (varsa üzerine)
+
+        Args:
+            kind: Önbellek türü
+            key: Anahtar
+            value: Değer
+            ttl_seconds: Geçerlilik süresi (0: süresiz, yalnızca boyut sınırıyla düşer)
+        """
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds > 0 else None
+        with self._lock:
+            self._db.execute(
+                UPSERT_ENTRY,
+                (kind, key, value, len(value) + len(key), expires_at, now),
+            )
+            self._writes += 1
+            if self._writes % EVICT_CHECK_EVERY == 0:
+                self._evict(now)
+
+    def put_many(self, kind: str, items: Dict[str, bytes], ttl_seconds: float = 0):
+        """Birden fazla girdiyi tek transaction'da yazar"""
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds > 0 else None
+        rows = [(kind, key, value, len(value) + len(key), expires_at, now) for key, value in items.items()]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    UPSERT_ENTRY,
+                    rows,
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            previous = self._writes
+            self._writes += len(rows)
+            if self._writes // EVICT_CHECK_EVERY != previous // EVICT_CHECK_EVERY:
+                self._evict(now)
+
+    def get_text(self, kind: str, key: str) -> Optional[str]:
+        value = self.get(kind, key)
+        return value.decode("utf-8") if value is not None else None
+
+    def put_text(self, kind: str, key: str, value: str, ttl_seconds: float = 0):
+        self.put(kind, key, value.encode("utf-8"), ttl_seconds)
+
+    def generation(self, namespace: str) -> int:
+        """Namespace'in tüm worker'larda ortak generation sayacı"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT generation FROM generations WHERE namespace = ?", (namespace,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def bump_generation(self, namespace: str) -> int:
+        """Namespace'in generation'ını artırır; eski generation'la yazılmış cevaplar artık okunmaz"""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO generations (namespace, generation) VALUES (?, 1) "
+                "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+                (namespace,),
+            )
+            return self._db.execute(
+                "SELECT generation FROM generations WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    async def aget_text(self, kind: str, key: str) -> Optional[str]:
+        return await self._run(self.get_text, kind, key)
+
+    async def aput_text(self, kind: str, key: str, value: str, ttl_seconds: float = 0):
+        await self._run(self.put_text, kind, key, value, ttl_seconds)
+
+    async def ageneration(self, namespace: str) -> int:
+        return await self._run(self.generation, namespace)
+
+    async def abump_generation(self, namespace: str) -> int:
+        return await self._run(self.bump_generation, namespace)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            totals = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+            return {
+                "entries": totals.get("entries", 0),
+                "bytes": totals.get("bytes", 0),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self, now: float):
+        """Süresi dolanları siler, boyut sınırı aşıldıysa LRU sırasıyla %10 pay bırakacak kadar siler"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            expired = self._db.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+            ).rowcount
+            total = self._db.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+            removed = 0
+            target = total - self.max_bytes * 0.9 if total > self.max_bytes else 0
+            while target > 0:
+                oldest = self._db.execute(
+                    "SELECT kind, key, size FROM entries ORDER BY last_access LIMIT ?", (EVICT_BATCH_ROWS,)
+                ).fetchall()
+                if not oldest:
+                    break
+                for kind, key, size in oldest:
+                    if target <= 0:
+                        break
+                    self._db.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+                    target -= size
+                    removed += 1
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self.evictions += expired + removed
+
+
+def content_key(*parts: str) -> str:
+    """Uzun metinlerden sabit uzunlukta önbellek anahtarı üretir"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
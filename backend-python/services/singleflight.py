@@ -0,0 +1,54 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla eşzamanlı gelen çağrıları tek bir hesaplamada birleştirir.
+
+    İlk çağrı hesaplamayı başlatır; hesaplama sürerken aynı anahtarla gelen
+    çağrılar yeni iş başlatmak yerine aynı sonucu bekler. Hesaplama bitince
+    anahtar serbest kalır (sonuç önbelleğe alınmaz).
+    """
+
+    def __init__(self, on_merge: Optional[Callable[[], None]] = None):
+        self.on_merge = on_merge
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.merged = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Anahtar için uçuşta bir hesaplama varsa onu bekler, yoksa fn'i çalıştırır
+
+        Args:
+            key: Birleştirme anahtarı
+            fn: Sonucu üreten coroutine fabrikası
+
+        Returns:
+            Hesaplamanın sonucu (tüm bekleyenler için aynı)
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.merged += 1
+            if self.on_merge:
+                self.on_merge()
+        else:
+            # Hesaplama ayrı bir task'ta çalışır; ilk çağıran iptal edilse de diğerleri sonucu alır
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Tüm bekleyenler iptal edildiyse "exception was never retrieved" uyarısını önle
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._in_flight), "executed": self.executed, "merged": self.merged}
@@ -0,0 +1,26 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Cümle sonu: nokta/ünlem/soru işareti (ve CJK karşılıkları) ardından boşluk, ya da satır sonu
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])|\n+")
+
+
+def split_sentences(buffer: str) -> Tuple[List[str], str]:
+    """
+    Akış tamponundaki tamamlanmış cümleleri ayırır
+
+    Args:
+        buffer: Şimdiye kadar gelen metin
+
+    Returns:
+        Tuple[List[str], str]: (tamamlanmış cümleler, kalan yarım metin)
+    """
+    parts = _SENTENCE_END.split(buffer)
+    complete = [part.strip() for part in parts[:-1] if part.strip()]
+    return complete, parts[-1]
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Bir olayı server-sent events formatına çevirir"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,179 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from services.shared_cache import KIND_TRANSLATION, SharedCache, content_key
+
+# Eski "translations" tablosundan taşınırken tek seferde okunan satır sayısı
+LEGACY_MIGRATION_BATCH = 1000
+
+
+def normalize_text(text: str) -> str:
+    """Önbellek anahtarı için metni normalize eder (Unicode, boşluk, büyük/küçük harf)"""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+class TranslationCache:
+    """
+    Çeviri sonuçları için sınırlı boyutlu LRU önbellek.
+
+    Anahtar (hedef dil, normalize edilmiş metin) ikilisidir. `shared`
+    verilirse aynı makinedeki diğer worker'ların çevirileri de kullanılır.
+    `disk_path` verilirse SQLite tabanlı bir katman daha kullanılır ve
+    çeviriler servis yeniden başlatıldığında da korunur; bu katman da
+    SharedCache'tir, `disk_max_bytes`'ı aşınca en uzun süredir kullanılmayan
+    çeviriler silinir. Event loop'tan `aget`/`aput` kullanılır: bellek
+    katmanı doğrudan, SQLite katmanları önbelleğin executor'ında okunur.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        disk_path: Optional[str] = None,
+        shared: Optional[SharedCache] = None,
+        disk_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._memory: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[SharedCache] = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+
+        if disk_path:
+            self._disk = SharedCache(disk_path, max_bytes=disk_max_bytes)
+            self._migrate_legacy_table(disk_path)
+
+    def _migrate_legacy_table(self, disk_path: str):
+        """Sınırsız eski "translations" tablosundaki çevirileri boyut sınırlı katmana bir kez taşır"""
+        db = sqlite3.connect(disk_path, timeout=5.0)
+        try:
+            exists = db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'translations'"
+            ).fetchone()
+            if not exists:
+                return
+            cursor = db.execute("SELECT target, source, translation FROM translations")
+            while True:
+                rows = cursor.fetchmany(LEGACY_MIGRATION_BATCH)
+                if not rows:
+                    break
+                self._disk.put_many(
+                    KIND_TRANSLATION,
+                    {content_key(target, source): translation.encode("utf-8") for target, source, translation in rows},
+                )
+            db.execute("DROP TABLE translations")
+            db.commit()
+        except sqlite3.OperationalError as e:
+            # Aynı anda başlayan başka bir worker taşımayı bitirmiş olabilir; yazmalar tekrarlanabilir
+            print(f"Legacy translation cache migration skipped: {str(e)}")
+        finally:
+            db.close()
+
+    def get(self, text: str, target_language: str) -> Optional[str]:
+        """
+        Önbellekteki çeviriyi döndürür (senkron; SQLite katmanları çağıran thread'de okunur)
+
+        Args:
+            text: Kaynak metin
+            target_language: Hedef dil kodu
+
+        Returns:
+            Optional[str]: Çeviri veya None
+        """
+        key = (target_language, normalize_text(text))
+        translation = self._get_memory(key)
+        if translation is not None:
+            return translation
+        if self.shared is not None:
+            translation = self.shared.get_text(KIND_TRANSLATION, content_key(*key))
+            if translation is not None:
+                return self._stored_hit(key, translation, shared=True)
+        if self._disk is not None:
+            translation = self._disk.get_text(KIND_TRANSLATION, content_key(*key))
+            if translation is not None:
+                return self._stored_hit(key, translation, shared=False)
+        return self._miss()
+
+    async def aget(self, text: str, target_language: str) -> Optional[str]:
+        """get'in event loop'tan kullanılan hali"""
+        key = (target_language, normalize_text(text))
+        translation = self._get_memory(key)
+        if translation is not None:
+            return translation
+        if self.shared is not None:
+            translation = await self.shared.aget_text(KIND_TRANSLATION, content_key(*key))
+            if translation is not None:
+                return self._stored_hit(key, translation, shared=True)
+        if self._disk is not None:
+            translation = await self._disk.aget_text(KIND_TRANSLATION, content_key(*key))
+            if translation is not None:
+                return self._stored_hit(key, translation, shared=False)
+        return self._miss()
+
+    def put(self, text: str, target_language: str, translation: str):
+        """Çeviriyi önbelleğe (ve varsa paylaşımlı/disk katmanlarına) yazar"""
+        key = (target_language, normalize_text(text))
+        with self._lock:
+            self._remember(key, translation)
+        if self.shared is not None:
+            self.shared.put_text(KIND_TRANSLATION, content_key(*key), translation)
+        if self._disk is not None:
+            self._disk.put_text(KIND_TRANSLATION, content_key(*key), translation)
+
+    async def aput(self, text: str, target_language: str, translation: str):
+        """put'un event loop'tan kullanılan hali"""
+        key = (target_language, normalize_text(text))
+        with self._lock:
+            self._remember(key, translation)
+        if self.shared is not None:
+            await self.shared.aput_text(KIND_TRANSLATION, content_key(*key), translation)
+        if self._disk is not None:
+            await self._disk.aput_text(KIND_TRANSLATION, content_key(*key), translation)
+
+    def stats(self) -> Dict[str, int]:
+        """İsabet/ıska sayılarını döndürür"""
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "shared_hits": self.shared_hits,
+            }
+
+    def _get_memory(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            if key not in self._memory:
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+    def _stored_hit(self, key: Tuple[str, str], translation: str, shared: bool) -> str:
+        with self._lock:
+            self._remember(key, translation)
+            self.hits += 1
+            if shared:
+                self.shared_hits += 1
+            else:
+                self.disk_hits += 1
+        return translation
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key: Tuple[str, str], translation: str):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
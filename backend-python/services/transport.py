@@ -0,0 +1,305 @@
+import asyncio
+import email.utils
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Optional, Set, TypeVar
+
+import httpx
+
+try:
+    from urllib3.exceptions import HTTPError as Urllib3Error  # Pinecone'un senkron istemcisi
+except ImportError:
+    Urllib3Error = None
+
+T = TypeVar("T")
+
+# Geçici sayılan HTTP durumları (yeniden denenir)
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# Hedge gecikmesinin hesaplandığı son başarılı çağrı sayısı
+LATENCY_WINDOW = 512
+
+# Hedge gecikmesi her N ölçümde bir yeniden hesaplanır (her çağrıda sıralama yapılmasın)
+QUANTILE_REFRESH_EVERY = 32
+
+# Hedge sonuçları (on_hedge geri çağrısı)
+HEDGE_PRIMARY_WON = "primary_won"
+HEDGE_WON = "hedge_won"
+
+
+class DeadlineExceeded(TimeoutError):
+    """Çağrı (yeniden denemeler dahil) süre sınırını aştı"""
+
+
+@dataclass
+class TransportConfig:
+    """Dış servis istemcilerinin ortak bağlantı havuzu, süre sınırı ve yeniden deneme ayarları"""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    timeout: float = 30.0  # Çağrı başına toplam süre (yeniden denemeler dahil)
+    max_retries: int = 2
+    retry_base_delay: float = 0.2
+    retry_max_delay: float = 2.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_min_delay: float = 0.05
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+class LatencyTracker:
+    """Son başarılı çağrıların sürelerinden yüzdelik hesaplar"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._since_refresh = 0
+        self._cached: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self._since_refresh += 1
+        if self._since_refresh >= QUANTILE_REFRESH_EVERY:
+            self._cached.clear()
+            self._since_refresh = 0
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        if q not in self._cached:
+            ordered = sorted(self._samples)
+            self._cached[q] = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return self._cached[q]
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Bağlantı hataları, zaman aşımları ve geçici HTTP durumları yeniden denenir"""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if Urllib3Error is not None and isinstance(error, Urllib3Error):
+        return True
+    # Pinecone (status), aiohttp (status) ve OpenAI (status_code) hataları
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    return isinstance(status, int) and status in RETRY_STATUSES
+
+
+class CallPolicy:
+    """
+    Tek bir dış servise yapılan çağrıların süre sınırı, yeniden deneme ve hedge politikası.
+
+    - Süre sınırı: çağrı yeniden denemeler dahil `timeout` saniyede biter
+    - Yeniden deneme: geçici hatalarda tam jitter'lı üstel bekleme (Retry-After
+      varsa en az o kadar), süre sınırı içinde kalacak kadar
+    - Hedge: yeterli ölçüm biriktikten sonra cevap son çağrıların
+      `hedge_quantile` yüzdeliğinden (p95) uzun sürerse aynı istek bir kez
+      daha gönderilir, önce biten kullanılır. Yalnızca tekrarı zararsız
+      (idempotent) çağrılarda açılmalıdır.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: TransportConfig,
+        on_retry: Optional[Callable[[str, str], None]] = None,
+        on_hedge: Optional[Callable[[str, str], None]] = None
+    ):
+        self.name = name
+        self.config = config
+        self.tracker = LatencyTracker()
+        self.on_retry = on_retry
+        self.on_hedge = on_hedge
+
+    def hedge_delay(self) -> Optional[float]:
+        """Hedge isteğinin gönderileceği gecikme (yeterli ölçüm yoksa None)"""
+        if len(self.tracker) < self.config.hedge_min_samples:
+            return None
+        return max(self.config.hedge_min_delay, self.tracker.quantile(self.config.hedge_quantile))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """`attempt`. yeniden denemeden önceki bekleme (full jitter)"""
+        ceiling = min(self.config.retry_max_delay, self.config.retry_base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after or 0.0)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        retry_after: Optional[Callable[[T], Optional[float]]] = None,
+        discard: Optional[Callable[[T], Awaitable[Any]]] = None,
+        hedge: Optional[bool] = None
+    ) -> T:
+        """
+        Çağrıyı politikaya göre çalıştırır
+
+        Args:
+            call: Her denemede yeni bir coroutine üreten fonksiyon
+            retry_after: Sonuç yeniden denenmeliyse bekleme ipucunu (saniye, 0
+                olabilir), aksi halde None döndürür (ör. HTTP 503 cevabı)
+            discard: Kullanılmayan sonucu serbest bırakır (ör. cevabı kapatır)
+            hedge: Bu çağrı için hedge (varsayılan: config.hedge)
+
+        Returns:
+            Başarılı (veya yeniden deneme hakkı biten) çağrının sonucu
+
+        Raises:
+            DeadlineExceeded: Süre sınırı aşıldıysa
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.timeout
+        hedge = self.config.hedge if hedge is None else hedge
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{self.name} call exceeded {self.config.timeout:.1f}s deadline")
+            try:
+                result = await asyncio.wait_for(self._attempt(call, hedge, discard), remaining)
+            except asyncio.TimeoutError as e:
+                if loop.time() >= deadline:
+                    raise DeadlineExceeded(f"{self.name} call exceeded {self.config.timeout:.1f}s deadline") from e
+                if attempt >= self.config.max_retries:
+                    raise
+                hint, reason = None, "timeout"
+            except Exception as e:
+                if attempt >= self.config.max_retries or not is_retryable_error(e):
+                    raise
+                hint, reason = None, type(e).__name__
+            else:
+                hint = retry_after(result) if retry_after else None
+                if hint is None or attempt >= self.config.max_retries:
+                    return result
+                reason = "status"
+                if discard:
+                    await discard(result)
+
+            delay = self.backoff(attempt, hint)
+            if loop.time() + delay >= deadline:
+                raise DeadlineExceeded(f"{self.name} call would exceed {self.config.timeout:.1f}s deadline while retrying")
+            if self.on_retry:
+                self.on_retry(self.name, reason)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _timed(self, call: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        result = await call()
+        self.tracker.record(time.perf_counter() - started)
+        return result
+
+    async def _attempt(
+        self,
+        call: Callable[[], Awaitable[T]],
+        hedge: bool,
+        discard: Optional[Callable[[T], Awaitable[Any]]]
+    ) -> T:
+        """Tek deneme; gerekirse gecikmeli ikinci (hedge) istekle yarışır"""
+        delay = self.hedge_delay() if hedge else None
+        if delay is None:
+            return await self._timed(call)
+
+        primary = asyncio.ensure_future(self._timed(call))
+        tasks: Set[asyncio.Future] = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.add(asyncio.ensure_future(self._timed(call)))
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1 and self.on_hedge:
+                            self.on_hedge(self.name, HEDGE_PRIMARY_WON if task is primary else HEDGE_WON)
+                        tasks.discard(task)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Kaybeden istek iptal edilir; bitmişse sonucu serbest bırakılır
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    continue
+                if discard and not task.cancelled() and task.exception() is None:
+                    await discard(task.result())
+
+
+def _response_retry_after(response: httpx.Response) -> Optional[float]:
+    """Geçici hata cevabıysa Retry-After ipucunu (yoksa 0), değilse None döndürür"""
+    if response.status_code not in RETRY_STATUSES:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else 0.0
+
+
+async def _close_response(response: httpx.Response):
+    await response.aclose()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Bağlantı havuzlu httpx transport'u üzerinde CallPolicy uygulayan katman.
+
+    OpenAI SDK'sına `http_async_client` olarak verilen httpx.AsyncClient
+    bununla kurulur; SDK'nın kendi yeniden denemeleri kapatılır ki denemeler
+    ve süre sınırı tek yerden yönetilsin.
+    """
+
+    def __init__(self, policy: CallPolicy, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.policy = policy
+        self.inner = inner or httpx.AsyncHTTPTransport(limits=policy.config.limits())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Gövde belleğe alınır ki yeniden deneme ve hedge aynı isteği tekrar gönderebilsin
+        await request.aread()
+        try:
+            return await self.policy.run(
+                lambda: self.inner.handle_async_request(request),
+                retry_after=_response_retry_after,
+                discard=_close_response
+            )
+        except DeadlineExceeded as e:
+            raise httpx.ReadTimeout(str(e), request=request) from e
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def build_async_client(policy: CallPolicy, inner: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Politikayı uygulayan, keep-alive bağlantı havuzlu async istemci"""
+    return httpx.AsyncClient(
+        transport=ResilientTransport(policy, inner),
+        timeout=policy.config.httpx_timeout()
+    )
+
+
+def build_sync_client(config: TransportConfig) -> httpx.Client:
+    """Senkron çağrılar için aynı havuz ve süre ayarlarıyla istemci (yalnızca bağlantı hataları yeniden denenir)"""
+    return httpx.Client(
+        transport=httpx.HTTPTransport(limits=config.limits(), retries=config.max_retries),
+        timeout=config.httpx_timeout()
+    )
@@ -0,0 +1,640 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+try:
+    import fcntl  # Aynı dizini paylaşan worker süreçleri arasında yazma kilidi
+except ImportError:  # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+# Desteklenen depolama tipleri: float16 (yarı hassasiyet) ve int8 (nicemlenmiş)
+SUPPORTED_DTYPES = ("float16", "int8")
+
+# int8 nicemlemede birim vektör bileşenleri [-1, 1] aralığından [-127, 127]'ye ölçeklenir
+INT8_SCALE = 127.0
+
+# Skor hesaplanırken bellek kullanımını sınırlamak için satır bloğu boyutu
+SEARCH_BLOCK_ROWS = 65536
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Vektörleri birim uzunluğa getirir (kosinüs benzerliği = iç çarpım)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _matches_filter(metadata: Dict[str, Any], filter: Optional[Dict[str, Any]]) -> bool:
+    """Pinecone tarzı basit metadata filtresini uygular ($eq, $ne, $in, $nin)"""
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            for op, expected in condition.items():
+                if op == "$eq" and value != expected:
+                    return False
+                if op == "$ne" and value == expected:
+                    return False
+                if op == "$in" and value not in expected:
+                    return False
+                if op == "$nin" and value in expected:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _NamespaceIndex:
+    """
+    Tek bir namespace'in disk üzerindeki vektör indeksi.
+
+    Dosya düzeni (veri dizini):
+        meta.json      -> boyut ve depolama tipi
+        vectors.bin    -> ardışık satırlar halinde nicemlenmiş vektörler (memory-mapped okunur)
+        docs.jsonl     -> her vektör satırına karşılık gelen id, metin ve metadata
+        deleted.txt    -> silinmiş (üzerine yazılmış) satır numaraları
+
+    Aynı dizini paylaşan worker süreçleri dosya kilidiyle yazar (ekleme ve
+    silme öncesi diğerlerinin yazdıklarını yükler, satır numaraları böylece
+    tutarlı kalır); okurken dosyalar değiştiyse yeni satırları yükler.
+    Sıkıştırma yeni bir generation dizinine yazılır ve CURRENT dosyası tek
+    bir os.replace ile ona çevrilir; ilk generation namespace dizininin
+    kendisidir.
+    """
+
+    def __init__(self, path: str, dtype: str):
+        self.path = path
+        self.dtype = dtype
+        self.lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        with self.lock, self._file_lock(shared=True):
+            self._reset(self._read_generation())
+            self._reload()
+
+    @property
+    def _current_file(self) -> str:
+        return os.path.join(self.path, "CURRENT")
+
+    @property
+    def _lock_file(self) -> str:
+        return os.path.join(self.path, "lock")
+
+    @property
+    def _data_dir(self) -> str:
+        return os.path.join(self.path, self.generation) if self.generation else self.path
+
+    @property
+    def _meta_file(self) -> str:
+        return os.path.join(self._data_dir, "meta.json")
+
+    @property
+    def _vectors_file(self) -> str:
+        return os.path.join(self._data_dir, "vectors.bin")
+
+    @property
+    def _docs_file(self) -> str:
+        return os.path.join(self._data_dir, "docs.jsonl")
+
+    @property
+    def _deleted_file(self) -> str:
+        return os.path.join(self._data_dir, "deleted.txt")
+
+    @property
+    def _np_dtype(self):
+        return np.int8 if self.dtype == "int8" else np.float16
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * np.dtype(self._np_dtype).itemsize
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        """Süreçler arası kilit: okuma/yükleme paylaşımlı, yazma ve sıkıştırma özel"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_generation(self) -> str:
+        """CURRENT'ın gösterdiği veri dizini ("" = namespace dizininin kendisi)"""
+        try:
+            with open(self._current_file, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return ""
+
+    def _reset(self, generation: str):
+        self.generation = generation
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.deleted: set = set()
+        self._deleted_log: List[int] = []  # Silme sırası (türetilmiş indekslerin artımlı eşitlenmesi için)
+        self._vectors: Optional[np.memmap] = None
+        self._docs_offset = 0
+        self._deleted_offset = 0
+        self._seen: Optional[Tuple] = None
+
+    def _signature(self) -> Tuple:
+        """Dosyaların değişip değişmediğini anlamak için ucuz (yalnızca stat) imza"""
+        def stat(path: str) -> Optional[Tuple[int, int]]:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return None
+            return st.st_ino, st.st_size
+
+        return stat(self._current_file), stat(self._docs_file), stat(self._deleted_file)
+
+    def refresh(self):
+        """Başka süreçlerin yazdığı kayıtları yükler (değişiklik yoksa yalnızca stat)"""
+        with self.lock:
+            if self._signature() == self._seen:
+                return
+            with self._file_lock(shared=True):
+                self._reload()
+
+    def _reload(self):
+        """
+        Dosya kilidi altında diskteki değişiklikleri belleğe alır
+
+        Generation değiştiyse (sıkıştırma) baştan, değişmediyse yalnızca
+        eklenen doküman ve silme satırları okunur. Yarım kalmış (satır sonu
+        olmayan) kayıtlar okunmaz; bir sonraki yazma onları keser.
+        """
+        generation = self._read_generation()
+        if generation != self.generation:
+            self._reset(generation)
+
+        if self.dim is None and os.path.exists(self._meta_file):
+            with open(self._meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.dtype = meta["dtype"]
+
+        first_new_row = len(self.ids)
+        for line in self._read_lines(self._docs_file, "_docs_offset"):
+            record = json.loads(line)
+            self.ids.append(record["id"])
+            self.texts.append(record["text"])
+            self.metadatas.append(record["metadata"])
+        new_deleted = [int(line) for line in self._read_lines(self._deleted_file, "_deleted_offset")]
+        self.deleted.update(new_deleted)
+        self._deleted_log.extend(new_deleted)
+
+        # Vektör ve doküman dosyaları arasında satır sayısı uyuşmazsa kısa olan esas alınır
+        if self.dim and len(self.ids) > first_new_row:
+            vector_rows = os.path.getsize(self._vectors_file) // self._row_bytes if os.path.exists(self._vectors_file) else 0
+            if vector_rows < len(self.ids):
+                del self.ids[vector_rows:], self.texts[vector_rows:], self.metadatas[vector_rows:]
+                self._docs_offset = self._docs_bytes(vector_rows)
+
+        for row in range(first_new_row, len(self.ids)):
+            if row not in self.deleted:
+                self.id_to_row[self.ids[row]] = row
+        for row in new_deleted:
+            if row < len(self.ids) and self.id_to_row.get(self.ids[row]) == row:
+                del self.id_to_row[self.ids[row]]
+        if len(self.ids) != first_new_row:
+            self._vectors = None
+        self._seen = self._signature()
+
+    def _read_lines(self, path: str, offset_attr: str) -> List[str]:
+        """Dosyanın son okunan konumdan sonraki tam satırlarını döndürür ve konumu ilerletir"""
+        offset = getattr(self, offset_attr)
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        complete = data[:data.rfind(b"\n") + 1]
+        setattr(self, offset_attr, offset + len(complete))
+        return [line for line in complete.decode("utf-8").splitlines() if line.strip()]
+
+    def _docs_bytes(self, rows: int) -> int:
+        """docs.jsonl'de ilk `rows` satırın kapladığı bayt sayısı"""
+        with open(self._docs_file, "rb") as f:
+            size = 0
+            for _ in range(rows):
+                size += len(f.readline())
+            return size
+
+    def _truncate_partial_writes(self):
+        """Yarım kalmış bir önceki yazmanın artıklarını keser ki satırlar hizalı kalsın"""
+        if self.dim and os.path.exists(self._vectors_file):
+            with open(self._vectors_file, "r+b") as f:
+                f.truncate(len(self.ids) * self._row_bytes)
+        for path, offset in ((self._docs_file, self._docs_offset), (self._deleted_file, self._deleted_offset)):
+            if os.path.exists(path) and os.path.getsize(path) != offset:
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+
+    def changes_since(
+        self,
+        cursor: Optional[Tuple[str, int, int]]
+    ) -> Tuple[Tuple[str, int, int], bool, List[Tuple[str, str, Dict[str, Any]]], List[str]]:
+        """
+        Bellek içi türetilmiş bir indeksi (BM25) diskle eşitlemek için değişiklikler
+
+        Args:
+            cursor: Bir önceki çağrının döndürdüğü cursor (ilk çağrıda None)
+
+        Returns:
+            (yeni cursor, reset, eklenen (id, metin, metadata) kayıtları, silinen id'ler);
+            cursor yoksa ya da generation değiştiyse (sıkıştırma) reset=True ve
+            tüm canlı kayıtlar döner
+        """
+        with self.lock:
+            self.refresh()
+            new_cursor = (self.generation, len(self.ids), len(self._deleted_log))
+            if cursor is None or cursor[0] != self.generation:
+                rows = sorted(self.id_to_row.values())
+                return new_cursor, True, [(self.ids[r], self.texts[r], self.metadatas[r]) for r in rows], []
+            _, row_cursor, deleted_cursor = cursor
+            added = [
+                (self.ids[row], self.texts[row], self.metadatas[row])
+                for row in range(row_cursor, len(self.ids))
+                if self.id_to_row.get(self.ids[row]) == row
+            ]
+            removed = [self.ids[row] for row in self._deleted_log[deleted_cursor:] if self.ids[row] not in self.id_to_row]
+            return new_cursor, False, added, removed
+
+    @property
+    def version(self) -> Tuple[str, int, int]:
+        """Herhangi bir süreç yazdıkça değişen sürüm (changes_since cursor'ıyla aynı biçimde)"""
+        with self.lock:
+            self.refresh()
+            return self.generation, len(self.ids), len(self._deleted_log)
+
+    @property
+    def size(self) -> int:
+        """Canlı (silinmemiş) kayıt sayısı"""
+        self.refresh()
+        return len(self.id_to_row)
+
+    def _matrix(self) -> Optional[np.ndarray]:
+        """Vektör dosyasını memory-mapped olarak açar"""
+        if not self.ids or not self.dim:
+            return None
+        if self._vectors is None or self._vectors.shape[0] != len(self.ids):
+            self._vectors = np.memmap(
+                self._vectors_file, dtype=self._np_dtype, mode="r", shape=(len(self.ids), self.dim)
+            )
+        return self._vectors
+
+    def _quantize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        if self.dtype == "int8":
+            return np.clip(np.rint(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+        return vectors.astype(np.float16)
+
+    def add(
+        self,
+        ids: List[str],
+        texts: List[str],
+        vectors: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+    ):
+        """Kayıtları ekler; aynı id zaten varsa eski satırı siler (upsert)"""
+        if len(ids) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self.lock, self._file_lock():
+            # Satır numaraları diğer süreçlerin eklediği satırlardan sonra başlar
+            self._reload()
+            self._truncate_partial_writes()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._write_meta(self._data_dir)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Vector dimension mismatch: expected {self.dim}, got {vectors.shape[1]}")
+
+            self._mark_deleted([self.id_to_row[i] for i in ids if i in self.id_to_row])
+
+            # Önce vektörler, sonra dokümanlar yazılır; yükleme sırasında kısa olan esas alınır
+            with open(self._vectors_file, "ab") as f:
+                f.write(self._quantize(vectors).tobytes())
+            with open(self._docs_file, "a", encoding="utf-8") as f:
+                for doc_id, text, metadata in zip(ids, texts, metadatas):
+                    f.write(json.dumps({"id": doc_id, "text": text, "metadata": metadata}, ensure_ascii=False) + "\n")
+            self._reload()
+            self._maybe_compact()
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Verilen id'leri siler, silinen kayıt sayısını döndürür"""
+        with self.lock, self._file_lock():
+            self._reload()
+            self._truncate_partial_writes()
+            rows = [self.id_to_row[i] for i in ids if i in self.id_to_row]
+            self._mark_deleted(rows)
+            self._reload()
+            self._maybe_compact()
+            return len(rows)
+
+    def _mark_deleted(self, rows: List[int]):
+        if not rows:
+            return
+        with open(self._deleted_file, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(f"{row}\n")
+
+    def _write_meta(self, data_dir: str):
+        tmp_path = os.path.join(data_dir, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype}, f)
+        os.replace(tmp_path, os.path.join(data_dir, "meta.json"))
+
+    def _maybe_compact(self):
+        """
+        Silinmiş satırlar indeksin yarısını geçtiyse canlı satırları yeni bir
+        generation dizinine yazar ve CURRENT'ı atomik olarak ona çevirir
+        (dosya kilidi altında çağrılır)
+        """
+        if len(self.deleted) < 1024 or len(self.deleted) * 2 < len(self.ids):
+            return
+        matrix = self._matrix()
+        keep = [row for row in range(len(self.ids)) if row not in self.deleted]
+
+        old_dir = self._data_dir
+        generation = f"gen-{uuid.uuid4().hex[:12]}"
+        new_dir = os.path.join(self.path, generation)
+        os.makedirs(new_dir)
+        self._write_meta(new_dir)
+        with open(os.path.join(new_dir, "vectors.bin"), "wb") as f:
+            for start in range(0, len(keep), SEARCH_BLOCK_ROWS):
+                f.write(np.ascontiguousarray(matrix[keep[start:start + SEARCH_BLOCK_ROWS]]).tobytes())
+        with open(os.path.join(new_dir, "docs.jsonl"), "w", encoding="utf-8") as f:
+            for row in keep:
+                f.write(json.dumps(
+                    {"id": self.ids[row], "text": self.texts[row], "metadata": self.metadatas[row]},
+                    ensure_ascii=False,
+                ) + "\n")
+
+        # Tek atomik adım: okuyucular ya eski ya yeni generation'ı tam olarak görür
+        tmp_current = self._current_file + ".tmp"
+        with open(tmp_current, "w", encoding="utf-8") as f:
+            f.write(generation)
+        os.replace(tmp_current, self._current_file)
+
+        self._vectors = None
+        matrix = None
+        # Eski dosyaları açık tutan okuyucular (memmap) etkilenmez; yeniden yükleme kilit altında yapılır
+        if old_dir == self.path:
+            for name in ("vectors.bin", "docs.jsonl", "deleted.txt", "meta.json"):
+                path = os.path.join(self.path, name)
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            shutil.rmtree(old_dir, ignore_errors=True)
+        self._reload()
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Birden fazla sorgu vektörü için toplu kosinüs top-k araması yapar.
+
+        Args:
+            queries: (m, d) boyutlu sorgu vektörleri
+            k: Her sorgu için döndürülecek sonuç sayısı
+            filter: Opsiyonel metadata filtresi
+
+        Returns:
+            List[List[Tuple[int, float]]]: Her sorgu için (satır, skor) listesi
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self.lock:
+            self.refresh()
+            matrix = self._matrix()
+            if matrix is None or not self.id_to_row:
+                return [[] for _ in range(len(queries))]
+            n = matrix.shape[0]
+            valid = np.ones(n, dtype=bool)
+            if self.deleted:
+                valid[list(self.deleted)] = False
+            if filter:
+                valid &= np.fromiter(
+                    (_matches_filter(m, filter) for m in self.metadatas[:n]), dtype=bool, count=n
+                )
+
+            q = _normalize(queries)
+            scores = np.empty((len(q), n), dtype=np.float32)
+            for start in range(0, n, SEARCH_BLOCK_ROWS):
+                block = np.asarray(matrix[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+                scores[:, start:start + len(block)] = q @ block.T
+        if self.dtype == "int8":
+            scores /= INT8_SCALE
+        scores[:, ~valid] = -np.inf
+
+        k = min(k, int(valid.sum()))
+        if k <= 0:
+            return [[] for _ in range(len(q))]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for i, rows in enumerate(top):
+            rows = rows[np.argsort(-scores[i, rows])]
+            results.append([(int(row), float(scores[i, row])) for row in rows])
+        return results
+
+
+class LocalVectorIndex:
+    """
+    Süreç içi, memory-mapped dosyalarla kalıcı vektör indeksi.
+
+    Her user_id ayrı bir namespace dizininde tutulur; vektörler float16
+    veya int8 olarak saklanır ve NumPy ile toplu kosinüs araması yapılır.
+    """
+
+    def __init__(self, root_dir: str, dtype: str = "float16"):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported local index dtype: {dtype} (use one of {SUPPORTED_DTYPES})")
+        self.root_dir = root_dir
+        self.dtype = dtype
+        self._namespaces: Dict[str, _NamespaceIndex] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def _dir_name(namespace: str) -> str:
+        """Namespace adını güvenli bir dizin adına çevirir"""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", namespace)[:64]
+        digest = hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:8]
+        return f"{safe}-{digest}"
+
+    def namespace(self, namespace: str) -> _NamespaceIndex:
+        """Namespace indeksini döndürür, gerekirse diskten yükler"""
+        with self._lock:
+            if namespace not in self._namespaces:
+                path = os.path.join(self.root_dir, self._dir_name(namespace))
+                self._namespaces[namespace] = _NamespaceIndex(path, self.dtype)
+            return self._namespaces[namespace]
+
+    def release(self, namespace: str):
+        """Namespace'in bellekteki kopyasını bırakır (dosyalar durur, sonraki erişimde yeniden yüklenir)"""
+        with self._lock:
+            self._namespaces.pop(namespace, None)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    LocalVectorIndex için LangChain VectorStore arayüzü.
+
+    PineconeVectorStore ile aynı arayüzü sunar; böylece ingest_faqs ve
+    query iki backend'i de aynı şekilde kullanabilir.
+    """
+
+    def __init__(self, index: LocalVectorIndex, embedding: Embeddings, namespace: str):
+        self._index = index
+        self._embedding = embedding
+        self._namespace = namespace
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def _ns(self) -> _NamespaceIndex:
+        return self._index.namespace(self._namespace)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Önceden hesaplanmış embedding'leri indekse yazar"""
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        self._ns.add(ids, texts, np.asarray(embeddings, dtype=np.float32), metadatas)
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self._embedding.embed_documents(texts), metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        self._ns.delete(ids)
+        return True
+
+    def get_metadata(self, ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Kayıtların metadata'sını döndürür (ids verilmezse namespace'in tamamı)"""
+        ns = self._ns
+        with ns.lock:
+            ns.refresh()
+            rows = ns.id_to_row if ids is None else {i: ns.id_to_row[i] for i in ids if i in ns.id_to_row}
+            return {doc_id: dict(ns.metadatas[row]) for doc_id, row in rows.items()}
+
+    def get_documents(self) -> Dict[str, Document]:
+        """Namespace'in tüm dokümanları (id -> Document)"""
+        ns = self._ns
+        with ns.lock:
+            ns.refresh()
+            return {doc_id: self._to_document(ns, row) for doc_id, row in ns.id_to_row.items()}
+
+    def _to_document(self, ns: _NamespaceIndex, row: int) -> Document:
+        return Document(page_content=ns.texts[row], metadata=dict(ns.metadatas[row]), id=ns.ids[row])
+
+    def similarity_search_by_vectors_with_score(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Birden fazla sorgu vektörü için tek NumPy çağrısıyla arama yapar"""
+        ns = self._ns
+        # Arama ve satır -> doküman çevirisi aynı kilit altında (arada yeniden yükleme satırları değiştirebilir)
+        with ns.lock:
+            results = ns.search(np.asarray(embeddings, dtype=np.float32), k, filter)
+            return [[(self._to_document(ns, row), score) for row, score in hits] for hits in results]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vectors_with_score([embedding], k, filter)[0]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k, filter)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Skorlar zaten kosinüs benzerliği
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        index: Optional[LocalVectorIndex] = None,
+        namespace: str = "default",
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        if index is None:
+            raise ValueError("LocalVectorStore.from_texts requires an index")
+        store = cls(index=index, embedding=embedding, namespace=namespace)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
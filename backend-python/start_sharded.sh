@@ -0,0 +1,56 @@
+#!/bin/bash
+
+# Sharded startup script: N worker processes, each owning a shard of tenants, behind router.py
+# Usage: ./start_sharded.sh [WORKERS] (default 4)
+WORKERS=${1:-4}
+BASE_PORT=8001
+
+echo "🚀 Starting FastAPI AI Service with $WORKERS sharded workers"
+echo "=================================================="
+
+# Check if virtual environment exists
+if [ ! -d "venv" ]; then
+    echo "❌ Virtual environment not found. Please run: python -m venv venv"
+    exit 1
+fi
+
+# Activate virtual environment
+echo "📦 Activating virtual environment..."
+source venv/bin/activate
+
+# Check if .env file exists
+if [ ! -f ".env" ]; then
+    echo "⚠️ .env file not found. Creating from template..."
+    cp .env.example .env
+    echo "📝 Please edit .env file with your API keys before running the service."
+    exit 1
+fi
+
+# Worker URL list shared by the router and the workers (same ring everywhere)
+SHARD_WORKERS=""
+for i in $(seq 0 $((WORKERS - 1))); do
+    SHARD_WORKERS="${SHARD_WORKERS:+$SHARD_WORKERS,}http://127.0.0.1:$((BASE_PORT + i))"
+done
+export SHARD_WORKERS
+
+# Stop all workers when the router exits
+PIDS=()
+trap 'kill "${PIDS[@]}" 2>/dev/null' EXIT
+
+for i in $(seq 0 $((WORKERS - 1))); do
+    PORT=$((BASE_PORT + i))
+    echo "🧩 Worker $i on port $PORT"
+    # Ingest job status is kept per worker, so each worker gets its own job directory
+    SHARD_SELF="http://127.0.0.1:$PORT" \
+    INGEST_JOB_DIR="./data/ingest_jobs/worker-$i" \
+        uvicorn main:app --host 127.0.0.1 --port "$PORT" &
+    PIDS+=($!)
+done
+
+echo "🌟 Starting shard router..."
+echo "📍 Service will be available at: http://localhost:8000"
+echo "🧭 Shard status: http://localhost:8000/shards"
+echo "🛑 Press Ctrl+C to stop the router and all workers"
+echo ""
+
+uvicorn router:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,129 @@
+"""
+Dil filtreli retrieval (ingest sırasında çevrilen SSS'ler) için regresyon testleri
+
+Sahte modeller ve geçici bir yerel vektör indeksiyle süreç içinde çalışır;
+API anahtarı veya çalışan bir sunucu gerekmez:
+
+    python test_multilingual_retrieval.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+os.environ["EMBEDDING_CACHE_DIR"] = ""
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from models import FAQ, QueryRequest
+from services.ai_service import AIService
+from services.vector_index import LocalVectorIndex
+
+USER_ID = "test-multilingual"
+
+# İki Türkçe, bir İngilizce SSS; kargo ücreti sorusunu yalnızca Türkçe olan cevaplar
+MIXED_FAQS = [
+    {"question": "Kargo ücreti ne kadar?", "answer": "150 TL üzeri siparişlerde kargo ücretsizdir."},
+    {"question": "Siparişimi nasıl iptal edebilirim?", "answer": "Hesabınızdan 'Siparişlerim' bölümüne gidin."},
+    {"question": "Do you ship abroad?", "answer": "Yes, we ship to most countries in Europe."},
+]
+
+QUESTION = "How much is the shipping fee?"
+
+PHRASEBOOK = {
+    ("English", "Kargo ücreti ne kadar?"): QUESTION,
+    ("English", "150 TL üzeri siparişlerde kargo ücretsizdir."): "Shipping is free for orders over 150 TL.",
+}
+
+
+class PromptRecorder(BaseCallbackHandler):
+    """Sohbet modeline gönderilen tüm prompt'ları kaydeder"""
+
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any):
+        self.prompts.extend("\n".join(str(m.content) for m in batch) for batch in messages)
+
+
+def build_service(pipeline_mode: str = "translate") -> AIService:
+    """Sahte bileşenler ve geçici yerel indeksle servis kurar"""
+    service = AIService()
+    service.vector_backend = "local"
+    service.local_index = LocalVectorIndex(tempfile.mkdtemp())
+    service.pipeline_mode = pipeline_mode
+    service.use_components(embeddings=FakeEmbeddings(), llm=FakeChatModel(translate=True, translations=PHRASEBOOK))
+    service.semantic_cache = None
+    service.llm.callbacks = [PromptRecorder()]
+    return service
+
+
+def generation_prompts(service: AIService) -> List[str]:
+    """Çeviri çağrıları dışındaki (cevap üretimi) prompt'lar"""
+    return [p for p in service.llm.callbacks[0].prompts if not p.startswith("Translate the following text")]
+
+
+def test_mixed_catalog_query_searches_all_languages():
+    """SSS'lerin yalnızca bir kısmı İngilizce olduğunda İngilizce soru Türkçe SSS'yi de görmeli"""
+    async def run():
+        for mode in ("translate", "multilingual"):
+            service = build_service(mode)
+            await service.ingest_faqs([FAQ(**faq) for faq in MIXED_FAQS], USER_ID)
+            await service.query(QUESTION, USER_ID)
+            prompts = generation_prompts(service)
+            assert prompts, f"{mode}: cevap üretimi çağrısı bekleniyordu"
+            assert "Kargo ücreti ne kadar?" in prompts[-1], f"{mode}: Türkçe kargo SSS'si bağlamda yok"
+
+    asyncio.run(run())
+
+
+def test_mixed_catalog_batch_and_stream_search_all_languages():
+    """Toplu ve akışlı sorgular da tüm dillerdeki SSS'lerde arama yapmalı"""
+    async def run():
+        service = build_service()
+        await service.ingest_faqs([FAQ(**faq) for faq in MIXED_FAQS], USER_ID)
+        await service.query_batch([QueryRequest(message=QUESTION, user_id=USER_ID)])
+        assert "Kargo ücreti ne kadar?" in generation_prompts(service)[-1], "batch: Türkçe kargo SSS'si bağlamda yok"
+
+        [event async for event in service.query_stream(QUESTION, USER_ID)]
+        assert "Kargo ücreti ne kadar?" in generation_prompts(service)[-1], "stream: Türkçe kargo SSS'si bağlamda yok"
+
+    asyncio.run(run())
+
+
+def test_fully_translated_catalog_skips_query_translation():
+    """Her SSS'nin İngilizce kaydı varsa soru çeviri çağrısı yapılmadan cevaplanmalı"""
+    async def run():
+        service = build_service()
+        await service.ingest_faqs([FAQ(**faq) for faq in MIXED_FAQS], USER_ID, languages=["en"])
+        service.llm.translation_calls = 0
+        result = await service.query(QUESTION, USER_ID)
+        assert service.llm.translation_calls == 0, "sorgu sırasında çeviri yapılmamalıydı"
+        assert result.answer == "Shipping is free for orders over 150 TL.", result
+
+    asyncio.run(run())
+
+
+def main() -> int:
+    """Testleri sırayla çalıştırır; başarısız test varsa 1 döndürür"""
+    tests = [
+        test_mixed_catalog_query_searches_all_languages,
+        test_mixed_catalog_batch_and_stream_search_all_languages,
+        test_fully_translated_catalog_skips_query_translation,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} test başarılı")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())